@@ -1,22 +1,67 @@
-from langchain_groq import ChatGroq
-from config.settings import settings
+"""
+AI Agents
+The agent singletons are built on first use, not when the package is imported.
+
+Importing an agent module pulls in langchain, langgraph and the Groq SDK and
+builds its ChatGroq clients (and, for the orchestrator, compiles its graph),
+so `import agents` stays cheap and the app can answer /health before any
+of that happens. Use get_agent(name), or the usual
+`from agents import negotiation_agent`, which resolves it on access.
+warm_up_agents() builds all of them up front (see the startup hook in main.py).
+"""
+import importlib
+import sys
+import types
+from typing import Any, List
+
+# Agent singleton name -> module defining it
+AGENT_MODULES = {
+    "valuation_agent": "agents.valuation_agent",
+    "negotiation_agent": "agents.negotiation.agent",
+    "profiling_agent": "agents.profiling.agent",
+    "inventory_agent": "agents.inventory_agent",
+    "deal_agent": "agents.deal_agent",
+    "orchestrator_agent": "agents.orchestrator_agent",
+}
+
 
 def get_llm():
-    """Get configured Groq LLM instance"""
-    return ChatGroq(
-        groq_api_key=settings.groq_api_key,
-        model_name=settings.default_model,
-        temperature=settings.temperature,
-        max_tokens=settings.max_tokens
-    )
-
-# Import agents
-from agents.valuation_agent import valuation_agent
-from agents.negotiation.agent import negotiation_agent
-
-from agents.profiling.agent import profiling_agent
-from agents.inventory_agent import inventory_agent
-from agents.deal_agent import deal_agent
-from agents.orchestrator_agent import orchestrator_agent
-
-__all__ = ["get_llm", "valuation_agent", "negotiation_agent", "profiling_agent", "inventory_agent", "deal_agent", "orchestrator_agent"]
+    """Get the shared Groq LLM client for the default settings"""
+    from src.infrastructure.llm.client_registry import get_chat_model
+
+    return get_chat_model()
+
+
+def get_agent(name: str) -> Any:
+    """Agent singleton `name`, built (with its module) on first call"""
+    try:
+        module = AGENT_MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module 'agents' has no attribute {name!r}") from None
+    return getattr(importlib.import_module(module), name)
+
+
+def warm_up_agents() -> List[str]:
+    """Build every agent now instead of on the first request; returns their names"""
+    for name in AGENT_MODULES:
+        get_agent(name)
+    return list(AGENT_MODULES)
+
+
+class _LazyAgentsModule(types.ModuleType):
+    """Package module resolving the agent names through get_agent"""
+
+    def __getattr__(self, name: str) -> Any:
+        return get_agent(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Importing e.g. agents.valuation_agent binds that submodule on the
+        # package; `agents.valuation_agent` keeps meaning the agent instance.
+        if name in AGENT_MODULES and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyAgentsModule
+
+__all__ = ["get_llm", "get_agent", "warm_up_agents", *AGENT_MODULES]
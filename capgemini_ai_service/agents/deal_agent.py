@@ -2,14 +2,49 @@
 Deal Structuring Agent with Deterministic Financial Calculations
 LLM is ONLY used for creative naming and descriptions, NOT for math
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence
 from dataclasses import dataclass
-from langchain_core.prompts import ChatPromptTemplate
 from agents import get_llm
+from agents.deal_grid import DEFAULT_DOWN_PAYMENT_SHARES, DEFAULT_DURATIONS, evaluate_grid, pareto_options
+from core.llm_cache import get_llm_cache
+from src.infrastructure.llm.prompt_registry import register_prompt
+from src.infrastructure.monitoring import FALLBACKS, JSON_PARSE_FAILURES, llm_config
 
 import json
 
 
+# Creative naming of the calculated options (figures are given, never computed by the LLM)
+DEAL_NAMING_PROMPT = """
+Tu es un expert en marketing automobile.
+Donne des noms commerciaux attractifs et des descriptions persuasives pour ces options.
+
+PROFIL CLIENT:
+Segment: {segment}
+Priorités: {priorities}
+
+OPTIONS CALCULÉES:
+{options_text}
+
+Pour CHAQUE option, fournis:
+1. Un nom commercial accrocheur (ex: "Pack Sérénité Famille", "Liberté Totale")
+2. Une description persuasive de 1-2 phrases adaptée au profil
+
+IMPORTANT: 
+- NE MODIFIE PAS les chiffres (mensualités, durées, apports)
+- Adapte le ton au segment client
+
+Réponds UNIQUEMENT en JSON valide:
+{{
+  "options": [
+    {{"index": 1, "name": "Nom Commercial", "description": "Description persuasive..."}},
+    {{"index": 2, "name": "...", "description": "..."}},
+    {{"index": 3, "name": "...", "description": "..."}}
+  ],
+  "recommendation": "Quelle option recommander et pourquoi (1 phrase)"
+}}
+"""
+
+
 @dataclass
 class FinancingOption:
     """Calculated financing option"""
@@ -76,10 +111,22 @@ class DealStructuringAgent:
     - Uses LLM ONLY for naming and descriptions
     """
     
+    # financing_preference -> products of the what-if grid
+    PRODUCT_PREFERENCES = {
+        "lld": ("LLD",),
+        "leasing": ("LLD",),
+        "credit": ("Credit",),
+        "crédit": ("Credit",),
+        "subscription": ("Subscription",),
+        "abonnement": ("Subscription",),
+    }
+    
     def __init__(self, settings: Settings = None):
         self.llm = get_llm()
         self.calculator = FinancialCalculator()
         self.settings = settings or global_settings
+        self.cache = get_llm_cache()
+        self.naming_prompt = register_prompt("deal_naming", DEAL_NAMING_PROMPT)
         
         # Financial Config - from injected settings
         self.config = {
@@ -238,8 +285,9 @@ class DealStructuringAgent:
         return [opt for _, opt in scored[:3]]
     
     async def _generate_creative_names(self, options: List[FinancingOption], 
-                                        profile: Dict[str, Any]) -> Dict[str, Any]:
-        """Use LLM ONLY for creative naming and descriptions"""
+                                        profile: Dict[str, Any],
+                                        bypass_cache: bool = False) -> Dict[str, Any]:
+        """Use LLM ONLY for creative naming and descriptions (cached per option set and segment)"""
         
         # Build options summary for LLM
         options_text = ""
@@ -253,43 +301,15 @@ Option {i}:
 - Services: {', '.join(opt.included_services)}
 """
         
-        prompt = ChatPromptTemplate.from_template("""
-Tu es un expert en marketing automobile.
-Donne des noms commerciaux attractifs et des descriptions persuasives pour ces options.
-
-PROFIL CLIENT:
-Segment: {segment}
-Priorités: {priorities}
-
-OPTIONS CALCULÉES:
-{options_text}
-
-Pour CHAQUE option, fournis:
-1. Un nom commercial accrocheur (ex: "Pack Sérénité Famille", "Liberté Totale")
-2. Une description persuasive de 1-2 phrases adaptée au profil
-
-IMPORTANT: 
-- NE MODIFIE PAS les chiffres (mensualités, durées, apports)
-- Adapte le ton au segment client
-
-Réponds UNIQUEMENT en JSON valide:
-{{
-  "options": [
-    {{"index": 1, "name": "Nom Commercial", "description": "Description persuasive..."}},
-    {{"index": 2, "name": "...", "description": "..."}},
-    {{"index": 3, "name": "...", "description": "..."}}
-  ],
-  "recommendation": "Quelle option recommander et pourquoi (1 phrase)"
-}}
-""")
+        inputs = {
+            "segment": profile.get("segment", "Standard"),
+            "priorities": str(profile.get("priorities", [])),
+            "options_text": options_text
+        }
         
-        try:
-            chain = prompt | self.llm
-            response = await chain.ainvoke({
-                "segment": profile.get("segment", "Standard"),
-                "priorities": str(profile.get("priorities", [])),
-                "options_text": options_text
-            })
+        async def generate() -> Dict[str, Any]:
+            chain = self.naming_prompt | self.llm
+            response = await chain.ainvoke(inputs, config=llm_config("deal_naming"))
             
             # Parse response
             content = response.content.strip()
@@ -302,11 +322,22 @@ Réponds UNIQUEMENT en JSON valide:
                 end = content.rfind("}") + 1
                 content = content[start:end]
             
-            creative = json.loads(content)
-            return creative
+            try:
+                return json.loads(content)
+            except json.JSONDecodeError:
+                JSON_PARSE_FAILURES.labels(component="deal_naming").inc()
+                raise
+        
+        try:
+            return await self.cache.get_or_compute(
+                "deal_naming", inputs, generate,
+                ttl=self.settings.llm_cache_ttl_deal_naming,
+                bypass=bypass_cache
+            )
             
         except Exception as e:
             print(f"Creative naming failed: {e}, using defaults")
+            FALLBACKS.labels(component="deal_naming").inc()
             return {
                 "options": [
                     {"index": i+1, "name": f"Formule {opt.type}", "description": f"Option {opt.type} adaptée à vos besoins."}
@@ -315,6 +346,49 @@ Réponds UNIQUEMENT en JSON valide:
                 "recommendation": "Choisissez l'option qui correspond le mieux à votre budget."
             }
     
+    def structure_grid(
+        self,
+        vehicle_price: float,
+        profile: Dict[str, Any],
+        trade_in_values: Sequence[float] = (0.0,),
+        durations: Optional[Sequence[int]] = None,
+        down_payments: Optional[Sequence[float]] = None,
+        max_per_scenario: int = 8
+    ) -> Dict[str, Any]:
+        """
+        What-if grid: every duration x down payment x trade-in value of the
+        LLD, Credit and Subscription formulas (vectorized, NO LLM), reduced to
+        the Pareto-optimal options within the profile's monthly budget.
+        A financing_preference naming a product restricts the grid to it.
+        """
+        durations = durations or DEFAULT_DURATIONS
+        if down_payments is None:
+            down_payments = [round(vehicle_price * share, -2) for share in DEFAULT_DOWN_PAYMENT_SHARES]
+        products = self.PRODUCT_PREFERENCES.get(
+            str(profile.get("financing_preference", "")).strip().lower(),
+            ("LLD", "Credit", "Subscription")
+        )
+
+        grids = evaluate_grid(vehicle_price, self.config, durations, down_payments, trade_in_values, products)
+        result = pareto_options(grids, profile.get("monthly_budget"), max_per_scenario)
+        for option in result["options"]:
+            option["included_services"] = self.services[option["type"].lower()]
+
+        result["calculation_details"] = {
+            "vehicle_price": vehicle_price,
+            "monthly_budget": profile.get("monthly_budget"),
+            "durations": list(durations),
+            "down_payments": list(down_payments),
+            "trade_in_values": list(trade_in_values),
+            "rates_applied": {
+                "lld_36": self.config["lld"]["rate_36"],
+                "lld_48": self.config["lld"]["rate_48"],
+                "credit_48": self.config["credit"]["rate_48"],
+                "credit_60": self.config["credit"]["rate_60"]
+            }
+        }
+        return result
+    
     async def structure_deal(self, vehicle_price: float, trade_in_value: float, 
                               profile: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -0,0 +1,185 @@
+"""
+Vectorized Financing What-If Grid
+Evaluates every (duration x down payment x trade-in value) combination of the
+LLD, Credit and Subscription formulas of FinancialCalculator as NumPy arrays,
+then keeps the Pareto-optimal options: no other option of the same type is at
+least as good on monthly payment, total cost and cash upfront, and strictly
+better on one of them.
+
+Rates and residual values are only configured for a few durations (LLD 36/48,
+Credit 48/60); other durations interpolate between them (clamped at the ends,
+residual values extrapolated within RESIDUAL_BOUNDS). At the configured
+durations with no down payment the figures match _calculate_all_options.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_DURATIONS = list(range(12, 85, 6))
+DEFAULT_DOWN_PAYMENT_SHARES = [0.0, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4]
+
+# Durations each product is sold for (months)
+DURATION_RANGES = {
+    "LLD": (24, 60),
+    "Credit": (12, 84),
+    "Subscription": (12, 36),
+}
+# Residual value bounds (% of the vehicle price) for extrapolated LLD durations
+RESIDUAL_BOUNDS = (15.0, 60.0)
+LLD_MIN_MONTHLY = 500
+SUBSCRIPTION_MIN_MONTHLY = 1000
+
+# Pareto objectives, all minimized
+OBJECTIVES = ("monthly_payment", "total_cost", "down_payment")
+
+
+def amortized_payment(principal: np.ndarray, annual_rate: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Vectorized FinancialCalculator.calculate_monthly_payment"""
+    principal, annual_rate, months = np.broadcast_arrays(
+        np.asarray(principal, dtype=float), np.asarray(annual_rate, dtype=float), np.asarray(months, dtype=float)
+    )
+    monthly_rate = annual_rate / 100 / 12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = (1 + monthly_rate) ** months
+        payment = np.round(principal * (monthly_rate * factor) / (factor - 1), 2)
+        payment = np.where(annual_rate <= 0, principal / months, payment)
+    return np.where(months <= 0, 0.0, payment)
+
+
+def _axes(durations: Sequence[int], down_payments: Sequence[float], trade_ins: Sequence[float], product: str):
+    """Flattened (months, down payment, trade-in) grid of one product"""
+    low, high = DURATION_RANGES[product]
+    months = np.array([d for d in durations if low <= d <= high], dtype=float)
+    downs = np.array([0.0] if product == "Subscription" else down_payments, dtype=float)
+    m, d, t = np.meshgrid(months, downs, np.asarray(trade_ins, dtype=float), indexing="ij")
+    return m.ravel(), d.ravel(), t.ravel()
+
+
+def evaluate_grid(
+    vehicle_price: float,
+    config: Dict[str, Dict[str, float]],
+    durations: Sequence[int],
+    down_payments: Sequence[float],
+    trade_ins: Sequence[float],
+    products: Sequence[str] = ("LLD", "Credit", "Subscription"),
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Every combination of each product, as arrays per product:
+    months, down_payment, trade_in_value, monthly_payment, total_cost, interest_rate.
+    Combinations with nothing left to finance are dropped.
+    """
+    grids = {}
+
+    if "LLD" in products:
+        months, down, trade_in = _axes(durations, down_payments, trade_ins, "LLD")
+        lld = config["lld"]
+        rate = np.interp(months, [36, 48], [lld["rate_36"], lld["rate_48"]])
+        residual = lld["residual_36"] + (lld["residual_48"] - lld["residual_36"]) * (months - 36) / 12
+        residual = np.clip(residual, *RESIDUAL_BOUNDS)
+        # The down payment (first rent) lowers the financed depreciation
+        financed = vehicle_price - vehicle_price * (residual / 100) - down
+        monthly = np.maximum(amortized_payment(financed, rate, months) - trade_in / months, LLD_MIN_MONTHLY)
+        grids["LLD"] = _option_arrays(months, down, trade_in, monthly, monthly, rate, financed > 0)
+
+    if "Credit" in products:
+        months, down, trade_in = _axes(durations, down_payments, trade_ins, "Credit")
+        credit = config["credit"]
+        rate = np.interp(months, [48, 60], [credit["rate_48"], credit["rate_60"]])
+        net_to_finance = vehicle_price - trade_in - down
+        monthly = amortized_payment(net_to_finance, rate, months)
+        grids["Credit"] = _option_arrays(months, down, trade_in, monthly, monthly, rate, net_to_finance > 0)
+
+    if "Subscription" in products:
+        months, down, trade_in = _axes(durations, down_payments, trade_ins, "Subscription")
+        base_monthly = np.round(vehicle_price / months * config["subscription"]["markup"], 2)
+        # Trade-in applied as initial credit
+        adjusted = base_monthly - trade_in / months
+        monthly = np.maximum(adjusted, SUBSCRIPTION_MIN_MONTHLY)
+        grids["Subscription"] = _option_arrays(months, down, trade_in, monthly, adjusted, np.zeros_like(months), adjusted > 0)
+
+    return grids
+
+
+def _option_arrays(months, down, trade_in, monthly, billed_monthly, rate, valid) -> Dict[str, np.ndarray]:
+    """Displayed monthly payment (nearest 10) and total cost of the valid combinations"""
+    return {
+        "months": months[valid],
+        "down_payment": down[valid],
+        "trade_in_value": trade_in[valid],
+        "monthly_payment": np.round(monthly[valid], -1),
+        "total_cost": np.round(billed_monthly[valid] * months[valid] + down[valid], 2),
+        "interest_rate": np.round(rate[valid], 2),
+    }
+
+
+def pareto_mask(costs: np.ndarray) -> np.ndarray:
+    """Rows of `costs` (n x 3, lower is better) that no other row dominates; duplicates are kept once"""
+    # In lexicographic order a row can only be dominated (or duplicated) by an
+    # earlier one that is at least as good on the last two objectives
+    order = np.lexsort(costs.T[::-1])
+    ordered = costs[order]
+    # Sweep over the distinct values of the coarser of the two (e.g. the down
+    # payments), tracking the best other value among earlier rows at or below it
+    level_col, value_col = (1, 2) if len(np.unique(ordered[:, 1])) <= len(np.unique(ordered[:, 2])) else (2, 1)
+    level, value = ordered[:, level_col], ordered[:, value_col]
+
+    dominated = np.zeros(len(costs), dtype=bool)
+    for threshold in np.unique(level):
+        best = np.minimum.accumulate(np.where(level <= threshold, value, np.inf))
+        best_before = np.concatenate([[np.inf], best[:-1]])
+        dominated |= (level == threshold) & (best_before <= value)
+
+    mask = np.zeros(len(costs), dtype=bool)
+    mask[order[~dominated]] = True
+    return mask
+
+
+def pareto_options(
+    grids: Dict[str, Dict[str, np.ndarray]],
+    monthly_budget: Optional[float],
+    max_per_scenario: int,
+) -> Dict[str, Any]:
+    """
+    Pareto-optimal options within the monthly budget (all options when none
+    of the grid fits), per product and trade-in value (a higher trade-in would dominate
+    everything otherwise), cheapest monthly payment first. Fronts longer than
+    `max_per_scenario` are thinned evenly so the whole trade-off stays visible.
+    """
+    options: List[Dict[str, Any]] = []
+    budget_masks = {
+        product: grid["monthly_payment"] <= monthly_budget if monthly_budget
+        else np.ones(len(grid["months"]), dtype=bool)
+        for product, grid in grids.items()
+    }
+    feasible = sum(int(mask.sum()) for mask in budget_masks.values())
+
+    for product, grid in grids.items():
+        within_budget = budget_masks[product]
+        for trade_in in np.unique(grid["trade_in_value"]):
+            candidates = grid["trade_in_value"] == trade_in
+            if feasible:
+                candidates &= within_budget
+
+            index = np.flatnonzero(candidates)
+            if not len(index):
+                continue
+            costs = np.column_stack([grid[name][index] for name in OBJECTIVES])
+            front = index[pareto_mask(costs)]
+            front = front[np.argsort(grid["monthly_payment"][front], kind="stable")]
+            if len(front) > max_per_scenario:
+                front = front[np.unique(np.linspace(0, len(front) - 1, max_per_scenario).round().astype(int))]
+
+            for i in front:
+                options.append({
+                    "type": product,
+                    "monthly_payment": float(grid["monthly_payment"][i]),
+                    "duration_months": int(grid["months"][i]),
+                    "down_payment": float(grid["down_payment"][i]),
+                    "trade_in_value": float(grid["trade_in_value"][i]),
+                    "total_cost": float(grid["total_cost"][i]),
+                    "interest_rate": float(grid["interest_rate"][i]),
+                    "fits_budget": bool(within_budget[i]),
+                })
+
+    evaluated = sum(len(grid["months"]) for grid in grids.values())
+    return {"options": options, "evaluated": evaluated, "within_budget": feasible}
@@ -1,8 +1,12 @@
 from typing import Dict, Any, List, Optional
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.exceptions import OutputParserException
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 from agents import get_llm
+from core.llm_cache import get_llm_cache
+from agents.inventory_ranking import InventoryRanker
+from src.infrastructure.llm.prompt_registry import register_prompt
+from src.infrastructure.monitoring import FALLBACKS, JSON_PARSE_FAILURES, llm_config
 
 class VehicleMatch(BaseModel):
     """Structured output for a single vehicle match"""
@@ -24,20 +28,49 @@ import json
 import os
 from config.settings import settings
 
+# {format_instructions} is bound once from the result parser
+INVENTORY_MATCH_PROMPT = """
+        Tu es un expert en recommandation automobile.
+        Ta mission est de trouver les MEILLEURS véhicules pour ce client parmi notre stock.
+        
+        PROFIL CLIENT:
+        Segment: {segment}
+        Priorités: {priorities}
+        Sensibilité Prix: {price_sensitivity}
+        Budget (si connu): {budget}
+        
+        INVENTAIRE DISPONIBLE:
+        {inventory_text}
+        
+        Tâche:
+        1. Sélectionne les 3 véhicules les plus pertinents.
+        2. Extrais fidèlement les détails (Marque, Modèle, Année, Prix, ID) de l'inventaire fourni.
+        3. Attribue un score de compatibilité (0-100). Le pré-score est un classement déterministe indicatif.
+        4. Explique POURQUOI ce véhicule correspond à CE profil (ex: "Idéal pour la famille car 7 places").
+        5. Liste les arguments de vente clés pour ce client spécifique.
+        
+        {format_instructions}
+        """
+
+
 class InventoryMatchingAgent:
     def __init__(self):
         self.llm = get_llm()
         self.parser = JsonOutputParser(pydantic_object=InventoryMatchResult)
+        self.prompt = register_prompt("inventory_match", INVENTORY_MATCH_PROMPT, parser=self.parser)
         # Dependency Injection (Manual for now, could use FastAPI Depends)
         from core.repositories import get_inventory_repository
         self.repository = get_inventory_repository()
+        self.cache = get_llm_cache()
+        self.ranker = InventoryRanker()
         
     async def find_matches(self, 
                     profile: Dict[str, Any], 
-                    inventory: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+                    inventory: Optional[List[Dict[str, Any]]] = None,
+                    bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Rank inventory based on customer profile.
-        Async compatible.
+        Async compatible. Results are cached per (profile, candidate inventory).
         """
         # Pre-filter inventory using Repository Search (Scalable)
         budget = profile.get('monthly_budget', 0)
@@ -58,70 +91,61 @@ class InventoryMatchingAgent:
                 if v.get('price', 0) <= max_price_estimate
             ]
         
-        # Limit to 15 vehicles max for token efficiency
-        filtered_inventory = filtered_inventory[:15]
+        # Deterministic pre-ranking: only the top-K candidates go into the prompt
+        ranked = self.ranker.rank(filtered_inventory, profile, top_k=settings.inventory_prompt_top_k)
         
         # Format inventory for the prompt (summary to save tokens)
         inventory_summary = []
-        for v in filtered_inventory:
+        for v, pre_score in ranked:
             # Handle both MongoDB objects (with _id) and demo data
             vid = v.get('_id') or v.get('vin') or str(v.get('id', 'unknown'))
-            summary = f"ID: {vid} | {v.get('make')} {v.get('model')} ({v.get('year')}) | {v.get('price')} MAD | {v.get('specifications', {}).get('fuelType')} | Seats: {v.get('specifications', {}).get('seats')}"
+            summary = f"ID: {vid} | {v.get('make')} {v.get('model')} ({v.get('year')}) | {v.get('price')} MAD | {v.get('specifications', {}).get('fuelType')} | Seats: {v.get('specifications', {}).get('seats')} | Pré-score: {pre_score:.0f}"
             inventory_summary.append(summary)
             
         inventory_text = "\n".join(inventory_summary)
         
-        prompt = ChatPromptTemplate.from_template("""
-        Tu es un expert en recommandation automobile.
-        Ta mission est de trouver les MEILLEURS véhicules pour ce client parmi notre stock.
+        chain = self.prompt | self.llm | self.parser
         
-        PROFIL CLIENT:
-        Segment: {segment}
-        Priorités: {priorities}
-        Sensibilité Prix: {price_sensitivity}
-        Budget (si connu): {budget}
-        
-        INVENTAIRE DISPONIBLE:
-        {inventory_text}
-        
-        Tâche:
-        1. Sélectionne les 3 véhicules les plus pertinents.
-        2. Extrais fidèlement les détails (Marque, Modèle, Année, Prix, ID) de l'inventaire fourni.
-        3. Attribue un score de compatibilité (0-100).
-        4. Explique POURQUOI ce véhicule correspond à CE profil (ex: "Idéal pour la famille car 7 places").
-        5. Liste les arguments de vente clés pour ce client spécifique.
-        
-        {format_instructions}
-        """)
+        inputs = {
+            "segment": profile.get('segment', 'Standard'),
+            "priorities": str(profile.get('priorities', [])),
+            "price_sensitivity": profile.get('price_sensitivity', 'Medium'),
+            "budget": profile.get('monthly_budget', 'Non spécifié'),
+            "inventory_text": inventory_text
+        }
         
-        chain = prompt | self.llm | self.parser
+        async def generate() -> Dict[str, Any]:
+            return await chain.ainvoke(inputs, config=llm_config("inventory_match"))
         
         try:
-            result = await chain.ainvoke({
-                "segment": profile.get('segment', 'Standard'),
-                "priorities": str(profile.get('priorities', [])),
-                "price_sensitivity": profile.get('price_sensitivity', 'Medium'),
-                "budget": profile.get('monthly_budget', 'Non spécifié'),
-                "inventory_text": inventory_text,
-                "format_instructions": self.parser.get_format_instructions()
-            })
+            result = await self.cache.get_or_compute(
+                "inventory_match", inputs, generate,
+                ttl=settings.llm_cache_ttl_inventory_match,
+                bypass=bypass_cache
+            )
             
             return result
             
         except Exception as e:
             print(f"Inventory Matching Error: {e}")
-            return self._get_fallback_matches(inventory)
+            if isinstance(e, OutputParserException):
+                JSON_PARSE_FAILURES.labels(component="inventory_match").inc()
+            FALLBACKS.labels(component="inventory_match").inc()
+            return self._get_fallback_matches(ranked)
             
-    def _get_fallback_matches(self, inventory) -> Dict[str, Any]:
-        """Simple fallback if LLM fails: return cheapest 3"""
-        sorted_inv = sorted(inventory, key=lambda x: x.get('price', 0))[:3]
+    def _get_fallback_matches(self, ranked) -> Dict[str, Any]:
+        """Fallback if LLM fails: top 3 of the deterministic pre-ranking"""
         matches = []
-        for v in sorted_inv:
+        for v, pre_score in ranked[:3]:
             vid = v.get('_id') or v.get('vin') or str(v.get('id', 'unknown'))
             matches.append({
                 "vehicle_id": vid,
-                "match_score": 50,
-                "reasoning": "Recommandation basée sur le prix (Fallback)",
+                "make": v.get('make'),
+                "model": v.get('model'),
+                "year": v.get('year'),
+                "price": v.get('price'),
+                "match_score": round(pre_score),
+                "reasoning": "Recommandation basée sur le profil, le budget et le stock (Fallback)",
                 "selling_points": ["Prix compétitif"]
             })
             
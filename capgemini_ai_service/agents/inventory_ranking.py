@@ -0,0 +1,111 @@
+"""
+Deterministic Inventory Pre-Ranking
+Scores every candidate vehicle against the customer profile with vectorized
+NumPy arithmetic, so only the top-K reach the LLM prompt. The same scores are
+the fallback ranking when the LLM is unavailable.
+
+Each vehicle gets five sub-scores in [0, 1]:
+- budget:  fit of the price to the monthly budget (or cheapness if unknown)
+- space:   number of seats
+- economy: fuel type running cost
+- recency: model year
+- stock:   days in stock (aging stock is pushed slightly)
+Their weights are derived from the profile's segment, priorities and price sensitivity.
+"""
+import unicodedata
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# Loan horizon used to turn a monthly budget into a price (same as the repository pre-filter)
+BUDGET_MONTHS = 60
+BUDGET_TOLERANCE = 1.2
+
+FUEL_ECONOMY = {
+    "electrique": 1.0,
+    "hybride": 0.85,
+    "diesel": 0.7,
+    "essence": 0.4,
+}
+
+# Profile keywords (accent-free, lower-case, FR/EN) boosting each sub-score
+PRIORITY_KEYWORDS = {
+    "budget": ("prix", "price", "budget", "economique", "pas cher", "cheap", "etudiant", "student"),
+    "space": ("famil", "espace", "space", "places", "seats", "enfant", "kids", "coffre"),
+    "economy": ("economie", "economy", "consommation", "fuel", "carburant", "ecolo", "electri", "hybrid"),
+    "recency": ("image", "luxe", "luxury", "tech", "confort", "comfort", "securite", "safety", "recent", "neuf"),
+}
+
+BASE_WEIGHTS = {"budget": 1.0, "space": 0.5, "economy": 0.5, "recency": 0.5, "stock": 0.2}
+PRIORITY_BOOST = 1.5
+PRICE_SENSITIVITY_BOOST = {"high": 1.0, "medium": 0.3, "low": 0.0}
+
+
+def _normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    return text.lower()
+
+
+def _min_max(values: np.ndarray) -> np.ndarray:
+    span = values.max() - values.min()
+    if span == 0:
+        return np.full_like(values, 0.5, dtype=float)
+    return (values - values.min()) / span
+
+
+class InventoryRanker:
+    """Vectorized profile/vehicle scoring"""
+
+    def weights(self, profile: Dict[str, Any]) -> Dict[str, float]:
+        """Derive sub-score weights from segment, priorities and price sensitivity"""
+        weights = dict(BASE_WEIGHTS)
+        text = _normalize_text(" ".join([str(profile.get("segment", ""))] + [str(p) for p in profile.get("priorities", []) or []]))
+
+        for component, keywords in PRIORITY_KEYWORDS.items():
+            if any(keyword in text for keyword in keywords):
+                weights[component] += PRIORITY_BOOST
+
+        sensitivity = str(profile.get("price_sensitivity", "Medium")).lower()
+        weights["budget"] += PRICE_SENSITIVITY_BOOST.get(sensitivity, PRICE_SENSITIVITY_BOOST["medium"])
+        return weights
+
+    def score(self, vehicles: List[Dict[str, Any]], profile: Dict[str, Any]) -> np.ndarray:
+        """Match score (0-100) for each vehicle, in input order"""
+        if not vehicles:
+            return np.zeros(0)
+
+        specs = [v.get("specifications") or {} for v in vehicles]
+        price = np.array([v.get("price") or 0 for v in vehicles], dtype=float)
+        seats = np.array([s.get("seats") or 0 for s in specs], dtype=float)
+        year = np.array([v.get("year") or 0 for v in vehicles], dtype=float)
+        days = np.array([(v.get("inventory") or {}).get("daysInStock") or 0 for v in vehicles], dtype=float)
+        economy = np.array([FUEL_ECONOMY.get(_normalize_text(s.get("fuelType") or ""), 0.5) for s in specs])
+
+        budget = profile.get("monthly_budget") or 0
+        if budget > 0:
+            max_price = budget * BUDGET_MONTHS
+            # 1 within budget, linear decay to 0 at the tolerance ceiling
+            budget_fit = np.clip(1 - (price - max_price) / (max_price * (BUDGET_TOLERANCE - 1)), 0, 1)
+        else:
+            budget_fit = 1 - _min_max(price)
+
+        sub_scores = {
+            "budget": budget_fit,
+            "space": np.clip((seats - 2) / 5, 0, 1),
+            "economy": economy,
+            "recency": _min_max(year),
+            "stock": _min_max(days),
+        }
+
+        weights = self.weights(profile)
+        total = sum(weights.values())
+        combined = sum(weights[name] * values for name, values in sub_scores.items()) / total
+        return np.round(combined * 100, 1)
+
+    def rank(self, vehicles: List[Dict[str, Any]], profile: Dict[str, Any], top_k: int = None) -> List[Tuple[Dict[str, Any], float]]:
+        """Vehicles paired with their score, best first (stable for ties)"""
+        scores = self.score(vehicles, profile)
+        order = np.argsort(-scores, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+        return [(vehicles[i], float(scores[i])) for i in order]
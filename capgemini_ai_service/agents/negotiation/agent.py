@@ -1,6 +1,6 @@
+import asyncio
 from datetime import datetime
-from typing import Dict, Any, List, Optional
-from langchain_groq import ChatGroq
+from typing import Dict, Any, AsyncIterator, List, Optional, Set
 from config.settings import settings
 from schemas.models import (
     NegotiationRequestModel,
@@ -11,12 +11,16 @@ from schemas.types import NegotiationIntent
 from core.session_store import get_session_store, NegotiationSession
 from core.metrics import WinWinCalculator
 from core.logger import logger
+from core.context import agent_context, get_agent_context
+from src.infrastructure.llm.client_registry import get_chat_model
 
 # Import our new modules
 from .language import LanguageDetector
 from .analysis import AnalysisService
 from .state import StateManager
 from .concession import ConcessionEngine
+from .budget_solver import plausible_budget
+from .signals import is_year_like
 from .response import ResponseGenerator
 from .comparison import ComparisonService
 from agents.inventory_agent import inventory_agent
@@ -25,14 +29,13 @@ class NegotiationAgent:
     """Refactored Agent specializing in win-win negotiations"""
     
     def __init__(self):
-        self.llm = ChatGroq(
-            groq_api_key=settings.groq_api_key,
-            model_name=settings.default_model,
+        self.llm = get_chat_model(
             temperature=0.5,  # Reduced from 0.7 for more focused responses
             max_tokens=256  # Reduced from 1024 to enforce brevity
         )
-        self.agent_steps: List[AgentStepModel] = []
         self._session_store = get_session_store()
+        # Streamed turns still running after their client disconnected
+        self._abandoned_turns: Set[asyncio.Task] = set()
         
         # Initialize sub-modules
         self.language = LanguageDetector()
@@ -52,13 +55,68 @@ class NegotiationAgent:
             confidence=confidence,
             timestamp=datetime.now()
         )
-        self.agent_steps.append(step)
-        return step
+        return get_agent_context().add_step(step)
+    
+    @property
+    def agent_steps(self) -> List[AgentStepModel]:
+        """Steps of the request running in the current context"""
+        return get_agent_context().steps
     
     async def negotiate(self, request: NegotiationRequestModel) -> NegotiationResponseModel:
-        """Main negotiation loop"""
-        self.agent_steps = [] # Reset steps for this turn
-        
+        """Main negotiation loop (runs in its own request-scoped context)"""
+        with agent_context(agent="Negotiation Agent", session_id=request.session_id) as ctx:
+            response = await self._negotiate_turn(request, ctx)
+            ctx.logger.debug("negotiation_turn_timings", **ctx.timings)
+            return response
+    
+    async def negotiate_stream(self, request: NegotiationRequestModel) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of `negotiate`.
+        Yields {"event": "token", "data": str} for each reply chunk as the LLM
+        produces it, then a single {"event": "final", "data": NegotiationResponseModel}.
+        """
+        token_queue: asyncio.Queue = asyncio.Queue()
+        with agent_context(agent="Negotiation Agent", session_id=request.session_id) as ctx:
+            # The task copies the current context, so it keeps its own steps
+            turn = asyncio.create_task(self._negotiate_turn(request, ctx, token_queue=token_queue))
+        turn.add_done_callback(lambda _: token_queue.put_nowait(None))
+        
+        awaited = False
+        try:
+            while (token := await token_queue.get()) is not None:
+                yield {"event": "token", "data": token}
+            
+            awaited = True
+            response = await turn
+            ctx.logger.debug("negotiation_turn_timings", **ctx.timings)
+            yield {"event": "final", "data": response}
+        finally:
+            if not awaited:
+                # Client gone mid-turn: let the turn finish (the session is still saved)
+                # and log how it ended; awaiting here would be cancelled with the stream
+                self._abandoned_turns.add(turn)
+                turn.add_done_callback(lambda task: self._log_abandoned_turn(task, request.session_id))
+    
+    def _log_abandoned_turn(self, turn: asyncio.Task, session_id: str) -> None:
+        """Outcome of a streamed turn whose client disconnected"""
+        self._abandoned_turns.discard(turn)
+        if turn.cancelled():
+            logger.warning("negotiation_stream_turn_cancelled", session_id=session_id)
+        elif turn.exception() is not None:
+            logger.error("negotiation_stream_turn_failed", session_id=session_id, error=str(turn.exception()))
+        else:
+            logger.info("negotiation_stream_turn_completed_after_disconnect", session_id=session_id)
+    
+    async def _negotiate_turn(
+        self,
+        request: NegotiationRequestModel,
+        ctx,
+        token_queue: Optional[asyncio.Queue] = None
+    ) -> NegotiationResponseModel:
+        """
+        Single negotiation turn; steps and timings are recorded on `ctx`.
+        When `token_queue` is given, reply chunks are pushed to it as they are generated.
+        """
         # 1. Load Session
         session = await self._get_or_create_session(
             request.session_id, 
@@ -69,8 +127,14 @@ class NegotiationAgent:
         )
         
         
-        # 1.1 Analyze Emotion, Intent & Language (LLM)
-        emotional_context = await self.analysis.analyze_emotion(request.customer_message)
+        # 1.1 Analyze Emotion, Intent & Language (LLM) - both calls run concurrently
+        with ctx.timed("analysis"):
+            emotional_context, intent_result = await self.analysis.analyze_turn(
+                request.customer_message,
+                session.conversation_phase,
+                recent_messages=session.conversation_history[-6:] if session.conversation_history else [],  # Pass context
+                vehicle_price=session.negotiated_price or session.target_vehicle_price
+            )
         
         # LANGUAGE LOGIC (Sticky Session)
         # Use session language if exists, otherwise trust LLM detection
@@ -98,12 +162,6 @@ class NegotiationAgent:
             message=request.customer_message
         )
         
-        intent_result = await self.analysis.detect_intent(
-            request.customer_message, 
-            session.conversation_phase,
-            recent_messages=session.conversation_history[-6:] if session.conversation_history else []  # Pass context
-        )
-        
         intent = intent_result["intent"]
         intent_confidence = intent_result["confidence"]
         intent_reasoning = intent_result["reasoning"]
@@ -127,8 +185,11 @@ class NegotiationAgent:
                     0.9
                 )
         
+        # Deterministic signals of the message (one memoized scan, reused below)
+        signals = self.analysis.signals(request.customer_message)
+        
         # NEW: Detect cash payment preference (from current message OR history if it's a new session)
-        wants_cash = self.analysis.detect_cash_payment_intent(request.customer_message)
+        wants_cash = signals.wants_cash
         
         # If not in current message, check history (helpful after service reloads)
         if not wants_cash and (not session.payment_preference or session.negotiation_round <= 1):
@@ -147,7 +208,7 @@ class NegotiationAgent:
             )
         
         # NEW: Extract counter-offer amount
-        counter_offer_amount = self.analysis.extract_counter_offer_amount(request.customer_message)
+        counter_offer_amount = signals.counter_offer_amount
         
         # Fallback: If we have a clear price or cash intent, don't ask for clarification
         # even if intent detection failed due to 429/errors
@@ -199,8 +260,14 @@ class NegotiationAgent:
         new_needs = self.analysis.extract_needs(request.customer_message, session.customer_needs)
         session.customer_needs = new_needs
         
-        # 3.1. Extract Counter-Offer Amount (if client proposes a specific price)
-        counter_offer_amount = self.analysis.extract_counter_offer_amount(request.customer_message)
+        # 3.0.1 Budget the solver may act on: stated explicitly, never a model year
+        explicit_budget = self._explicit_budget(
+            request.customer_message, intent, session.negotiated_price or session.target_vehicle_price
+        )
+        if explicit_budget:
+            session.stated_budget = explicit_budget
+        
+        # 3.1. Counter-Offer Amount (if client proposes a specific price)
         if counter_offer_amount:
             self._log_step(
                 "Contre-offre Détectée",
@@ -333,7 +400,7 @@ class NegotiationAgent:
         if new_offer and new_offer.get("suggest_alternatives"):
             alternatives = await self.comparison.find_alternative_vehicles(
                 current_price=session.target_vehicle_price,
-                customer_budget=session.customer_profile.inferred_budget or 5000
+                customer_budget=new_offer.get("budget_monthly") or session.customer_profile.inferred_budget or 5000
             )
             
         # 7. Generate Response
@@ -359,23 +426,34 @@ class NegotiationAgent:
                 "darija": "Bghit nfhem mzyan. Wach t9dr twdh liya chno katb7t 3lih?"
             }
             response_text = clarification_responses.get(detected_language, clarification_responses["fr"])
+            if token_queue is not None:
+                token_queue.put_nowait(response_text)
         else:
-            response_text = await self.response.generate_response(
-                customer_msg=request.customer_message,
-                emotion=emotional_context,
-                new_offer=new_offer or current_offer, # Fallback to current offer!
-                car_name=car_name,
-                needs_str=needs_str,
-                phase=session.conversation_phase,
-                reasoning=reasoning,
-                language=detected_language,
-                vehicle_features=getattr(session, 'vehicle_features', []),
-                vehicle_specs=getattr(session, 'vehicle_specs', {}),
-                vehicle_price=session.target_vehicle_price or 0,
-                vehicle_cost=session.vehicle_cost or 0, 
-                round_number=session.negotiation_round,
-                session=session # NEW: Pass the whole session for context
-            )
+            with ctx.timed("response_generation"):
+                response_kwargs = dict(
+                    customer_msg=request.customer_message,
+                    emotion=emotional_context,
+                    new_offer=new_offer or current_offer, # Fallback to current offer!
+                    car_name=car_name,
+                    needs_str=needs_str,
+                    phase=session.conversation_phase,
+                    reasoning=reasoning,
+                    language=detected_language,
+                    vehicle_features=getattr(session, 'vehicle_features', []),
+                    vehicle_specs=getattr(session, 'vehicle_specs', {}),
+                    vehicle_price=session.target_vehicle_price or 0,
+                    vehicle_cost=session.vehicle_cost or 0, 
+                    round_number=session.negotiation_round,
+                    session=session # NEW: Pass the whole session for context
+                )
+                if token_queue is None:
+                    response_text = await self.response.generate_response(**response_kwargs)
+                else:
+                    chunks = []
+                    async for chunk in self.response.stream_response(**response_kwargs):
+                        chunks.append(chunk)
+                        token_queue.put_nowait(chunk)
+                    response_text = "".join(chunks)
         
         # 8. Update Session & Metrics
         session.add_message("agent", response_text)
@@ -439,7 +517,8 @@ class NegotiationAgent:
                 location=getattr(session, 'vehicle_location', '')
             )
             
-        await self._save_session(session)
+        with ctx.timed("session_save"):
+            await self._save_session(session)
         
         return NegotiationResponseModel(
             session_id=request.session_id,
@@ -451,7 +530,7 @@ class NegotiationAgent:
             alternatives=alternatives, 
             reasoning=reasoning,
             confidence=0.9,
-            agent_steps=self.agent_steps,
+            agent_steps=ctx.steps,
             should_finalize=(intent == NegotiationIntent.ACCEPT),
             negotiation_round=session.negotiation_round,
             emotional_trend=trend_data.get("trend", "stable"),
@@ -460,6 +539,20 @@ class NegotiationAgent:
             vehicle_card=vehicle_card  # NEW: Structured vehicle data!
         )
 
+    def _explicit_budget(self, message: str, intent: NegotiationIntent, vehicle_price: float) -> Optional[float]:
+        """
+        Budget stated in `message`: an amount with a unit ("k", currency, "/mois"),
+        or any figure in a BUDGET_MENTION turn unless it reads as a model year.
+        Amounts that make no sense against the vehicle price are ignored.
+        """
+        signals = self.analysis.signals(message)
+        budget = signals.explicit_budget
+        if budget is None and intent == NegotiationIntent.BUDGET_MENTION and not is_year_like(signals.stated_budget):
+            budget = signals.stated_budget
+        if budget and plausible_budget(budget, vehicle_price or 0):
+            return budget
+        return None
+
     async def _get_or_create_session(
         self, 
         session_id: str, 
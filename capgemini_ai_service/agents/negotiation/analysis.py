@@ -1,26 +1,60 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import json
 import re
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from schemas.models import EmotionalContextModel
 from schemas.types import EmotionType, NegotiationIntent
+from config.settings import settings
 from core.logger import logger
+from src.infrastructure.llm.prompt_registry import register_prompt
+from .intent_rules import classify_intent
+from .signals import NEED_KEYWORDS, MessageSignals, message_signals
+from src.infrastructure.monitoring import FALLBACKS, INTENT_CLASSIFICATIONS, JSON_PARSE_FAILURES, llm_config
 
-class AnalysisService:
-    """Handles LLM-based understanding (Emotion, Intent, Needs)"""
+# Fused emotion + language + intent analysis (ANALYSIS_MODE=fused)
+TURN_ANALYSIS_PROMPT = """Tu es un expert en analyse de conversations commerciales automobiles au Maroc.
+Fais l'ANALYSE COMPLÈTE DU TOUR pour ce nouveau message client.
 
-    def __init__(self, llm):
-        self.llm = llm
-        
-    async def analyze_emotion(self, message: str) -> EmotionalContextModel:
-        """
-        Detect customer emotion from message using LLM with robust parsing
-        """
-        """
-        Detect customer emotion from message using LLM with robust parsing
-        """
-        prompt = ChatPromptTemplate.from_template(
-            """Analyse l'émotion, le sentiment ET LA LANGUE de ce message client.
+CONTEXTE DE LA CONVERSATION:
+Phase actuelle: {phase}
+{context}
+
+NOUVEAU MESSAGE DU CLIENT:
+"{message}"
+
+1. ÉMOTION: neutral, happy, frustrated, excited, worried, budget_stressed, confused, satisfied
+2. LANGUE: "fr" (Français), "en" (English), "ar" (Arabe standard, script arabe),
+   "ma" (Darija: "Salam", "Bghit", "Tomobil", "Ch7al" ou chiffres 3/7/9 comme lettres)
+3. INTENTION (une seule):
+- ACCEPT: accepte EXPLICITEMENT une offre de prix déjà proposée
+- REJECT: refuse explicitement (offre, véhicule, ou conversation)
+- COUNTER_OFFER: propose un autre prix/conditions (ex: "Je vous la prends à 123,000 MAD")
+- PRICE_OBJECTION: trouve le prix trop élevé (mais ne refuse pas)
+- VEHICLE_INTEREST: intérêt pour un véhicule SANS offre de prix reçue
+- VEHICLE_REJECTION: ne veut pas CE véhicule (mais cherche autre chose)
+- REQUEST_INFO / QUESTION: demande des informations
+- BUDGET_MENTION: mentionne son budget sans contre-offre
+- SHARE_NEEDS: partage ses besoins/préférences
+- HESITATION: hésite, demande du temps
+- GREETING: salutation simple
+- UNCLEAR: impossible à déterminer
+
+⚠️ "Je veux acheter cette voiture" SANS offre de prix = VEHICLE_INTEREST, PAS ACCEPT.
+
+Réponds UNIQUEMENT en JSON valide:
+{{
+    "primary_emotion": "neutral",
+    "sentiment_score": 0.0-1.0,
+    "intensity": 1-10,
+    "recommended_tone": "rassurant, énergique, empathique...",
+    "detected_language": "fr/en/ar/ma",
+    "intent": "CODE_INTENTION",
+    "confidence": 0-100,
+    "reasoning": "Explication courte"
+}}"""
+
+EMOTION_PROMPT = """Analyse l'émotion, le sentiment ET LA LANGUE de ce message client.
             
             Message: "{message}"
             
@@ -49,81 +83,8 @@ class AnalysisService:
             
             ⚠️ IMPORTANT pour la langue: Si le client utilise des mots comme "Salam", "Bghit", "Tomobil", "Ch7al" ou des chiffres (3, 7, 9) pour écrire, c'est du DARIJA ("ma").
             """
-        )
-        
-        try:
-            chain = prompt | self.llm
-            result = await chain.ainvoke({"message": message})
-            
-            # Robust parsing with escape handling
-            content = result.content.strip()
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-            
-            # Clean up common escape issues
-            content = content.strip()
-            # Replace problematic backslashes that aren't valid JSON escapes
-            # But preserve valid ones like \n, \t, \", \\
-            import re
-            # This regex preserves valid JSON escapes
-            content = re.sub(r'\\(?!["\\/bfnrtu])', r'\\\\', content)
-            
-            import json
-            data = json.loads(content)
-            
-            # Normalize intensity
-            raw_intensity = float(data.get("intensity", 5))
-            normalized_intensity = min(1.0, max(0.0, raw_intensity / 10.0))
-            
-            return EmotionalContextModel(
-                primary_emotion=EmotionType(data.get("primary_emotion", "neutral")),
-                sentiment_score=float(data.get("sentiment_score", 0.5)),
-                intensity=normalized_intensity,
-                key_concerns=data.get("key_concerns", []),
-                recommended_tone=data.get("recommended_tone", "professionnel"),
-                recommended_strategy=data.get("recommended_strategy", "écoute active"),
-                detected_language=data.get("detected_language", "fr")  # NEW: LLM Detected Language
-            )
-        except Exception as e:
-            logger.error(f"Emotion analysis failed: {e}")
-            return EmotionalContextModel(
-                primary_emotion=EmotionType.NEUTRAL,
-                intensity=0.5,
-                sentiment_score=0.0,
-                key_concerns=[],
-                recommended_tone="professionnel",
-                recommended_strategy="écoute active"
-            )
 
-    async def detect_intent(
-        self, 
-        message: str, 
-        phase: str,
-        recent_messages: List[Dict[str, str]] = None
-    ) -> Dict[str, Any]:
-        """
-        LLM-based intent classification with confidence scoring.
-        
-        Returns:
-            {
-                "intent": NegotiationIntent,
-                "confidence": 0.0-1.0,
-                "reasoning": str,
-                "needs_clarification": bool
-            }
-        """
-        # Build context from recent messages (last 3)
-        context_str = ""
-        if recent_messages:
-            for msg in recent_messages[-3:]:
-                role = msg.get("role", "user")
-                content = msg.get("content", msg.get("message", ""))
-                context_str += f"{'Client' if role == 'user' else 'Agent'}: {content}\n"
-        
-        prompt = ChatPromptTemplate.from_template(
-            """Tu es un expert en analyse de conversations commerciales automobiles.
+INTENT_PROMPT = """Tu es un expert en analyse de conversations commerciales automobiles.
 
 CONTEXTE DE LA CONVERSATION:
 Phase actuelle: {phase}
@@ -165,58 +126,265 @@ Réponds UNIQUEMENT en JSON:
     "confidence": 0-100,
     "reasoning": "Explication courte de ton analyse"
 }}"""
+
+
+class AnalysisService:
+    """Handles LLM-based understanding (Emotion, Intent, Needs)"""
+
+    # LLM intent codes -> domain intents
+    INTENT_MAP = {
+        "ACCEPT": NegotiationIntent.ACCEPT,
+        "REJECT": NegotiationIntent.REJECT,
+        "COUNTER_OFFER": NegotiationIntent.COUNTER_OFFER,
+        "PRICE_OBJECTION": NegotiationIntent.BUDGET_MENTION,
+        "VEHICLE_REJECTION": NegotiationIntent.REQUEST_ALTERNATIVE,
+        "QUESTION": NegotiationIntent.REQUEST_INFO,
+        "SHARE_NEEDS": NegotiationIntent.VEHICLE_INTEREST,
+        "HESITATION": NegotiationIntent.EXPRESS_CONCERN,
+        "GREETING": NegotiationIntent.GREETING,
+        "UNCLEAR": NegotiationIntent.INQUIRY,
+    }
+
+    def __init__(self, llm):
+        self.llm = llm
+        self._turn_prompt = register_prompt("turn_analysis", TURN_ANALYSIS_PROMPT)
+        self._emotion_prompt = register_prompt("emotion", EMOTION_PROMPT)
+        self._intent_prompt = register_prompt("intent", INTENT_PROMPT)
+
+    async def analyze_turn(
+        self,
+        message: str,
+        phase: str,
+        recent_messages: List[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        mode: Optional[str] = None,
+        vehicle_price: Optional[float] = None
+    ) -> Tuple[EmotionalContextModel, Dict[str, Any]]:
+        """
+        Run emotion analysis and intent detection for one customer turn.
+
+        In "split" mode (default) the two LLM calls are independent, so they run
+        concurrently and turn latency is bounded by the slower one instead of
+        their sum. Each call gets its own timeout; if one fails or times out,
+        its neutral fallback is used and the other result is kept.
+
+        In "fused" mode a single prompt returns both analyses (see
+        analyze_turn_fused). The mode defaults to settings.analysis_mode.
+
+        In both modes, unambiguous messages are first classified by the
+        deterministic rules (see intent_rules, which check agreements against
+        `recent_messages` and counter-offers against `vehicle_price`); at or
+        above settings.intent_fast_path_threshold only the emotion call is made.
+        """
+        timeout = timeout if timeout is not None else settings.analysis_timeout
+        mode = mode or settings.analysis_mode
+
+        rule_result = None
+        if settings.intent_fast_path_enabled:
+            rule_result = classify_intent(message, phase, recent_messages, vehicle_price)
+        if rule_result is not None and rule_result["confidence"] >= settings.intent_fast_path_threshold:
+            INTENT_CLASSIFICATIONS.labels(source="rules").inc()
+            logger.info(f"Intent detected (rules): {rule_result['intent'].value} (conf: {rule_result['confidence']:.0%})")
+            try:
+                emotion_result = await asyncio.wait_for(self.analyze_emotion(message), timeout)
+            except Exception as e:
+                logger.error(f"Emotion analysis failed in fast path: {e!r}")
+                emotion_result = self._fallback_emotion()
+            return emotion_result, rule_result
+
+        INTENT_CLASSIFICATIONS.labels(source="llm").inc()
+        if mode == "fused":
+            return await self.analyze_turn_fused(message, phase, recent_messages, timeout)
+
+        emotion_result, intent_result = await asyncio.gather(
+            asyncio.wait_for(self.analyze_emotion(message), timeout),
+            asyncio.wait_for(self.detect_intent(message, phase, recent_messages), timeout),
+            return_exceptions=True
         )
+
+        if isinstance(emotion_result, BaseException):
+            logger.error(f"Emotion analysis failed in concurrent stage: {emotion_result!r}")
+            emotion_result = self._fallback_emotion()
+        if isinstance(intent_result, BaseException):
+            logger.error(f"Intent detection failed in concurrent stage: {intent_result!r}")
+            intent_result = self._fallback_intent()
+
+        return emotion_result, intent_result
+
+    def _fallback_emotion(self) -> EmotionalContextModel:
+        """Neutral emotional context used when analysis is unavailable"""
+        FALLBACKS.labels(component="emotion").inc()
+        return EmotionalContextModel(
+            primary_emotion=EmotionType.NEUTRAL,
+            intensity=0.5,
+            sentiment_score=0.0,
+            key_concerns=[],
+            recommended_tone="professionnel",
+            recommended_strategy="écoute active"
+        )
+
+    def _fallback_intent(self) -> Dict[str, Any]:
+        """Low-confidence intent used when detection is unavailable"""
+        FALLBACKS.labels(component="intent").inc()
+        return {
+            "intent": NegotiationIntent.INQUIRY,
+            "confidence": 0.0,
+            "reasoning": "Dépassement de quota ou erreur technique",
+            "needs_clarification": True # Agent will override this if price is found
+        }
+
+    async def analyze_turn_fused(
+        self,
+        message: str,
+        phase: str,
+        recent_messages: List[Dict[str, str]] = None,
+        timeout: Optional[float] = None
+    ) -> Tuple[EmotionalContextModel, Dict[str, Any]]:
+        """
+        Single "turn understanding" call returning emotion, sentiment, intensity,
+        language AND intent with its confidence.
+
+        Halves request count and prompt tokens against the Groq rate limit.
+        Results go through the same builders as the split path, so both modes
+        produce identical structures from identical model answers.
+        """
+        timeout = timeout if timeout is not None else settings.analysis_timeout
+
+        try:
+            chain = self._turn_prompt | self.llm
+            result = await asyncio.wait_for(
+                chain.ainvoke({
+                    "message": message,
+                    "phase": phase,
+                    "context": self._format_context(recent_messages)
+                }, config=llm_config("turn_analysis")),
+                timeout
+            )
+            data = self._parse_json(result.content, escape_backslashes=True)
+
+            emotional_context = self._build_emotional_context(data)
+            intent_result = self._build_intent_result(data)
+            logger.info(f"Turn analyzed (fused): {emotional_context.primary_emotion.value} / {intent_result['intent'].value} (conf: {intent_result['confidence']:.0%})")
+            return emotional_context, intent_result
+        except Exception as e:
+            if "429" in str(e):
+                logger.error(f"RATE LIMIT REACHED (429) during fused turn analysis. Using fallback.")
+            else:
+                logger.error(f"Fused turn analysis failed: {e!r}")
+            return self._fallback_emotion(), self._fallback_intent()
+
+    @staticmethod
+    def _format_context(recent_messages: Optional[List[Dict[str, str]]]) -> str:
+        """Build prompt context from the last 3 messages"""
+        context_str = ""
+        if recent_messages:
+            for msg in recent_messages[-3:]:
+                role = msg.get("role", "user")
+                content = msg.get("content", msg.get("message", ""))
+                context_str += f"{'Client' if role == 'user' else 'Agent'}: {content}\n"
+        return context_str if context_str else "Pas de contexte précédent."
+
+    @staticmethod
+    def _parse_json(content: str, escape_backslashes: bool = False) -> Dict[str, Any]:
+        """Robust JSON extraction from an LLM answer (handles ``` fences)"""
+        content = content.strip()
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0]
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0]
+
+        content = content.strip()
+        if escape_backslashes:
+            # Replace problematic backslashes that aren't valid JSON escapes
+            # But preserve valid ones like \n, \t, \", \\
+            content = re.sub(r'\\(?!["\\/bfnrtu])', r'\\\\', content)
+
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            JSON_PARSE_FAILURES.labels(component="negotiation_analysis").inc()
+            raise
+
+    @staticmethod
+    def _build_emotional_context(data: Dict[str, Any]) -> EmotionalContextModel:
+        """Map parsed LLM output to the emotional context model"""
+        # Normalize intensity
+        raw_intensity = float(data.get("intensity", 5))
+        normalized_intensity = min(1.0, max(0.0, raw_intensity / 10.0))
+
+        return EmotionalContextModel(
+            primary_emotion=EmotionType(data.get("primary_emotion", "neutral")),
+            sentiment_score=float(data.get("sentiment_score", 0.5)),
+            intensity=normalized_intensity,
+            key_concerns=data.get("key_concerns", []),
+            recommended_tone=data.get("recommended_tone", "professionnel"),
+            recommended_strategy=data.get("recommended_strategy", "écoute active"),
+            detected_language=data.get("detected_language", "fr")  # NEW: LLM Detected Language
+        )
+
+    @classmethod
+    def _build_intent_result(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map parsed LLM output to the intent result dict"""
+        intent_str = data.get("intent", "UNCLEAR").upper()
+        confidence = min(100, max(0, int(data.get("confidence", 50)))) / 100.0
+
+        return {
+            "intent": cls.INTENT_MAP.get(intent_str, NegotiationIntent.INQUIRY),
+            "confidence": confidence,
+            "reasoning": data.get("reasoning", ""),
+            # Determine if clarification needed (hybrid confidence logic)
+            "needs_clarification": confidence < 0.30
+        }
+        
+    async def analyze_emotion(self, message: str) -> EmotionalContextModel:
+        """
+        Detect customer emotion from message using LLM with robust parsing
+        """
+        """
+        Detect customer emotion from message using LLM with robust parsing
+        """
+        try:
+            chain = self._emotion_prompt | self.llm
+            result = await chain.ainvoke({"message": message}, config=llm_config("emotion"))
+            
+            # Robust parsing with escape handling
+            data = self._parse_json(result.content, escape_backslashes=True)
+            return self._build_emotional_context(data)
+        except Exception as e:
+            logger.error(f"Emotion analysis failed: {e}")
+            return self._fallback_emotion()
+
+    async def detect_intent(
+        self, 
+        message: str, 
+        phase: str,
+        recent_messages: List[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        LLM-based intent classification with confidence scoring.
         
+        Returns:
+            {
+                "intent": NegotiationIntent,
+                "confidence": 0.0-1.0,
+                "reasoning": str,
+                "needs_clarification": bool
+            }
+        """
         try:
-            chain = prompt | self.llm
+            chain = self._intent_prompt | self.llm
             result = await chain.ainvoke({
                 "message": message, 
                 "phase": phase,
-                "context": context_str if context_str else "Pas de contexte précédent."
-            })
-            
-            # Parse response
-            content = result.content.strip()
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-            
-            import json
-            data = json.loads(content)
+                "context": self._format_context(recent_messages)
+            }, config=llm_config("intent"))
             
-            # Map to enum
-            intent_str = data.get("intent", "UNCLEAR").upper()
-            confidence = min(100, max(0, int(data.get("confidence", 50)))) / 100.0
-            reasoning = data.get("reasoning", "")
+            # Parse response and map to enum
+            intent_result = self._build_intent_result(self._parse_json(result.content))
             
-            # Intent mapping
-            intent_map = {
-                "ACCEPT": NegotiationIntent.ACCEPT,
-                "REJECT": NegotiationIntent.REJECT,
-                "COUNTER_OFFER": NegotiationIntent.COUNTER_OFFER,
-                "PRICE_OBJECTION": NegotiationIntent.BUDGET_MENTION,
-                "VEHICLE_REJECTION": NegotiationIntent.REQUEST_ALTERNATIVE,
-                "QUESTION": NegotiationIntent.REQUEST_INFO,
-                "SHARE_NEEDS": NegotiationIntent.VEHICLE_INTEREST,
-                "HESITATION": NegotiationIntent.EXPRESS_CONCERN,
-                "GREETING": NegotiationIntent.GREETING,
-                "UNCLEAR": NegotiationIntent.INQUIRY,
-            }
-            
-            intent = intent_map.get(intent_str, NegotiationIntent.INQUIRY)
+            logger.info(f"Intent detected: {intent_result['intent'].value} (conf: {intent_result['confidence']:.0%}) - {intent_result['reasoning']}")
             
-            # Determine if clarification needed (hybrid confidence logic)
-            needs_clarification = confidence < 0.30
-            
-            logger.info(f"Intent detected: {intent.value} (conf: {confidence:.0%}) - {reasoning}")
-            
-            return {
-                "intent": intent,
-                "confidence": confidence,
-                "reasoning": reasoning,
-                "needs_clarification": needs_clarification
-            }
+            return intent_result
             
         except Exception as e:
             if "429" in str(e):
@@ -224,95 +392,29 @@ Réponds UNIQUEMENT en JSON:
             else:
                 logger.error(f"Intent detection failed: {e}")
                 
-            return {
-                "intent": NegotiationIntent.INQUIRY,
-                "confidence": 0.0,
-                "reasoning": "Dépassement de quota ou erreur technique",
-                "needs_clarification": True # Agent will override this if price is found
-            }
+            return self._fallback_intent()
+
+    def signals(self, message: str) -> MessageSignals:
+        """All deterministic signals of a message (precompiled, memoized)"""
+        return message_signals(message)
 
     def extract_needs(self, message: str, current_needs: Dict[str, Any]) -> Dict[str, Any]:
         """Extract needs using regex patterns (Fast & Deterministic)"""
-        # Patterns to detect customer needs and preferences
-        NEEDS_PATTERNS = {
-            "family": re.compile(r'\b(famille|familiale|enfants|kids|family|children|عائلة|familiya|wlad)\b', re.I),
-            "budget": re.compile(r'\b(budget|(\d+)\s*(k|K|000|dh|mad|درهم)|pas cher|رخيص|rkhis)\b', re.I),
-            "suv": re.compile(r'\b(suv|4x4|grand|big|كبير|kbir)\b', re.I),
-            "economic": re.compile(r'\b(économique|eco|consommation|fuel|بنزين|gasoil|diesel)\b', re.I),
-            "sport": re.compile(r'\b(sport|sportive|rapide|fast|سريع|speed)\b', re.I),
-            "new": re.compile(r'\b(neuf|neuve|new|جديد|jdid)\b', re.I),
-            "used": re.compile(r'\b(occasion|used|مستعمل|msta3mal)\b', re.I),
-        }
-        
+        signals = message_signals(message)
         needs = current_needs.copy() if current_needs else {}
         
-        for need_type, pattern in NEEDS_PATTERNS.items():
-            if pattern.search(message):
+        for need_type in NEED_KEYWORDS:
+            if need_type in signals.needs:
                 needs[need_type] = True
-        
-        # Extract budget if mentioned
-        budget_match = re.search(r'(\d+)\s*(k|K|000|dh|mad|درهم)?', message, re.I)
-        if budget_match:
-            amount_str = budget_match.group(1)
-            # Basic validation to ensure it's a number and not None
-            if amount_str and amount_str.isdigit():
-                amount = int(amount_str)
-                multiplier = budget_match.group(2)
-                if multiplier and multiplier.lower() in ['k', '000']:
-                    amount *= 1000
-                if amount > 100:  # Likely a budget mention
-                    needs['stated_budget'] = amount
+        if signals.stated_budget is not None:
+            needs['stated_budget'] = signals.stated_budget
         
         return needs
 
     def detect_cash_payment_intent(self, message: str) -> bool:
         """Detect if customer wants to pay in cash (one-time payment)."""
-        message = message.lower()
-        
-        cash_patterns = [
-            r'\b(cash|comptant|une fois|en une fois|payer tout|tout payer|pas de mensualit[ée]|sans mensualit[ée])\b',
-            r'\b(combien pour (la |le )?prendre|quel (est le )?prix (total|cash)?)\b',
-            r'\b(je (ne )?veux pas (de |d\' )?mensualit[ée]|pas int[ée]ress[ée] par mensualit[ée])\b',
-            r'\b(payer? (en )?une seule fois|payant une seule fois|paiement (en )?une fois)\b',
-            r'\b(prix total|co[uû]t total|montant total)\b',
-            r'\b([àa] combien vous la vendez|quel est le prix)\b'
-        ]
-        
-        for pattern in cash_patterns:
-            if re.search(pattern, message, re.I):
-                return True
-        return False
+        return message_signals(message).wants_cash
     
     def extract_counter_offer_amount(self, message: str) -> Optional[float]:
         """Extract specific price amount from counter-offer"""
-        # Clean message slightly for easier extraction
-        msg = message.replace(',', '').replace(' ', '')
-        
-        # Patterns like "124000 MAD", "124 000", "124k", "124,000", etc.
-        patterns = [
-            r'(\d+)\s*k\b',  # 124k
-            r'(\d{3,})\s*(mad|dh|dirham|dhs)?',  # 124000 MAD
-            r'(\d+)[,\.\s](\d{3})\s*(mad|dh|dirham|dhs)?'  # 124,000 or 124.000 or 124 000
-        ]
-        
-        # Try raw extraction first (without cleaning)
-        for pattern in patterns:
-            match = re.search(pattern, message, re.I)
-            if match:
-                if 'k' in pattern:
-                    return float(match.group(1)) * 1000
-                elif len(match.groups()) >= 2 and match.group(2) and match.group(2).isdigit():
-                    # Format: "124 000", "124,000", "124.000"
-                    return float(match.group(1) + match.group(2))
-                else:
-                    amount = float(match.group(1))
-                    if amount > 1000:  # Likely a full price
-                        return amount
-        
-        # Fallback to cleaned message if nothing found
-        match = re.search(r'(\d{4,})', msg)
-        if match:
-            return float(match.group(1))
-            
-        return None
-
+        return message_signals(message).counter_offer_amount
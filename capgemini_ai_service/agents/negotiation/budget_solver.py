@@ -0,0 +1,158 @@
+"""
+Closed-Form Budget Solver
+Finds, in one step, the offer that meets the customer's stated budget with
+the smallest price concession, instead of walking toward it 2.5-3% per round
+(each round costing an emotion, an intent and a reply LLM call).
+
+Monthly budgets: the amount financed by the current offer is recovered from
+its monthly payment (flat FINANCING_RATE, as ConcessionEngine's floor
+estimate), then for each duration from the current one up to the longest the
+largest amount still within budget is closed-form:
+
+    monthly = financed * (1 + rate * months / 12) / months
+
+The duration needing the smallest price cut wins (the shortest on ties).
+Extra down payment, when the customer has some, is used before any price cut.
+Total budgets (cash buyers, or amounts that can only be a price) are the
+target price itself; the monthly payment drops by the financed share of the
+cut (the whole cut for cash buyers).
+
+When even the floor price cannot meet the budget the solution is infeasible:
+the floor offer is made and the negotiation goes straight to alternatives.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+# Same assumptions as ConcessionEngine
+FINANCING_RATE = 0.055
+DEFAULT_DURATION = 60
+DURATIONS = (12, 24, 36, 48, 60, 72, 84)
+
+# A budget above this share of the price is a total price, not a monthly payment
+TOTAL_BUDGET_SHARE = 0.2
+
+# Budgets outside these shares of the price are not about this vehicle
+MIN_BUDGET_SHARE = 0.005
+MAX_BUDGET_SHARE = 3.0
+
+
+@dataclass(frozen=True)
+class BudgetSolution:
+    """Offer meeting the budget with the smallest concession (or the floor offer if none does)"""
+    feasible: bool
+    budget_type: str  # monthly | total
+    price: float
+    monthly: float
+    duration: int
+    down_payment: float
+    concession: float  # price reduction from the current offer
+
+    def to_offer(self, current_offer: Dict[str, Any]) -> Dict[str, Any]:
+        """`current_offer` updated with this solution"""
+        offer = current_offer.copy()
+        offer.update({
+            "price": round(self.price, 0),
+            "monthly": round(self.monthly, 2),
+            "duration": self.duration,
+            "down_payment": round(self.down_payment, 2),
+        })
+        return offer
+
+
+def financing_factor(months: float, rate: float = FINANCING_RATE) -> float:
+    """Total repaid per MAD financed over `months` (flat rate)"""
+    return 1 + rate * months / 12
+
+
+def budget_type_for(budget: float, price: float, cash: bool = False) -> str:
+    """'total' for cash buyers and for amounts too large to be a monthly payment"""
+    return "total" if cash or budget > price * TOTAL_BUDGET_SHARE else "monthly"
+
+
+def plausible_budget(budget: float, price: float) -> bool:
+    """Whether `budget` can be a monthly payment or a total for a vehicle at `price`"""
+    if price <= 0:
+        return budget > 0
+    return MIN_BUDGET_SHARE * price <= budget <= MAX_BUDGET_SHARE * price
+
+
+def solve_budget(
+    current_offer: Dict[str, Any],
+    budget: float,
+    floor_price: float,
+    cash: bool = False,
+    max_down_payment: Optional[float] = None,
+    rate: float = FINANCING_RATE,
+    durations: Sequence[int] = DURATIONS,
+) -> Optional[BudgetSolution]:
+    """
+    Minimal-concession offer meeting `budget` without going below `floor_price`.
+    Returns None without a usable budget or price, or when the current offer
+    already fits the budget.
+    """
+    price = float(current_offer.get("price") or 0)
+    if not budget or budget <= 0 or price <= 0:
+        return None
+
+    months = int(current_offer.get("duration") or DEFAULT_DURATION)
+    down = float(current_offer.get("down_payment") or 0)
+    monthly = float(current_offer.get("monthly") or 0)
+    floor_price = min(floor_price, price)
+
+    if budget_type_for(budget, price, cash) == "total":
+        if budget >= price:
+            return None
+        target = max(budget, floor_price)
+        factor = 1.0 if cash else financing_factor(months, rate)
+        return BudgetSolution(
+            feasible=budget >= floor_price,
+            budget_type="total",
+            price=target,
+            monthly=max(0.0, monthly - (price - target) * factor / months),
+            duration=months,
+            down_payment=down,
+            concession=price - target,
+        )
+
+    if monthly <= 0:
+        monthly = (price - down) * financing_factor(months, rate) / months
+    if monthly <= budget:
+        return None
+    financed = monthly * months / financing_factor(months, rate)
+    extra_down = max(0.0, (max_down_payment if max_down_payment is not None else down) - down)
+    max_concession = price - floor_price
+
+    best = None
+    for term in sorted({months, *(d for d in durations if d > months)}):
+        factor = financing_factor(term, rate)
+        shortfall = max(0.0, financed - budget * term / factor)
+        added_down = min(extra_down, shortfall)
+        concession = shortfall - added_down
+        if concession > max_concession:
+            continue
+        if best is None or concession < best.concession:
+            best = BudgetSolution(
+                feasible=True,
+                budget_type="monthly",
+                price=price - concession,
+                monthly=(financed - shortfall) * factor / term,
+                duration=term,
+                down_payment=down + added_down,
+                concession=concession,
+            )
+
+    if best is not None:
+        return best
+
+    # Even the floor price over the longest duration is above budget
+    term = max(months, *durations)
+    factor = financing_factor(term, rate)
+    return BudgetSolution(
+        feasible=False,
+        budget_type="monthly",
+        price=floor_price,
+        monthly=(financed - extra_down - max_concession) * factor / term,
+        duration=term,
+        down_payment=down + extra_down,
+        concession=max_concession,
+    )
@@ -2,7 +2,18 @@ from typing import Dict, Any, Optional, Tuple
 from schemas.types import NegotiationIntent, EmotionType
 from schemas.models import EmotionalContextModel
 from agents.strategies import get_strategy_for_intent
+from config.settings import settings
 from core.logger import logger
+from src.infrastructure.monitoring import BUDGET_SOLUTIONS
+from .budget_solver import BudgetSolution, solve_budget
+
+# Intents for which a stated budget is worth meeting right away
+# (counter-offers keep their own meet-halfway logic below)
+BUDGET_INTENTS = {
+    NegotiationIntent.BUDGET_MENTION,
+    NegotiationIntent.EXPRESS_CONCERN,
+    NegotiationIntent.REJECT,
+}
 
 class ConcessionEngine:
     """Calculates counter-offers and concessions based on strategy"""
@@ -73,6 +84,17 @@ class ConcessionEngine:
                 min_monthly = (floor_price * (1 + (interest_rate * (duration/12)))) / duration
         else:
             min_monthly = floor_price # Cash buy scenario
+        
+        # 1.1 Stated budget: solve for the offer meeting it in one move (or prove it out of reach)
+        if settings.budget_solver_enabled and session_budget and intent in BUDGET_INTENTS:
+            solution = solve_budget(
+                current_offer,
+                session_budget,
+                floor_price=floor_price,
+                cash=is_cash_payment
+            )
+            if solution:
+                return self._budget_offer(current_offer, solution, session_budget)
             
         # 2. Select Strategy
         # If customer is angry/stressed, pick easier strategy
@@ -228,3 +250,34 @@ class ConcessionEngine:
              new_offer_dict["suggest_alternatives"] = True
              
         return new_offer_dict, reasoning
+
+    def _budget_offer(
+        self,
+        current_offer: Dict[str, Any],
+        solution: BudgetSolution,
+        budget: float
+    ) -> Tuple[Dict[str, Any], str]:
+        """Offer and reasoning for a solved budget; out-of-reach budgets ask for alternatives"""
+        offer = solution.to_offer(current_offer)
+        if solution.budget_type == "monthly":
+            offer["budget_monthly"] = budget
+        logger.info(
+            "budget_solved",
+            feasible=solution.feasible,
+            budget=budget,
+            budget_type=solution.budget_type,
+            concession=round(solution.concession, 2),
+            duration=solution.duration
+        )
+        
+        if not solution.feasible:
+            BUDGET_SOLUTIONS.labels(outcome="infeasible").inc()
+            offer["suggest_alternatives"] = True
+            return offer, "Votre budget est en dessous de notre prix minimum pour ce véhicule. Voici ma meilleure offre, et je vous propose aussi des alternatives adaptées."
+        
+        BUDGET_SOLUTIONS.labels(outcome="met").inc()
+        if solution.budget_type == "monthly":
+            reasoning = f"Pour respecter votre budget, je peux vous proposer {solution.monthly:,.0f} MAD/mois sur {solution.duration} mois."
+        else:
+            reasoning = f"Pour respecter votre budget, je peux descendre à {solution.price:,.0f} MAD."
+        return offer, reasoning
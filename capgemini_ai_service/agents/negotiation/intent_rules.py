@@ -0,0 +1,131 @@
+"""
+Rule-Based Intent Fast Path
+High-precision deterministic intent rules run before the LLM classifier.
+
+Only messages that are unambiguous on their own are classified: a bare
+greeting; a bare agreement or refusal answering an offer (the last agent
+turn quoted one); an explicit counter-offer whose amount is plausible for
+the vehicle's price. Anything else returns None and goes to the LLM. Each
+rule carries a fixed confidence, compared with
+settings.intent_fast_path_threshold by AnalysisService.analyze_turn.
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+from schemas.types import NegotiationIntent
+from .signals import message_signals
+
+# Whole-message phrases (after normalization)
+GREETINGS = {
+    "bonjour", "bonsoir", "salut", "hello", "hi", "hey", "salam", "slm", "salam alaykoum",
+    "salam alikoum", "salamou alaykoum", "mrhba", "marhba", "ahlan", "السلام عليكم", "سلام", "مرحبا",
+}
+# Bare acknowledgements ("ok", "safi") are left to the LLM: they answer any question
+AGREEMENTS = {
+    "d'accord", "d accord", "ok d'accord", "ça marche", "ca marche", "parfait",
+    "marché conclu", "marche conclu", "je prends", "je la prends", "on fait comme ça", "deal", "it's a deal",
+    "i accept", "accepted", "wakha", "mzyan", "mezyan", "wakha safi", "واخا", "موافق",
+}
+REFUSALS = {
+    "non merci", "no thanks", "no thank you", "pas intéressé", "pas interessé", "pas intéressée",
+    "ça ne m'intéresse pas", "not interested", "la shukran", "la chokran", "لا شكرا",
+}
+
+# Counter-offer phrasing; an amount must be present too
+_COUNTER_OFFER_RE = re.compile(
+    r"\b(?:je (?:vous )?la prends [àa]|je (?:vous )?propose|je peux (?:mettre|payer|aller jusqu'[àa])|"
+    r"mon offre|ma proposition|derni(?:er|ère) (?:prix|offre)|i (?:can )?offer|i can pay|my offer|"
+    r"n9der n(?:khales|khlass|dfe3)|ndir lik)\b",
+    re.I,
+)
+
+# An agent turn quoting an offer: an amount with a unit, or offer vocabulary
+_OFFER_RE = re.compile(
+    r"\d[\d\s.,]*\s*(?:k\b|mad\b|dh\b|dhs\b|dirhams?\b|/\s*mois|par mois)|\boffre\b|\bmensualit|\bproposition\b",
+    re.I,
+)
+
+_PUNCTUATION_RE = re.compile(r"[!?.,;:…¡¿'\"\s]+$|^[\s]+")
+_SPACES_RE = re.compile(r"\s+")
+
+# Rule confidences (comparable to the LLM's 0-1 confidence)
+GREETING_CONFIDENCE = 0.95
+AGREEMENT_CONFIDENCE = 0.9
+COUNTER_OFFER_CONFIDENCE = 0.9
+REFUSAL_CONFIDENCE = 0.85
+
+# Phases in which an offer has been presented (ACCEPT is only meaningful there)
+OFFER_PHASES = {"negotiation", "closing"}
+
+# Counter-offers outside this share of the vehicle price go to the LLM
+# (e.g. "je vous propose 2019 pour la Clio 2019")
+COUNTER_OFFER_RANGE = (0.5, 1.1)
+
+
+def _normalize(message: str) -> str:
+    text = _SPACES_RE.sub(" ", message.lower().replace("’", "'")).strip()
+    return _PUNCTUATION_RE.sub("", text)
+
+
+def _result(intent: NegotiationIntent, confidence: float, reasoning: str) -> Dict[str, Any]:
+    return {
+        "intent": intent,
+        "confidence": confidence,
+        "reasoning": reasoning,
+        "needs_clarification": False,
+    }
+
+
+def offer_presented(recent_messages: Optional[List[Dict[str, str]]]) -> bool:
+    """Whether the last agent turn quoted an offer"""
+    for msg in reversed(recent_messages or []):
+        if msg.get("speaker") == "agent" or msg.get("role") in ("assistant", "agent"):
+            return _OFFER_RE.search(msg.get("message", msg.get("content", "")) or "") is not None
+    return False
+
+
+def plausible_offer(amount: float, vehicle_price: Optional[float]) -> bool:
+    """Whether `amount` can be a price for a vehicle listed at `vehicle_price`"""
+    if not vehicle_price or vehicle_price <= 0:
+        return False
+    low, high = COUNTER_OFFER_RANGE
+    return low * vehicle_price <= amount <= high * vehicle_price
+
+
+def classify_intent(
+    message: str,
+    phase: str,
+    recent_messages: Optional[List[Dict[str, str]]] = None,
+    vehicle_price: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """Intent result (same shape as AnalysisService.detect_intent) or None when ambiguous"""
+    text = _normalize(message)
+    if not text:
+        return None
+
+    if text in GREETINGS:
+        return _result(NegotiationIntent.GREETING, GREETING_CONFIDENCE, "Salutation simple (règle)")
+
+    # Agreeing or refusing is only deal-level when it answers an offer
+    answers_offer = phase in OFFER_PHASES and offer_presented(recent_messages)
+
+    if answers_offer and text in REFUSALS:
+        return _result(NegotiationIntent.REJECT, REFUSAL_CONFIDENCE, "Refus explicite de l'offre (règle)")
+
+    if answers_offer and text in AGREEMENTS:
+        return _result(NegotiationIntent.ACCEPT, AGREEMENT_CONFIDENCE, "Accord explicite sur l'offre (règle)")
+
+    signals = message_signals(message)
+    if (
+        signals.counter_offer_amount
+        and not signals.wants_cash
+        and plausible_offer(signals.counter_offer_amount, vehicle_price)
+        and _COUNTER_OFFER_RE.search(text)
+    ):
+        return _result(
+            NegotiationIntent.COUNTER_OFFER,
+            COUNTER_OFFER_CONFIDENCE,
+            f"Contre-offre explicite de {signals.counter_offer_amount:,.0f} MAD (règle)",
+        )
+
+    return None
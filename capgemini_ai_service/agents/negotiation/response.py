@@ -1,9 +1,65 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
 import re
 from langchain_core.prompts import ChatPromptTemplate
 from schemas.models import EmotionalContextModel
 from .language import LanguageDetector
 from core.logger import logger
+from src.infrastructure.llm.prompt_registry import register_prompt
+from src.infrastructure.monitoring import FALLBACKS, llm_config
+
+# PERSONALITY VARIANTS: Avoid repetitive "Je comprends parfaitement"
+PERSONALITY_VARIATION = "Varie tes tournures de phrases. Évite de commencer chaque phrase par 'Je comprends'. Sois naturel et chaleureux."
+
+# Reply templates per conversation phase (static text; turn data are variables)
+REPLY_TEMPLATES = {
+    "discovery": """Tu es Karim, conseiller auto au Maroc.
+            
+Message client: "{msg}"
+Véhicule: {vehicle_info}
+
+PERSONNALITÉ:
+- {greeting_instruction}
+- {personality_variation}
+- Pose une seule question de découverte.
+
+⚠️ CONTRAINTE CRITIQUE: MAXIMUM 2-3 PHRASES COURTES. Sois direct et concis.
+Réponds en {language_name}. {language_instruction}""",
+    
+    "negotiation": """Tu es Karim, conseiller commercial au Maroc.
+            
+Message: "{msg}"
+Véhicule: {vehicle_info}
+{offer_text}
+{financing_instruction}
+RAISONNEMENT INTERNE: {reasoning}
+
+RÈGLES CRITIQUES:
+- {greeting_instruction}
+- {personality_variation}
+- SI LE PRIX N'A PAS CHANGÉ: Ne répète pas le chiffre. Explique BRIÈVEMENT pourquoi (1 raison max).
+- ANCHORING: Ton prix actuel est {offer_text}. 
+- ⚠️ INTERDICTION ABSOLUE DE CALCUL: Tu ne peux PAS calculer de prix, de mensualités, ou de totaux. Tu ne peux QUE répéter les chiffres fournis ci-dessus dans {offer_text}.
+- ⚠️ ZÉRO HALLUCINATION: Tu ne peux mentionner QUE les chiffres fournis dans {offer_text}. Ne propose pas d'autres montants que {proposed_price} MAD.
+- {financing_instruction}
+
+⚠️ CONTRAINTE ABSOLUE: MAXIMUM 3 PHRASES. Pas de blabla. Va droit au but.
+Évite les répétitions comme "Félicitations", "Excellent choix", "Qualité exceptionnelle".
+Réponds en {language_name}. {language_instruction}""",
+    
+    "closing": """Tu es Karim, conseiller au Maroc.
+            
+Message: "{msg}"
+Véhicule: {vehicle_info}
+{offer_text}
+
+Félicite BRIÈVEMENT le client pour {vehicle_info}.
+{personality_variation}
+Ne mentionne AUCUN autre chiffre.
+
+⚠️ CONTRAINTE: MAXIMUM 2 PHRASES. Sois chaleureux mais concis.
+Réponds en {language_name}. {language_instruction}""",
+}
+
 
 class ResponseGenerator:
     """Handles prompt engineering and text generation - SIMPLIFIED VERSION"""
@@ -11,6 +67,10 @@ class ResponseGenerator:
     def __init__(self, llm):
         self.llm = llm
         self.language_detector = LanguageDetector()
+        self._prompts = {
+            phase: register_prompt(f"negotiation_reply.{phase}", template, personality_variation=PERSONALITY_VARIATION)
+            for phase, template in REPLY_TEMPLATES.items()
+        }
 
     async def generate_response(
         self, 
@@ -31,6 +91,73 @@ class ResponseGenerator:
         session: Any = None
     ) -> str:
         """Generate phase-aware response"""
+        prompt, inputs, fallback_text = self._build_prompt(
+            customer_msg=customer_msg,
+            emotion=emotion,
+            new_offer=new_offer,
+            car_name=car_name,
+            needs_str=needs_str,
+            phase=phase,
+            reasoning=reasoning,
+            language=language,
+            vehicle_features=vehicle_features,
+            vehicle_specs=vehicle_specs,
+            vehicle_price=vehicle_price,
+            vehicle_cost=vehicle_cost,
+            comparison_vehicles=comparison_vehicles,
+            round_number=round_number,
+            session=session
+        )
+        
+        try:
+            chain = prompt | self.llm
+            res = await chain.ainvoke(inputs, config=llm_config("negotiation_reply"))
+            return res.content
+        except Exception as e:
+            logger.error(f"Response generation failed: {e}")
+            FALLBACKS.labels(component="negotiation_reply").inc()
+            return fallback_text
+
+    async def stream_response(self, **kwargs) -> AsyncIterator[str]:
+        """
+        Stream the phase-aware response token by token.
+        Accepts the same arguments as `generate_response`. If the LLM fails
+        before the first token, the fallback text is yielded instead.
+        """
+        prompt, inputs, fallback_text = self._build_prompt(**kwargs)
+        emitted = False
+        
+        try:
+            chain = prompt | self.llm
+            async for chunk in chain.astream(inputs, config=llm_config("negotiation_reply")):
+                if chunk.content:
+                    emitted = True
+                    yield chunk.content
+        except Exception as e:
+            logger.error(f"Response streaming failed: {e}")
+            if not emitted:
+                FALLBACKS.labels(component="negotiation_reply").inc()
+                yield fallback_text
+
+    def _build_prompt(
+        self, 
+        customer_msg: str, 
+        emotion: EmotionalContextModel, 
+        new_offer: Optional[Dict[str, Any]], 
+        car_name: str,
+        needs_str: str,
+        phase: str,
+        reasoning: str,
+        language: str = "fr",
+        vehicle_features: List[str] = None,
+        vehicle_specs: Dict[str, Any] = None,
+        vehicle_price: float = 0,
+        vehicle_cost: float = 0, # NEW: Safety margin
+        comparison_vehicles: List[Dict[str, Any]] = None,
+        round_number: int = 1,
+        session: Any = None
+    ) -> Tuple[ChatPromptTemplate, Dict[str, Any], str]:
+        """Build the phase template, its inputs and the technical-fallback text"""
         
         language_instruction = self.language_detector.get_instruction(language)
         language_name = self.language_detector.get_name(language)
@@ -69,80 +196,32 @@ class ResponseGenerator:
         else:
             financing_instruction = f"Présente l'offre en mensualités: {m:,.0f} MAD/mois sur {dur} mois. Si le client demande le prix total ou veut payer comptant, accepte et présente le prix total de {p:,.0f} MAD."
 
-        # PERSONALITY VARIANTS: Avoid repetitive "Je comprends parfaitement"
-        personality_variation = "Varie tes tournures de phrases. Évite de commencer chaque phrase par 'Je comprends'. Sois naturel et chaleureux."
-
         vehicle_info = car_name if car_name else "le véhicule"
         floor_price = vehicle_cost * 1.02 if vehicle_cost > 0 else vehicle_price * 0.9 # Hard safety
         
         # SIMPLIFIED: Only 3 templates 
-        templates = {
-            "discovery": f"""Tu es Karim, conseiller auto au Maroc.
-            
-Message client: "{{msg}}"
-Véhicule: {vehicle_info}
-
-PERSONNALITÉ:
-- {greeting_instruction}
-- {personality_variation}
-- Pose une seule question de découverte.
-
-⚠️ CONTRAINTE CRITIQUE: MAXIMUM 2-3 PHRASES COURTES. Sois direct et concis.
-Réponds en {language_name}. {language_instruction}""",
-                
-            "negotiation": f"""Tu es Karim, conseiller commercial au Maroc.
-            
-Message: "{{msg}}"
-Véhicule: {vehicle_info}
-{offer_text}
-{financing_instruction}
-RAISONNEMENT INTERNE: {reasoning}
-
-RÈGLES CRITIQUES:
-- {greeting_instruction}
-- {personality_variation}
-- SI LE PRIX N'A PAS CHANGÉ: Ne répète pas le chiffre. Explique BRIÈVEMENT pourquoi (1 raison max).
-- ANCHORING: Ton prix actuel est {offer_text}. 
-- ⚠️ INTERDICTION ABSOLUE DE CALCUL: Tu ne peux PAS calculer de prix, de mensualités, ou de totaux. Tu ne peux QUE répéter les chiffres fournis ci-dessus dans {offer_text}.
-- ⚠️ ZÉRO HALLUCINATION: Tu ne peux mentionner QUE les chiffres fournis dans {offer_text}. Ne propose pas d'autres montants que {p:,.0f} MAD.
-- {financing_instruction}
-
-⚠️ CONTRAINTE ABSOLUE: MAXIMUM 3 PHRASES. Pas de blabla. Va droit au but.
-Évite les répétitions comme "Félicitations", "Excellent choix", "Qualité exceptionnelle".
-Réponds en {language_name}. {language_instruction}""",
-                
-            "closing": f"""Tu es Karim, conseiller au Maroc.
-            
-Message: "{{msg}}"
-Véhicule: {vehicle_info}
-{offer_text}
-
-Félicite BRIÈVEMENT le client pour {vehicle_info}.
-{personality_variation}
-Ne mentionne AUCUN autre chiffre.
-
-⚠️ CONTRAINTE: MAXIMUM 2 PHRASES. Sois chaleureux mais concis.
-Réponds en {language_name}. {language_instruction}"""
+        prompt = self._prompts.get(phase, self._prompts["negotiation"])
+        
+        inputs = {
+            "msg": customer_msg,
+            "vehicle_info": vehicle_info,
+            "offer_text": offer_text,
+            "financing_instruction": financing_instruction,
+            "reasoning": reasoning,
+            "proposed_price": f"{p:,.0f}",
+            "greeting_instruction": greeting_instruction,
+            "language_name": language_name,
+            "language_instruction": language_instruction,
         }
-
-        template = templates.get(phase, templates["negotiation"])
-        prompt = ChatPromptTemplate.from_template(template)
         
-        try:
-            chain = prompt | self.llm
-            res = await chain.ainvoke({
-                "msg": customer_msg,
-                "tone": emotion.recommended_tone,
-                "reasoning": reasoning
-            })
-            return res.content
-        except Exception as e:
-            logger.error(f"Response generation failed: {e}")
-            if new_offer:
-                p = new_offer.get('price', 0)
-                m = new_offer.get('monthly', 0)
-                if wants_cash:
-                    return f"Je m'excuse, j'ai une petite difficulté technique, mais voici mon offre : {p:,.0f} MAD cash pour la {car_name}."
-                else:
-                    return f"Je m'excuse, j'ai une petite difficulté technique, mais voici mon offre : {m:,.0f} MAD/mois pour la {car_name} (Total: {p:,.0f} MAD)."
-            return "Désolé, je rencontre une petite difficulté technique. Pouvons-nous reprendre dans un instant ?"
+        if new_offer:
+            p = new_offer.get('price', 0)
+            m = new_offer.get('monthly', 0)
+            if wants_cash:
+                fallback_text = f"Je m'excuse, j'ai une petite difficulté technique, mais voici mon offre : {p:,.0f} MAD cash pour la {car_name}."
+            else:
+                fallback_text = f"Je m'excuse, j'ai une petite difficulté technique, mais voici mon offre : {m:,.0f} MAD/mois pour la {car_name} (Total: {p:,.0f} MAD)."
+        else:
+            fallback_text = "Désolé, je rencontre une petite difficulté technique. Pouvons-nous reprendre dans un instant ?"
+        
+        return prompt, inputs, fallback_text
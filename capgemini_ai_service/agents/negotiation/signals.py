@@ -0,0 +1,150 @@
+"""
+Message Signal Engine
+Deterministic signals of a customer message (FR/EN/AR/Darija), extracted
+with patterns compiled once at import and memoized per message.
+
+- needs:   one alternation regex with a named group per need, single finditer pass
+- budget:  first figure above 100 (needs), and the first figure carrying a
+           unit ("k", currency, "/mois") for the budget solver
+- cash:    one alternation over every "pay in one go" phrasing
+- amount:  counter-offer amount (same precedence rules as before: "124k",
+           then a 4+ digit figure, then "124 000" / "124,000")
+- price:   price question keywords (phase routing)
+- language: LanguageDetector heuristics
+
+The negotiation turn asks for the same message several times (cash check,
+two counter-offer extractions, needs, and the cash check over the whole
+history each turn), so every distinct message is scanned once per process.
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Optional
+
+from .language import LanguageDetector
+
+# Need -> keywords (regex alternatives, matched as whole words, case-insensitive)
+NEED_KEYWORDS = {
+    "family": r"famille|familiale|enfants|kids|family|children|عائلة|familiya|wlad",
+    "budget": r"budget|(?:\d+)\s*(?:k|K|000|dh|mad|درهم)|pas cher|رخيص|rkhis",
+    "suv": r"suv|4x4|grand|big|كبير|kbir",
+    "economic": r"économique|eco|consommation|fuel|بنزين|gasoil|diesel",
+    "sport": r"sport|sportive|rapide|fast|سريع|speed",
+    "new": r"neuf|neuve|new|جديد|jdid",
+    "used": r"occasion|used|مستعمل|msta3mal",
+}
+
+# The keyword sets are disjoint, so one non-overlapping scan finds every need
+_NEEDS_RE = re.compile(
+    r"\b(?:" + "|".join(f"(?P<{need}>{keywords})" for need, keywords in NEED_KEYWORDS.items()) + r")\b",
+    re.I,
+)
+_BUDGET_RE = re.compile(r"(\d+)\s*(k|K|000|dh|mad|درهم)?", re.I)
+# "4 000 dh", "120k", "3500/mois": an amount no one would write for a year or a mileage
+_EXPLICIT_BUDGET_RE = re.compile(
+    r"(\d{1,3}(?:[ .,]\d{3})+|\d+)\s*(k\b|dhs?\b|mad\b|dirhams?\b|درهم|/\s*mois\b|par mois\b)",
+    re.I,
+)
+# Bare figures in this range are read as model years ("la Clio 2019")
+YEAR_RANGE = (1950, 2035)
+
+_CASH_RE = re.compile(
+    "|".join([
+        r"\b(?:cash|comptant|une fois|en une fois|payer tout|tout payer|pas de mensualit[ée]|sans mensualit[ée])\b",
+        r"\b(?:combien pour (?:la |le )?prendre|quel (?:est le )?prix (?:total|cash)?)\b",
+        r"\b(?:je (?:ne )?veux pas (?:de |d\' )?mensualit[ée]|pas int[ée]ress[ée] par mensualit[ée])\b",
+        r"\b(?:payer? (?:en )?une seule fois|payant une seule fois|paiement (?:en )?une fois)\b",
+        r"\b(?:prix total|co[uû]t total|montant total)\b",
+        r"\b(?:[àa] combien vous la vendez|quel est le prix)\b",
+    ]),
+    re.I,
+)
+
+# Counter-offer amounts, tried in this order
+_AMOUNT_K_RE = re.compile(r"(\d+)\s*k\b", re.I)  # 124k
+_AMOUNT_FULL_RE = re.compile(r"(\d{3,})\s*(mad|dh|dirham|dhs)?", re.I)  # 124000 MAD
+_AMOUNT_GROUPED_RE = re.compile(r"(\d+)[,\.\s](\d{3})\s*(mad|dh|dirham|dhs)?", re.I)  # 124,000 / 124.000 / 124 000
+_AMOUNT_DIGITS_RE = re.compile(r"(\d{4,})")
+
+# Substring match on purpose ("bchhal" contains "chhal", "mensualités" contains "mensualité")
+_PRICE_QUESTION_RE = re.compile("|".join(["prix", "combien", "mensualité", "price", "cost", "chhal", "bchhal"]))
+
+_language_detector = LanguageDetector()
+
+
+@dataclass(frozen=True)
+class MessageSignals:
+    """Everything the deterministic heuristics know about one message"""
+    needs: FrozenSet[str]
+    stated_budget: Optional[int]
+    explicit_budget: Optional[int]
+    wants_cash: bool
+    counter_offer_amount: Optional[float]
+    asks_price: bool
+    language: str
+
+
+def _extract_budget(message: str) -> Optional[int]:
+    budget_match = _BUDGET_RE.search(message)
+    if budget_match:
+        amount_str = budget_match.group(1)
+        # Basic validation to ensure it's a number and not None
+        if amount_str and amount_str.isdigit():
+            amount = int(amount_str)
+            multiplier = budget_match.group(2)
+            if multiplier and multiplier.lower() in ['k', '000']:
+                amount *= 1000
+            if amount > 100:  # Likely a budget mention
+                return amount
+    return None
+
+
+def _extract_explicit_budget(message: str) -> Optional[int]:
+    match = _EXPLICIT_BUDGET_RE.search(message)
+    if not match:
+        return None
+    amount = int(re.sub(r"[ .,]", "", match.group(1)))
+    if match.group(2).lower() == "k":
+        amount *= 1000
+    return amount if amount > 100 else None
+
+
+def is_year_like(amount: Optional[float]) -> bool:
+    """Whether a bare figure is more likely a model year than an amount"""
+    return amount is not None and float(amount).is_integer() and YEAR_RANGE[0] <= amount <= YEAR_RANGE[1]
+
+
+def _extract_amount(message: str) -> Optional[float]:
+    match = _AMOUNT_K_RE.search(message)
+    if match:
+        return float(match.group(1)) * 1000
+
+    match = _AMOUNT_FULL_RE.search(message)
+    if match and float(match.group(1)) > 1000:  # Likely a full price
+        return float(match.group(1))
+
+    match = _AMOUNT_GROUPED_RE.search(message)
+    if match:
+        # Format: "124 000", "124,000", "124.000"
+        return float(match.group(1) + match.group(2))
+
+    # Fallback to the message without separators
+    match = _AMOUNT_DIGITS_RE.search(message.replace(',', '').replace(' ', ''))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+@lru_cache(maxsize=4096)
+def message_signals(message: str) -> MessageSignals:
+    """Signals of `message` (memoized: repeated and historical messages are free)"""
+    lowered = message.lower()
+    return MessageSignals(
+        needs=frozenset(match.lastgroup for match in _NEEDS_RE.finditer(message)),
+        stated_budget=_extract_budget(message),
+        explicit_budget=_extract_explicit_budget(message),
+        wants_cash=_CASH_RE.search(lowered) is not None,
+        counter_offer_amount=_extract_amount(message),
+        asks_price=_PRICE_QUESTION_RE.search(lowered) is not None,
+        language=_language_detector.detect(message),
+    )
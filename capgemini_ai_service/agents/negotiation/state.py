@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING, Dict, Any
 from schemas.types import NegotiationIntent, ConversationPhase
+from .signals import message_signals
 
 if TYPE_CHECKING:
     from core.session_store import NegotiationSession
@@ -97,7 +98,6 @@ class StateManager:
         Fast and direct UX.
         """
         current_phase = session.conversation_phase
-        msg_lower = message.lower()
         
         # === FAST TRANSITIONS ===
         
@@ -110,8 +110,7 @@ class StateManager:
             return "negotiation"
         
         # Asking for price → Negotiation (give them the price!)
-        price_keywords = ["prix", "combien", "mensualité", "price", "cost", "chhal", "bchhal"]
-        if any(w in msg_lower for w in price_keywords):
+        if message_signals(message).asks_price:
             return "negotiation"
         
         # === PHASE-SPECIFIC LOGIC ===
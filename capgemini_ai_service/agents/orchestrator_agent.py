@@ -1,6 +1,7 @@
-from typing import Dict, Any, List, Optional
+import inspect
+from typing import Callable, Dict, Any, List, Optional
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 
 from schemas.types import NegotiationState, AgentStep
 from agents.profiling.agent import profiling_agent
@@ -9,6 +10,7 @@ from agents.inventory_agent import inventory_agent
 from agents.deal_agent import deal_agent
 from core.metrics import WinWinCalculator
 from core.session_store import get_session_store, NegotiationSession
+from src.infrastructure.monitoring import AGENT_NODE_DURATION, track_duration
 
 import datetime
 
@@ -21,28 +23,28 @@ class OrchestratorAgent:
         """Define the LangGraph workflow with feedback loops"""
         workflow = StateGraph(NegotiationState)
         
-        # Define Nodes
-        workflow.add_node("profile_customer", self._profiling_node)
-        workflow.add_node("valuate_vehicle", self._valuation_node)
-        workflow.add_node("match_inventory", self._inventory_node)
-        workflow.add_node("structure_deal", self._deal_node)
-        workflow.add_node("initialize_session", self._init_session_node)
+        # Define Nodes (each one timed into agent_node_duration_seconds)
+        nodes = {
+            "dispatch_analysis": self._dispatch_node,
+            "profile_customer": self._profiling_node,
+            "valuate_vehicle": self._valuation_node,
+            "match_inventory": self._inventory_node,
+            "structure_deal": self._deal_node,
+            "initialize_session": self._init_session_node,
+        }
+        for name, node in nodes.items():
+            workflow.add_node(name, self._timed_node(name, node))
         
         # Define Edges
-        workflow.set_entry_point("profile_customer")
+        workflow.add_edge(START, "dispatch_analysis")
         
-        # Logic: Always profile -> Then check if trade-in needed
-        workflow.add_conditional_edges(
-            "profile_customer",
-            self._check_trade_in,
-            {
-                "has_trade_in": "valuate_vehicle",
-                "no_trade_in": "match_inventory"
-            }
-        )
+        # Profiling and valuation are independent: run them as parallel branches
+        # (valuation is a no-op without a trade-in)
+        workflow.add_edge("dispatch_analysis", "profile_customer")
+        workflow.add_edge("dispatch_analysis", "valuate_vehicle")
         
-        # If valuated, go to matching
-        workflow.add_edge("valuate_vehicle", "match_inventory")
+        # Join: matching waits for both branches
+        workflow.add_edge(["profile_customer", "valuate_vehicle"], "match_inventory")
         
         # After matching, structure the deal
         workflow.add_edge("match_inventory", "structure_deal")
@@ -54,7 +56,7 @@ class OrchestratorAgent:
             {
                 "satisfied": "initialize_session",
                 "wants_different": "match_inventory",  # Loop back!
-                "needs_more_info": "profile_customer"  # Re-profile if needed
+                "needs_more_info": "dispatch_analysis"  # Re-profile if needed
             }
         )
         
@@ -62,8 +64,25 @@ class OrchestratorAgent:
         
         return workflow
 
+    @staticmethod
+    def _timed_node(name: str, node: Callable) -> Callable:
+        """Wrap a (sync or async) node so its latency is exported per node"""
+        if inspect.iscoroutinefunction(node):
+            async def timed(state: NegotiationState) -> Dict[str, Any]:
+                with track_duration(AGENT_NODE_DURATION, agent="Orchestrator", node=name):
+                    return await node(state)
+        else:
+            def timed(state: NegotiationState) -> Dict[str, Any]:
+                with track_duration(AGENT_NODE_DURATION, agent="Orchestrator", node=name):
+                    return node(state)
+        return timed
+
     # --- Node Functions ---
     
+    def _dispatch_node(self, state: NegotiationState) -> Dict[str, Any]:
+        """Fan-out point for the parallel profiling/valuation branches"""
+        return {}
+    
     async def _profiling_node(self, state: NegotiationState) -> Dict[str, Any]:
         """Analyze customer profile"""
         print("--- Node: Profiling ---")
@@ -81,13 +100,10 @@ class OrchestratorAgent:
             timestamp=datetime.datetime.now()
         )
         
-        # Accumulate steps properly
-        existing_steps = list(state.get("agent_steps", []))
-        existing_steps.append(step)
-        
+        # Steps are accumulated by the state reducer
         return {
             "customer_profile": profile,
-            "agent_steps": existing_steps
+            "agent_steps": [step]
         }
 
     async def _valuation_node(self, state: NegotiationState) -> Dict[str, Any]:
@@ -96,6 +112,9 @@ class OrchestratorAgent:
         if not trade_in_id:
             print("--- Node: Valuation Skipped (No ID) ---")
             return {}
+        if state.get("valuation_result"):
+            print("--- Node: Valuation Skipped (Already Done) ---")
+            return {}
 
         print(f"--- Node: Valuating Trade-In {trade_in_id} ---")
         
@@ -115,14 +134,10 @@ class OrchestratorAgent:
         # CALL REAL AGENT
         result = await valuation_agent.valuate(req)
         
-        # Accumulate steps properly
-        existing_steps = list(state.get("agent_steps", []))
-        existing_steps.extend(result.agent_steps)
-        
         # Convert pydantic model to dict for state
         return {
             "valuation_result": result.model_dump(),
-            "agent_steps": existing_steps
+            "agent_steps": list(result.agent_steps)
         }
 
     async def _inventory_node(self, state: NegotiationState) -> Dict[str, Any]:
@@ -142,13 +157,9 @@ class OrchestratorAgent:
             timestamp=datetime.datetime.now()
         )
         
-        # Accumulate steps properly
-        existing_steps = list(state.get("agent_steps", []))
-        existing_steps.append(step)
-        
         return {
             "vehicle_matches": matches.get('matches', []),
-            "agent_steps": existing_steps
+            "agent_steps": [step]
         }
         
     async def _deal_node(self, state: NegotiationState) -> Dict[str, Any]:
@@ -180,13 +191,9 @@ class OrchestratorAgent:
             timestamp=datetime.datetime.now()
         )
         
-        # Accumulate steps properly
-        existing_steps = list(state.get("agent_steps", []))
-        existing_steps.append(step)
-        
         return {
             "deal_options": deal.get('options', []),
-            "agent_steps": existing_steps
+            "agent_steps": [step]
         }
     
     def _init_session_node(self, state: NegotiationState) -> Dict[str, Any]:
@@ -256,11 +263,6 @@ class OrchestratorAgent:
 
     # --- Edge Conditions ---
     
-    def _check_trade_in(self, state: NegotiationState) -> str:
-        if state.get("trade_in_id"):
-            return "has_trade_in"
-        return "no_trade_in"
-
     def _check_deal_satisfaction(self, state: NegotiationState) -> str:
         """
         Check if user is satisfied with the deal or wants to loop back.
@@ -1,10 +1,12 @@
 from typing import Dict, Any, List
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.exceptions import OutputParserException
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 from agents import get_llm
 from core.logger import logger
-from .prompts import PROFILING_SYSTEM_PROMPTS
+from src.infrastructure.llm.prompt_registry import register_prompt
+from src.infrastructure.monitoring import FALLBACKS, JSON_PARSE_FAILURES, llm_config
+from .prompts import PROFILING_PROMPT, PROFILING_SYSTEM_PROMPTS
 
 class CustomerProfileResult(BaseModel):
     """Structured output for customer profiling"""
@@ -18,6 +20,13 @@ class CustomerProfilingAgent:
     def __init__(self):
         self.llm = get_llm()
         self.parser = JsonOutputParser(pydantic_object=CustomerProfileResult)
+        # One prompt per language: localized system instruction and format instructions bound once
+        self.prompts = {
+            language: register_prompt(
+                f"profiling.{language}", PROFILING_PROMPT, parser=self.parser, system_instruction=instruction
+            )
+            for language, instruction in PROFILING_SYSTEM_PROMPTS.items()
+        }
         
     async def analyze_profile(self, 
                        conversation_history: List[Dict[str, str]], 
@@ -46,32 +55,18 @@ class CustomerProfilingAgent:
             else:
                  return self._get_fallback_profile()
             
-        # Get localized system prompt
-        system_instruction = PROFILING_SYSTEM_PROMPTS.get(language, PROFILING_SYSTEM_PROMPTS["fr"])
+        # Get localized prompt
+        prompt = self.prompts.get(language, self.prompts["fr"])
             
-        prompt = ChatPromptTemplate.from_template("""
-        {system_instruction}
-        
-        MESSAGES CLIENT (Récents):
-        {customer_text}
-        
-        PRÉFÉRENCES DÉCLARÉES:
-        {preferences}
-        
-        {format_instructions}
-        """)
-        
         chain = prompt | self.llm | self.parser
         
         try:
             log.info("profiling_start", input_length=len(customer_text))
             
             result = await chain.ainvoke({
-                "system_instruction": system_instruction,
                 "customer_text": customer_text,
-                "preferences": str(stated_preferences or {}),
-                "format_instructions": self.parser.get_format_instructions()
-            })
+                "preferences": str(stated_preferences or {})
+            }, config=llm_config("profiling"))
             
             # Add metadata
             result["confidence_score"] = 0.85 # Placeholder, could be calculated
@@ -81,6 +76,9 @@ class CustomerProfilingAgent:
             
         except Exception as e:
             log.error("profiling_error", error=str(e))
+            if isinstance(e, OutputParserException):
+                JSON_PARSE_FAILURES.labels(component="profiling").inc()
+            FALLBACKS.labels(component="profiling").inc()
             return self._get_fallback_profile()
             
     def _get_fallback_profile(self) -> Dict[str, Any]:
@@ -40,3 +40,16 @@ PROFILING_SYSTEM_PROMPTS = {
     أجب فقط بتنسيق JSON.
     """
 }
+
+# Profiling request; {system_instruction} and {format_instructions} are bound once per language
+PROFILING_PROMPT = """
+        {system_instruction}
+        
+        MESSAGES CLIENT (Récents):
+        {customer_text}
+        
+        PRÉFÉRENCES DÉCLARÉES:
+        {preferences}
+        
+        {format_instructions}
+        """
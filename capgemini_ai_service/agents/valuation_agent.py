@@ -2,20 +2,33 @@
 Valuation Agent with Explainable AI
 Provides transparent trade-in vehicle valuations with detailed reasoning
 """
+import asyncio
 from datetime import datetime
-from typing import Dict, Any, List
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
+from typing import Dict, Any, AsyncIterator, List, Tuple
+
+import numpy as np
+
 from config.settings import settings
 from schemas.models import (
     ValuationRequestModel,
     ValuationResponseModel,
     ValuationBreakdownModel,
+    ValuationBatchAnalysisModel,
+    ValuationBatchErrorModel,
+    ValuationBatchItemModel,
+    ValuationBatchSummaryModel,
     AdjustmentDetail,
-    AgentStepModel
+    AgentStepModel,
+    VehicleData
 )
 from core.services.market_pricing import MarketPricingService, MockPricingService
 from core.repositories import get_inventory_repository
+from core.context import AgentContext, agent_context, get_agent_context
+from core.logger import logger
+from core.llm_cache import get_llm_cache
+from src.infrastructure.llm.client_registry import get_chat_model
+from src.infrastructure.llm.prompt_registry import register_prompt
+from src.infrastructure.monitoring import llm_config
 
 CONDITION_MULTIPLIERS = {
     "Excellent": 1.08,
@@ -25,21 +38,117 @@ CONDITION_MULTIPLIERS = {
     "Mauvais": 0.85
 }
 
+# Market year of the pricing data, and the average yearly mileage in Morocco
+REFERENCE_YEAR = 2026
+AVG_YEARLY_MILEAGE = 20000
+
+# Mileage vs. the average for the age: (upper bound of the % difference, price rate, reason)
+MILEAGE_BANDS = [
+    (-20, 0.05, "Kilométrage très bas ({pct}% sous la moyenne)"),
+    (-10, 0.03, "Kilométrage inférieur à la moyenne ({pct}%)"),
+    (10, 0.0, "Kilométrage moyen pour l'année"),
+    (20, -0.03, "Kilométrage supérieur à la moyenne (+{pct}%)"),
+    (float("inf"), -0.05, "Kilométrage très élevé (+{pct}%)"),
+]
+
+SERVICE_HISTORY_BONUS = 0.03
+NO_ACCIDENT_BONUS = 0.02
+
+# Batch valuation: concurrent market price lookups, vehicles per vectorized chunk,
+# concurrent commentary prompts and the mileage granularity of those prompts
+PRICING_CONCURRENCY = 16
+BATCH_CHUNK_SIZE = 500
+ANALYSIS_CONCURRENCY = 4
+ANALYSIS_MILEAGE_STEP = 10000
+# LLM commentaries per batch request (largest vehicle groups first)
+DEFAULT_BATCH_ANALYSES = 20
+
+VALUATION_ANALYSIS_PROMPT = """Tu es un expert en évaluation de véhicules d'occasion au Maroc.
+            
+            Véhicule: {make} {model} {year}
+            Kilométrage: {mileage} km
+            État: {condition}
+            
+            Prix de base estimé: {base_price} MAD
+            
+            Fournis une analyse courte (2-3 phrases) sur:
+            1. La demande actuelle.
+            2. Facteurs affectant la valeur.
+            
+            Réponds en français, sois concis et professionnel."""
+
+
+def build_adjustments(
+    vehicle: VehicleData,
+    base_price: float,
+    condition_adjustment: float,
+    mileage_adjustment: float,
+    mileage_reasoning: str
+) -> List[AdjustmentDetail]:
+    """Explainable adjustment list of one vehicle (shared by the single and batch valuations)"""
+    adjustments: List[AdjustmentDetail] = []
+
+    if condition_adjustment != 0:
+        condition_multiplier = CONDITION_MULTIPLIERS.get(vehicle.condition, 1.0)
+        adjustments.append(AdjustmentDetail(
+            factor=f"État: {vehicle.condition}",
+            amount=condition_adjustment,
+            percentage=(condition_multiplier - 1) * 100,
+            reasoning=f"État du véhicule {vehicle.condition.lower()} applique un coefficient de {condition_multiplier}"
+        ))
+
+    if mileage_adjustment != 0:
+        adjustments.append(AdjustmentDetail(
+            factor="Kilométrage",
+            amount=mileage_adjustment,
+            percentage=(mileage_adjustment / base_price) * 100,
+            reasoning=mileage_reasoning
+        ))
+
+    if vehicle.service_history:
+        adjustments.append(AdjustmentDetail(
+            factor="Historique d'entretien complet",
+            amount=base_price * SERVICE_HISTORY_BONUS,
+            percentage=SERVICE_HISTORY_BONUS * 100,
+            reasoning="Entretien régulier et documenté augmente la valeur et la fiabilité"
+        ))
+
+    if not vehicle.accidents:
+        adjustments.append(AdjustmentDetail(
+            factor="Aucun accident déclaré",
+            amount=base_price * NO_ACCIDENT_BONUS,
+            percentage=NO_ACCIDENT_BONUS * 100,
+            reasoning="Véhicule sans historique d'accident augmente la confiance et la valeur"
+        ))
+
+    return adjustments
+
+
+def finalize_value(total: float, adjustment_count: int) -> Tuple[float, float, float, float]:
+    """Final value (nearest 100 MAD), its range and the overall confidence"""
+    final_value = round(total, -2)
+    min_value = round(final_value * 0.94, -2)
+    max_value = round(final_value * 1.06, -2)
+    confidence = 0.87 if adjustment_count >= 2 else 0.75
+    return final_value, min_value, max_value, confidence
+
+
+def mileage_reason(band: int, diff_percentage: float) -> str:
+    """Explanation of MILEAGE_BANDS[band] for a mileage `diff_percentage`% off the average"""
+    return MILEAGE_BANDS[band][2].format(pct=int(abs(diff_percentage)))
+
+
 class ValuationAgent:
     """Agent specializing in vehicle trade-in valuation with explainable AI"""
     
     def __init__(self, pricing_service: MarketPricingService = None):
-        self.llm = ChatGroq(
-            groq_api_key=settings.groq_api_key,
-            model_name=settings.default_model,
-            temperature=0.3,
-            max_tokens=1500
-        )
-        self.agent_steps: List[AgentStepModel] = []
+        self.llm = get_chat_model(temperature=0.3, max_tokens=1500)
         
         # Dependency Injection
         self.pricing_service = pricing_service or MockPricingService()
         self.repo = get_inventory_repository()
+        self.cache = get_llm_cache()
+        self.analysis_prompt = register_prompt("valuation_analysis", VALUATION_ANALYSIS_PROMPT)
     
     def _log_step(self, action: str, reasoning: str, data: Dict[str, Any], confidence: float):
         """Log agent step for explainability"""
@@ -51,8 +160,12 @@ class ValuationAgent:
             confidence=confidence,
             timestamp=datetime.now()
         )
-        self.agent_steps.append(step)
-        return step
+        return get_agent_context().add_step(step)
+    
+    @property
+    def agent_steps(self) -> List[AgentStepModel]:
+        """Steps of the request running in the current context"""
+        return get_agent_context().steps
     
     async def _get_market_base_price(self, make: str, model: str, year: int) -> float:
         """
@@ -70,73 +183,197 @@ class ValuationAgent:
     
     def _calculate_mileage_adjustment(self, actual_mileage: int, base_price: float, year: int) -> tuple[float, str]:
         """Calculate adjustment based on mileage"""
-        # Estimated average yearly mileage in Morocco ~20k km
-        current_year = 2026
-        age = max(1, current_year - year)
-        avg_mileage = age * 20000
+        age = max(1, REFERENCE_YEAR - year)
+        avg_mileage = age * AVG_YEARLY_MILEAGE
         
         diff_percentage = ((actual_mileage - avg_mileage) / avg_mileage) * 100
         
-        if diff_percentage < -20:
-            adjustment = base_price * 0.05
-            reason = f"Kilométrage très bas ({int(abs(diff_percentage))}% sous la moyenne)"
-        elif diff_percentage < -10:
-            adjustment = base_price * 0.03
-            reason = f"Kilométrage inférieur à la moyenne ({int(abs(diff_percentage))}%)"
-        elif diff_percentage < 10:
-            adjustment = 0
-            reason = "Kilométrage moyen pour l'année"
-        elif diff_percentage < 20:
-            adjustment = base_price * -0.03
-            reason = f"Kilométrage supérieur à la moyenne (+{int(diff_percentage)}%)"
-        else:
-            adjustment = base_price * -0.05
-            reason = f"Kilométrage très élevé (+{int(diff_percentage)}%)"
-        
-        return adjustment, reason
+        band = next(i for i, (upper, _, _) in enumerate(MILEAGE_BANDS) if diff_percentage < upper)
+        return base_price * MILEAGE_BANDS[band][1], mileage_reason(band, diff_percentage)
     
-    async def _generate_llm_analysis(self, vehicle_data: Dict[str, Any], base_price: float) -> str:
-        """Use LLM to generate additional qualitative insights"""
-        prompt = ChatPromptTemplate.from_template(
-            """Tu es un expert en évaluation de véhicules d'occasion au Maroc.
-            
-            Véhicule: {make} {model} {year}
-            Kilométrage: {mileage} km
-            État: {condition}
-            
-            Prix de base estimé: {base_price} MAD
-            
-            Fournis une analyse courte (2-3 phrases) sur:
-            1. La demande actuelle.
-            2. Facteurs affectant la valeur.
-            
-            Réponds en français, sois concis et professionnel."""
-        )
-        
-        chain = prompt | self.llm
-        response = await chain.ainvoke({
+    async def _generate_llm_analysis(
+        self,
+        vehicle_data: Dict[str, Any],
+        base_price: float,
+        bypass_cache: bool = False,
+        prompt_type: str = "valuation_analysis"
+    ) -> str:
+        """Use LLM to generate additional qualitative insights (cached per vehicle profile)"""
+        inputs = {
             "make": vehicle_data["make"],
             "model": vehicle_data["model"],
             "year": vehicle_data["year"],
             "mileage": vehicle_data["mileage"],
             "condition": vehicle_data["condition"],
             "base_price": base_price
-        })
-        return response.content
+        }
+        
+        async def generate() -> str:
+            chain = self.analysis_prompt | self.llm
+            response = await chain.ainvoke(inputs, config=llm_config(prompt_type))
+            return response.content
+        
+        return await self.cache.get_or_compute(
+            "valuation_analysis", inputs, generate,
+            ttl=settings.llm_cache_ttl_valuation,
+            bypass=bypass_cache
+        )
     
     async def valuate(self, request: ValuationRequestModel) -> ValuationResponseModel:
         """
         Perform trade-in valuation with full explainability
+        (runs in its own request-scoped context)
         """
-        self.agent_steps = []  # Reset steps
-        
+        with agent_context(agent="Valuation Agent", trade_in_id=request.trade_in_id) as ctx:
+            response = await self._valuate(request, ctx)
+            ctx.logger.debug("valuation_timings", **ctx.timings)
+            return response
+    
+    async def valuate_batch(
+        self,
+        requests: List[ValuationRequestModel],
+        include_analysis: bool = False,
+        max_analyses: int = DEFAULT_BATCH_ANALYSES
+    ) -> AsyncIterator[Any]:
+        """
+        Batch variant of `valuate` for trade-in re-pricing campaigns.
+
+        Yields, in request order, one ValuationBatchItemModel per vehicle (or a
+        ValuationBatchErrorModel when its market price is unavailable); then,
+        with `include_analysis`, one ValuationBatchAnalysisModel per distinct
+        commentary prompt as they complete; then a ValuationBatchSummaryModel.
+
+        Market prices are looked up once per distinct (make, model, year) and
+        the adjustments computed as arrays, BATCH_CHUNK_SIZE vehicles at a
+        time so the first lines go out before the whole batch is priced.
+        Commentary prompts use the mileage rounded to ANALYSIS_MILEAGE_STEP,
+        so similar vehicles share one call, at low scheduler priority. At most
+        `max_analyses` calls are made (the groups with the most vehicles); the
+        summary counts the groups left without commentary.
+        """
+        from agents.valuation_batch import compute_adjustments
+
+        ctx = AgentContext(
+            logger=logger.bind(agent="Valuation Agent", batch_size=len(requests)),
+            agent="Valuation Agent"
+        )
+        prices: Dict[Tuple[str, str, int], float] = {}
+        price_errors: Dict[Tuple[str, str, int], str] = {}
+        pricing_slots = asyncio.Semaphore(PRICING_CONCURRENCY)
+
+        async def lookup(key: Tuple[str, str, int]) -> None:
+            async with pricing_slots:
+                try:
+                    prices[key] = await self._get_market_base_price(*key)
+                except Exception as e:
+                    ctx.logger.warning("valuation_batch_price_failed", vehicle=" ".join(map(str, key)), error=str(e))
+                    price_errors[key] = str(e)
+
+        # Commentary prompt (make, model, year, mileage, condition, base price) -> trade-in ids
+        analysis_groups: Dict[Tuple[Any, ...], List[str]] = {}
+        valuated = failed = 0
+
+        for start in range(0, len(requests), BATCH_CHUNK_SIZE):
+            chunk = requests[start:start + BATCH_CHUNK_SIZE]
+            keys = [(r.vehicle.make, r.vehicle.model, r.vehicle.year) for r in chunk]
+
+            with ctx.timed("batch_market_price"):
+                missing = {key for key in keys if key not in prices and key not in price_errors}
+                await asyncio.gather(*(lookup(key) for key in missing))
+
+            with ctx.timed("batch_adjustments"):
+                priced = [i for i, key in enumerate(keys) if key in prices]
+                base_prices = np.array([prices[keys[i]] for i in priced], dtype=float)
+                batch = compute_adjustments([chunk[i].vehicle for i in priced], base_prices)
+                items: Dict[int, ValuationBatchItemModel] = {}
+                for j, i in enumerate(priced):
+                    vehicle = chunk[i].vehicle
+                    base_price = float(base_prices[j])
+                    adjustments = build_adjustments(
+                        vehicle,
+                        base_price,
+                        float(batch.condition[j]),
+                        float(batch.mileage[j]),
+                        mileage_reason(int(batch.mileage_band[j]), float(batch.mileage_diff_percentage[j]))
+                    )
+                    final_value, min_value, max_value, confidence = finalize_value(
+                        float(batch.total[j]), int(batch.adjustment_count[j])
+                    )
+                    items[i] = ValuationBatchItemModel(
+                        trade_in_id=chunk[i].trade_in_id,
+                        estimated_value=final_value,
+                        value_range={"min": min_value, "max": max_value},
+                        breakdown=ValuationBreakdownModel(
+                            base_price=base_price,
+                            adjustments=adjustments,
+                            market_comparables=0,
+                            confidence=confidence,
+                            final_value=final_value
+                        ),
+                        confidence=confidence
+                    )
+                    if include_analysis:
+                        mileage_step = round(vehicle.mileage / ANALYSIS_MILEAGE_STEP) * ANALYSIS_MILEAGE_STEP
+                        profile = (vehicle.make, vehicle.model, vehicle.year, mileage_step, vehicle.condition, base_price)
+                        analysis_groups.setdefault(profile, []).append(chunk[i].trade_in_id)
+
+            for i, request in enumerate(chunk):
+                if i in items:
+                    valuated += 1
+                    yield items[i]
+                else:
+                    failed += 1
+                    yield ValuationBatchErrorModel(trade_in_id=request.trade_in_id, error=price_errors[keys[i]])
+
+        analysis_slots = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+
+        async def analyze(profile: Tuple[Any, ...], trade_in_ids: List[str]) -> ValuationBatchAnalysisModel:
+            make, model, year, mileage, condition, base_price = profile
+            vehicle_data = {"make": make, "model": model, "year": year, "mileage": mileage, "condition": condition}
+            async with analysis_slots:
+                try:
+                    analysis = await self._generate_llm_analysis(
+                        vehicle_data, base_price, prompt_type="valuation_batch_analysis"
+                    )
+                    return ValuationBatchAnalysisModel(trade_in_ids=trade_in_ids, analysis=analysis)
+                except Exception as e:
+                    ctx.logger.warning("valuation_batch_analysis_failed", error=str(e))
+                    return ValuationBatchAnalysisModel(trade_in_ids=trade_in_ids, error=str(e))
+
+        # Largest groups first; the rest would hold the stream (and the LLM budget) for too long
+        groups = sorted(analysis_groups.items(), key=lambda group: len(group[1]), reverse=True)
+        skipped = max(0, len(groups) - max_analyses)
+        if skipped:
+            ctx.logger.info("valuation_batch_analyses_capped", groups=len(groups), max_analyses=max_analyses)
+        tasks = [asyncio.create_task(analyze(profile, ids)) for profile, ids in groups[:max_analyses]]
+        try:
+            with ctx.timed("batch_llm_analysis"):
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        ctx.logger.info("valuation_batch_complete", valuated=valuated, failed=failed, **ctx.timings)
+        yield ValuationBatchSummaryModel(
+            vehicles=len(requests),
+            valuated=valuated,
+            failed=failed,
+            price_lookups=len(prices) + len(price_errors),
+            analyses=len(tasks),
+            analyses_skipped=skipped
+        )
+
+    async def _valuate(self, request: ValuationRequestModel, ctx) -> ValuationResponseModel:
+        """Valuation pipeline; steps and timings are recorded on `ctx`"""
         vehicle = request.vehicle
         vehicle_dict = vehicle.model_dump()
         
         # Step 1: Get market base price (Async)
-        base_price = await self._get_market_base_price(
-            vehicle.make, vehicle.model, vehicle.year
-        )
+        with ctx.timed("market_price"):
+            base_price = await self._get_market_base_price(
+                vehicle.make, vehicle.model, vehicle.year
+            )
         
         self._log_step(
             action="Recherche prix marché",
@@ -147,56 +384,17 @@ class ValuationAgent:
             confidence=0.85
         )
         
-        # Step 2: Calculate adjustments
-        adjustments: List[AdjustmentDetail] = []
-        running_total = base_price
-        
-        # Condition adjustment
+        # Step 2: Calculate adjustments (condition, mileage, service history, no accidents)
         condition_multiplier = CONDITION_MULTIPLIERS.get(vehicle.condition, 1.0)
-        condition_adjustment = base_price * (condition_multiplier - 1)
-        if condition_adjustment != 0:
-            adjustments.append(AdjustmentDetail(
-                factor=f"État: {vehicle.condition}",
-                amount=condition_adjustment,
-                percentage=(condition_multiplier - 1) * 100,
-                reasoning=f"État du véhicule {vehicle.condition.lower()} applique un coefficient de {condition_multiplier}"
-            ))
-            running_total += condition_adjustment
-        
-        # Mileage adjustment
-        mileage_adj, mileage_reason = self._calculate_mileage_adjustment(
+        mileage_adj, mileage_reasoning = self._calculate_mileage_adjustment(
             vehicle.mileage, base_price, vehicle.year
         )
-        if mileage_adj != 0:
-            adjustments.append(AdjustmentDetail(
-                factor="Kilométrage",
-                amount=mileage_adj,
-                percentage=(mileage_adj / base_price) * 100,
-                reasoning=mileage_reason
-            ))
-            running_total += mileage_adj
-        
-        # Service history bonus
-        if vehicle.service_history:
-            service_bonus = base_price * 0.03
-            adjustments.append(AdjustmentDetail(
-                factor="Historique d'entretien complet",
-                amount=service_bonus,
-                percentage=3.0,
-                reasoning="Entretien régulier et documenté augmente la valeur et la fiabilité"
-            ))
-            running_total += service_bonus
-        
-        # No accidents bonus
-        if not vehicle.accidents:
-            no_accident_bonus = base_price * 0.02
-            adjustments.append(AdjustmentDetail(
-                factor="Aucun accident déclaré",
-                amount=no_accident_bonus,
-                percentage=2.0 ,
-                reasoning="Véhicule sans historique d'accident augmente la confiance et la valeur"
-            ))
-            running_total += no_accident_bonus
+        adjustments = build_adjustments(
+            vehicle, base_price, base_price * (condition_multiplier - 1), mileage_adj, mileage_reasoning
+        )
+        running_total = base_price
+        for adjustment in adjustments:
+            running_total += adjustment.amount
         
         self._log_step(
             action="Calcul des ajustements",
@@ -206,7 +404,8 @@ class ValuationAgent:
         )
         
         # Step 3: Get LLM insights (Async)
-        llm_analysis = await self._generate_llm_analysis(vehicle_dict, base_price)
+        with ctx.timed("llm_analysis"):
+            llm_analysis = await self._generate_llm_analysis(vehicle_dict, base_price)
         
         self._log_step(
             action="Analyse qualitative IA",
@@ -216,11 +415,7 @@ class ValuationAgent:
         )
         
         # Step 4: Calculate final value and range
-        final_value = round(running_total, -2)  # Round to nearest 100
-        min_value = round(final_value * 0.94, -2)
-        max_value = round(final_value * 1.06, -2)
-        
-        overall_confidence = 0.87 if len(adjustments) >= 2 else 0.75
+        final_value, min_value, max_value, overall_confidence = finalize_value(running_total, len(adjustments))
         
         self._log_step(
             action="Finalisation de l'évaluation",
@@ -256,7 +451,7 @@ Valeur finale: {final_value:,.0f} MAD
             },
             confidence=overall_confidence,
             explanation=explanation,
-            agent_steps=self.agent_steps
+            agent_steps=ctx.steps
         )
 
 # Singleton instance
@@ -0,0 +1,78 @@
+"""
+Vectorized Valuation Adjustments
+The deterministic part of ValuationAgent (condition, mileage, service
+history, accidents) computed with NumPy arrays over a whole batch of
+vehicles, for dealer-side re-pricing campaigns.
+
+The arithmetic mirrors the scalar pipeline operation for operation, so a
+vehicle gets the same value in a batch as through /ai/valuation for the same
+market base price.
+"""
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from schemas.models import VehicleData
+from agents.valuation_agent import (
+    AVG_YEARLY_MILEAGE,
+    CONDITION_MULTIPLIERS,
+    MILEAGE_BANDS,
+    NO_ACCIDENT_BONUS,
+    REFERENCE_YEAR,
+    SERVICE_HISTORY_BONUS,
+)
+
+# Upper bounds and price rates of the mileage bands, for np.searchsorted
+_MILEAGE_UPPER = np.array([upper for upper, _, _ in MILEAGE_BANDS[:-1]], dtype=float)
+_MILEAGE_RATES = np.array([rate for _, rate, _ in MILEAGE_BANDS], dtype=float)
+
+
+@dataclass
+class BatchAdjustments:
+    """Per-vehicle adjustment arrays (index i = vehicles[i])"""
+    condition_multiplier: np.ndarray
+    condition: np.ndarray
+    mileage_band: np.ndarray
+    mileage_diff_percentage: np.ndarray
+    mileage: np.ndarray
+    service: np.ndarray
+    no_accident: np.ndarray
+    total: np.ndarray
+    adjustment_count: np.ndarray
+
+
+def compute_adjustments(vehicles: List[VehicleData], base_prices: np.ndarray) -> BatchAdjustments:
+    """Adjustments and adjusted totals of `vehicles` priced at `base_prices`"""
+    year = np.array([v.year for v in vehicles], dtype=float)
+    mileage = np.array([v.mileage for v in vehicles], dtype=float)
+    has_service = np.array([v.service_history for v in vehicles], dtype=bool)
+    no_accident = ~np.array([v.accidents for v in vehicles], dtype=bool)
+    multiplier = np.array([CONDITION_MULTIPLIERS.get(v.condition, 1.0) for v in vehicles], dtype=float)
+
+    condition = base_prices * (multiplier - 1)
+
+    avg_mileage = np.maximum(1, REFERENCE_YEAR - year) * AVG_YEARLY_MILEAGE
+    diff_percentage = ((mileage - avg_mileage) / avg_mileage) * 100
+    # First band whose upper bound is above the difference
+    band = np.searchsorted(_MILEAGE_UPPER, diff_percentage, side="right")
+    mileage_adjustment = base_prices * _MILEAGE_RATES[band]
+
+    service = np.where(has_service, base_prices * SERVICE_HISTORY_BONUS, 0.0)
+    accident = np.where(no_accident, base_prices * NO_ACCIDENT_BONUS, 0.0)
+
+    # Same summation order as the scalar pipeline
+    total = base_prices + condition + mileage_adjustment + service + accident
+    count = (condition != 0).astype(int) + (mileage_adjustment != 0) + has_service + no_accident
+
+    return BatchAdjustments(
+        condition_multiplier=multiplier,
+        condition=condition,
+        mileage_band=band,
+        mileage_diff_percentage=diff_percentage,
+        mileage=mileage_adjustment,
+        service=service,
+        no_accident=accident,
+        total=total,
+        adjustment_count=count,
+    )
@@ -0,0 +1,7 @@
+"""
+Offline Benchmarks
+Latency / throughput / allocation measurements of the negotiation hot path,
+driven by a deterministic fake LLM so results do not depend on Groq.
+
+Run with: python -m benchmarks.run  (see `make bench`)
+"""
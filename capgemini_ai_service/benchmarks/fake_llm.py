@@ -0,0 +1,118 @@
+"""
+Scripted Fake LLM
+A ChatGroq stand-in returning canned answers after a configurable latency.
+
+Every agent builds `prompt | self.llm`, so swapping the `llm` attribute of the
+agent singletons is enough to take Groq out of the loop. Answers are chosen by
+the first script rule whose marker appears in the rendered prompt.
+"""
+import asyncio
+import json
+import time
+from typing import Any, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# (prompt marker, canned answer) - most specific markers first
+DEFAULT_SCRIPT: List[Tuple[str, str]] = [
+    ("ANALYSE COMPLÈTE DU TOUR", json.dumps({
+        "primary_emotion": "budget_stressed",
+        "sentiment_score": 0.4,
+        "intensity": 6,
+        "recommended_tone": "rassurant",
+        "detected_language": "fr",
+        "intent": "PRICE_OBJECTION",
+        "confidence": 85,
+        "reasoning": "Le client trouve le prix élevé"
+    })),
+    ("INTENTIONS POSSIBLES", json.dumps({
+        "intent": "PRICE_OBJECTION",
+        "confidence": 85,
+        "reasoning": "Le client trouve le prix élevé"
+    })),
+    ("language_reasoning", json.dumps({
+        "primary_emotion": "budget_stressed",
+        "sentiment_score": 0.4,
+        "intensity": 6,
+        "recommended_tone": "rassurant",
+        "language_reasoning": "Français standard",
+        "detected_language": "fr"
+    })),
+    ("communication_style", json.dumps({
+        "segment": "Family Oriented",
+        "price_sensitivity": "High",
+        "priorities": ["Space", "Safety", "Price"],
+        "communication_style": "Direct",
+        "recommended_strategy": "Mettre en avant le rapport qualité/prix"
+    })),
+    ("expert en recommandation automobile", json.dumps({
+        "matches": [{
+            "vehicle_id": "bench-1",
+            "make": "Dacia",
+            "model": "Jogger",
+            "year": 2024,
+            "price": 250000,
+            "match_score": 88,
+            "reasoning": "7 places, budget respecté",
+            "selling_points": ["7 places", "Prix compétitif"]
+        }],
+        "analysis": "Bonne adéquation famille / budget"
+    })),
+    ("expert en marketing automobile", json.dumps({
+        "options": [
+            {"index": 1, "name": "Formule Sérénité", "description": "Mensualités douces."},
+            {"index": 2, "name": "Formule Liberté", "description": "Équilibre apport / durée."},
+            {"index": 3, "name": "Formule Express", "description": "Paiement comptant."}
+        ],
+        "recommendation": "La Formule Sérénité correspond à votre budget."
+    })),
+    ("évaluation de véhicules d'occasion", "Demande soutenue sur ce modèle ; kilométrage dans la moyenne."),
+]
+
+DEFAULT_REPLY = "Je comprends votre budget. Je peux vous proposer 3 200 MAD/mois sur 60 mois, qu'en pensez-vous ?"
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Deterministic chat model with a fixed per-call latency"""
+
+    latency_ms: float = 50.0
+    script: List[Tuple[str, str]] = DEFAULT_SCRIPT
+    default_reply: str = DEFAULT_REPLY
+    model_name: str = "scripted-fake"
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def _answer(self, messages: List[BaseMessage]) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        content = next((answer for marker, answer in self.script if marker in prompt), self.default_reply)
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                # ~4 characters per token, close enough for dashboards
+                "input_tokens": len(prompt) // 4,
+                "output_tokens": len(content) // 4,
+                "total_tokens": (len(prompt) + len(content)) // 4,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency_ms / 1000)
+        return self._answer(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency_ms / 1000)
+        return self._answer(messages)
+
+
+def install_fake_llm(llm: BaseChatModel) -> None:
+    """Point every agent singleton (and its sub-services) at `llm`"""
+    from agents import deal_agent, inventory_agent, negotiation_agent, profiling_agent, valuation_agent
+
+    for agent in (negotiation_agent, negotiation_agent.analysis, negotiation_agent.response,
+                  valuation_agent, profiling_agent, inventory_agent, deal_agent):
+        agent.llm = llm
@@ -0,0 +1,119 @@
+"""
+Benchmark Harness
+Times async "turns", summarizes them and compares against a stored baseline.
+
+Timings are absolute milliseconds, so a baseline only gates timings on the
+machine that recorded it (see machine_fingerprint); elsewhere only the
+allocations are compared. p99 is reported but not gated: with a few hundred
+samples it is the single slowest turn.
+"""
+import os
+import platform
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List
+
+import numpy as np
+
+Turn = Callable[[], Awaitable[Any]]
+# Builds the turns of one benchmark run; the run index keeps sessions of different runs apart
+TurnFactory = Callable[[int], List[Turn]]
+
+# Gated metrics where a higher value is a regression (throughput is checked the other way)
+TIMING_METRICS = ("p50_ms", "p95_ms")
+ALLOCATION_METRICS = ("alloc_kib_per_turn",)
+
+# Baseline key holding the fingerprint of the machine that recorded it
+MACHINE_KEY = "_machine"
+
+
+def machine_fingerprint() -> Dict[str, Any]:
+    """What timings depend on: CPU model and count, architecture, Python version"""
+    processor = platform.processor()
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as cpuinfo:
+            processor = next(line.split(":", 1)[1].strip() for line in cpuinfo if line.startswith("model name"))
+    except (OSError, StopIteration):
+        pass
+    return {
+        "processor": processor,
+        "cpus": os.cpu_count(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+    }
+
+
+async def measure(make_turns: TurnFactory, iterations: int = 3, warmup: int = 1, track_allocations: bool = True) -> Dict[str, float]:
+    """
+    Replay `iterations` runs sequentially and summarize their turns.
+
+    Latency and throughput come from untraced runs; allocations (peak traced
+    KiB per turn) from one extra run under tracemalloc, which would otherwise
+    skew the timings.
+    """
+    run = 0
+    for _ in range(warmup):
+        for turn in make_turns(run):
+            await turn()
+        run += 1
+
+    durations = []
+    wall_start = time.perf_counter()
+    for _ in range(iterations):
+        for turn in make_turns(run):
+            start = time.perf_counter()
+            await turn()
+            durations.append(time.perf_counter() - start)
+        run += 1
+    wall = time.perf_counter() - wall_start
+
+    latencies_ms = np.array(durations) * 1000
+    result = {
+        "turns": len(durations),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 2),
+        "turns_per_sec": round(len(durations) / wall, 2),
+    }
+
+    if track_allocations:
+        peaks = []
+        tracemalloc.start()
+        try:
+            for turn in make_turns(run):
+                tracemalloc.reset_peak()
+                baseline, _ = tracemalloc.get_traced_memory()
+                await turn()
+                _, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - baseline)
+        finally:
+            tracemalloc.stop()
+        result["alloc_kib_per_turn"] = round(float(np.mean(peaks)) / 1024, 1)
+
+    return result
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+    timings: bool = True,
+) -> List[str]:
+    """
+    Regressions of `results` beyond `tolerance` (relative) against `baseline`.
+    With `timings` False (baseline from another machine) only allocations are compared.
+    """
+    metrics = (TIMING_METRICS if timings else ()) + ALLOCATION_METRICS
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        for metric in metrics:
+            if metric in current and reference.get(metric) and current[metric] > reference[metric] * (1 + tolerance):
+                regressions.append(f"{name}.{metric}: {current[metric]} > {reference[metric]} (+{tolerance:.0%})")
+        if timings and reference.get("turns_per_sec") and current["turns_per_sec"] < reference["turns_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}.turns_per_sec: {current['turns_per_sec']} < {reference['turns_per_sec']} (-{tolerance:.0%})"
+            )
+    return regressions
@@ -0,0 +1,164 @@
+"""
+Benchmark Runner
+
+Replays the scenarios through three entry points, with Groq replaced by the
+scripted fake LLM:
+- negotiate:   NegotiationAgent.negotiate, one turn per request
+- orchestrate: OrchestratorAgent.run_flow
+- api:         the FastAPI app (/ai/negotiate and /ai/orchestrate) over ASGI
+
+Usage:
+    python -m benchmarks.run                       # compare with benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline     # record a new baseline
+    python -m benchmarks.run --llm-latency-ms 0    # pure framework overhead
+
+Exit code 1 when a gated metric (p50, p95, throughput, allocations)
+regresses beyond --tolerance. The baseline records the machine it was taken
+on; on any other machine timings are printed but only allocations are gated.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+import httpx
+import structlog
+
+from benchmarks.fake_llm import ScriptedChatModel, install_fake_llm
+from benchmarks.harness import MACHINE_KEY, Turn, compare, machine_fingerprint, measure
+from benchmarks.scenarios import ORCHESTRATOR_INPUTS, load_conversations, with_run_suffix
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _negotiate_turns(run: int) -> List[Turn]:
+    from agents import negotiation_agent
+    from schemas.models import NegotiationRequestModel
+
+    return [
+        (lambda payload=with_run_suffix(payload, run): negotiation_agent.negotiate(NegotiationRequestModel(**payload)))
+        for conversation in load_conversations()
+        for payload in conversation
+    ]
+
+
+def _orchestrate_turns(run: int) -> List[Turn]:
+    from agents import orchestrator_agent
+
+    return [
+        (lambda inputs={**inputs, "session_id": f"orchestrate-bench{run}-{i}"}: orchestrator_agent.run_flow(inputs))
+        for i, inputs in enumerate(ORCHESTRATOR_INPUTS)
+    ]
+
+
+def _api_turns(client: httpx.AsyncClient):
+    async def post(path: str, payload: Dict[str, Any]) -> None:
+        response = await client.post(path, json=payload)
+        response.raise_for_status()
+
+    def make_turns(run: int) -> List[Turn]:
+        turns = [
+            (lambda payload=with_run_suffix(payload, run): post("/ai/negotiate", payload))
+            for conversation in load_conversations()
+            for payload in conversation
+        ]
+        turns += [
+            (lambda inputs=inputs: post("/ai/orchestrate", {
+                "customer_id": inputs["customer_id"],
+                "trade_in_id": inputs.get("trade_in_id"),
+                "trade_in_data": inputs.get("trade_in_data"),
+                "preferences": inputs["preferences"],
+            }))
+            for inputs in ORCHESTRATOR_INPUTS
+        ]
+        return turns
+
+    return make_turns
+
+
+async def run_benchmarks(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    from config.settings import settings
+    import main
+
+    if not args.verbose:
+        # After the app import, which configures logging itself
+        structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL))
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    install_fake_llm(ScriptedChatModel(latency_ms=args.llm_latency_ms))
+    # Measure the LLM path itself, and do not let the per-IP limits throttle the replay
+    settings.llm_cache_enabled = args.llm_cache
+    main.limiter.enabled = False
+
+    results = {}
+    options = dict(iterations=args.iterations, warmup=args.warmup, track_allocations=not args.no_alloc)
+    if "negotiate" in args.targets:
+        results["negotiate"] = await measure(_negotiate_turns, **options)
+    if "orchestrate" in args.targets:
+        results["orchestrate"] = await measure(_orchestrate_turns, **options)
+    if "api" in args.targets:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            results["api"] = await measure(_api_turns(client), **options)
+    return results
+
+
+def _print_table(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> None:
+    columns = ["turns", "p50_ms", "p95_ms", "p99_ms", "turns_per_sec", "alloc_kib_per_turn"]
+    print(f"{'target':<12}" + "".join(f"{c:>20}" for c in columns))
+    for name, metrics in results.items():
+        cells = []
+        for column in columns:
+            value = metrics.get(column, "-")
+            reference = baseline.get(name, {}).get(column)
+            cells.append(f"{value} ({reference})" if reference is not None and column != "turns" else str(value))
+        print(f"{name:<12}" + "".join(f"{c:>20}" for c in cells))
+
+
+def main_cli() -> int:
+    parser = argparse.ArgumentParser(description="Offline negotiation hot-path benchmarks")
+    parser.add_argument("--targets", nargs="+", default=["negotiate", "orchestrate", "api"],
+                        choices=["negotiate", "orchestrate", "api"])
+    parser.add_argument("--iterations", type=int, default=10, help="Timed replays of every scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed replays before measuring")
+    parser.add_argument("--llm-latency-ms", type=float, default=20.0, help="Fake LLM latency per call")
+    parser.add_argument("--llm-cache", action="store_true", help="Keep the LLM result cache enabled")
+    parser.add_argument("--no-alloc", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--verbose", action="store_true", help="Keep agent logs")
+    args = parser.parse_args()
+
+    # Agents still print() progress; keep it out of the report unless --verbose
+    with contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO()):
+        results = asyncio.run(run_benchmarks(args))
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    _print_table(results, baseline)
+
+    machine = machine_fingerprint()
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps({MACHINE_KEY: machine, **results}, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    same_machine = baseline.get(MACHINE_KEY) == machine
+    if baseline and not same_machine:
+        print("Baseline recorded on another machine: timings not gated, only allocations "
+              "(make bench-baseline records one for this machine)")
+    regressions = compare(results, baseline, args.tolerance, timings=same_machine)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
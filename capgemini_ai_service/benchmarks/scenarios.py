@@ -0,0 +1,69 @@
+"""
+Benchmark Scenarios
+Negotiation conversations replayed by the harness:
+- every tests/json_tests/*.json request, grouped into conversations by session_id
+- scripted multi-turn negotiations (discovery -> objection -> counter-offer -> accept)
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+JSON_TESTS_DIR = Path(__file__).resolve().parent.parent / "tests" / "json_tests"
+
+MULTI_TURN_SCRIPTS: Dict[str, List[str]] = {
+    "family_budget": [
+        "Bonjour, je cherche une voiture familiale de 7 places.",
+        "C'est trop cher pour moi, je ne peux pas dépasser 3000 MAD par mois.",
+        "Je vous la prends à 230 000 MAD.",
+        "Ok c'est bon, je prends la voiture !",
+    ],
+    "cash_buyer": [
+        "Hello, I want to pay cash for this car.",
+        "The price is too high, can you do better?",
+        "I can pay 240,000 MAD cash today.",
+        "Deal, I'll take it.",
+    ],
+}
+
+VEHICLE_CONTEXT = {"vehicle_id": "1", "price": 250000, "cost": 212500, "make": "Dacia", "model": "Jogger"}
+
+ORCHESTRATOR_INPUTS: List[Dict[str, Any]] = [
+    {
+        "customer_id": "bench-family",
+        "preferences": {"vehicle_type": "SUV", "monthly_budget": 4000, "financing_preference": "Credit",
+                        "priorities": ["space", "safety"]},
+    },
+    {
+        "customer_id": "bench-trade-in",
+        "trade_in_id": "bench-trade-1",
+        "trade_in_data": {"make": "Renault", "model": "Clio", "year": 2018, "mileage": 90000, "condition": "Bon"},
+        "preferences": {"vehicle_type": "Citadine", "monthly_budget": 3000, "financing_preference": "Cash",
+                        "priorities": ["price"]},
+    },
+]
+
+
+def load_conversations() -> List[List[Dict[str, Any]]]:
+    """All conversations, each a list of NegotiationRequestModel payloads in turn order"""
+    by_session: Dict[str, List[Dict[str, Any]]] = {}
+    for path in sorted(JSON_TESTS_DIR.glob("*.json")):
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        by_session.setdefault(payload["session_id"], []).append(payload)
+
+    conversations = list(by_session.values())
+    for name, messages in MULTI_TURN_SCRIPTS.items():
+        conversations.append([
+            {
+                "session_id": f"script-{name}",
+                "customer_id": f"script-{name}",
+                "customer_message": message,
+                **({"vehicle_context": VEHICLE_CONTEXT} if turn == 0 else {}),
+            }
+            for turn, message in enumerate(messages)
+        ])
+    return conversations
+
+
+def with_run_suffix(payload: Dict[str, Any], run: int) -> Dict[str, Any]:
+    """Copy of a turn payload whose session is unique to benchmark run `run`"""
+    return {**payload, "session_id": f"{payload['session_id']}-bench{run}"}
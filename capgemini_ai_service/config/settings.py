@@ -11,12 +11,73 @@ class Settings:
     service_name: str = os.getenv("SERVICE_NAME", "AI Negotiation Service")
     host: str = os.getenv("HOST", "0.0.0.0")
     port: int = int(os.getenv("PORT", "8005"))
+
+    # Deployment: worker processes (uvicorn --workers reads WEB_CONCURRENCY as well).
+    # Several workers need shared state: with REDIS_URL set, the "auto" backends
+    # below (sessions, rate limits, LLM cache) all use Redis.
+    web_concurrency: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    reload: bool = os.getenv("RELOAD", "true").lower() == "true"  # `python main.py`, single worker only
+    redis_url: str = os.getenv("REDIS_URL", "")
+    # Rate limit counters: "auto" (Redis if REDIS_URL, else per-process memory) or a limits storage URI
+    rate_limit_storage: str = os.getenv("RATE_LIMIT_STORAGE", "auto")
+    # Session store: "auto", "memory" or "redis"
+    session_backend: str = os.getenv("SESSION_BACKEND", "auto")
     
     # AI Model (using fast 8B for demo speed)
     default_model: str = os.getenv("DEFAULT_MODEL", "llama-3.1-8b-instant")
     temperature: float = float(os.getenv("TEMPERATURE", "0.7"))
     max_tokens: int = int(os.getenv("MAX_TOKENS", "2048"))
 
+    # Turn analysis (emotion + intent run concurrently, each bounded by this timeout)
+    analysis_timeout: float = float(os.getenv("ANALYSIS_TIMEOUT", "8.0"))
+    # "split" = two concurrent LLM calls, "fused" = one combined "turn understanding" call
+    analysis_mode: str = os.getenv("ANALYSIS_MODE", "split")
+    # Unambiguous messages ("wakha", "bonjour", "je propose 120k") skip LLM intent detection
+    intent_fast_path_enabled: bool = os.getenv("INTENT_FAST_PATH_ENABLED", "true").lower() == "true"
+    intent_fast_path_threshold: float = float(os.getenv("INTENT_FAST_PATH_THRESHOLD", "0.85"))
+    # A stated budget is met (or proven out of reach) in one concession instead of step by step
+    budget_solver_enabled: bool = os.getenv("BUDGET_SOLVER_ENABLED", "true").lower() == "true"
+
+    # Build the agents in the background at startup (otherwise on their first request)
+    agent_warmup: bool = os.getenv("AGENT_WARMUP", "true").lower() == "true"
+
+    # LLM result cache ("memory" = per-process LRU, "redis" = shared via REDIS_URL, "auto" = redis if REDIS_URL)
+    llm_cache_enabled: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    llm_cache_backend: str = os.getenv("LLM_CACHE_BACKEND", "auto")
+    llm_cache_max_entries: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+    # Per-agent TTLs in seconds (0 disables caching for that agent)
+    llm_cache_ttl_valuation: int = int(os.getenv("LLM_CACHE_TTL_VALUATION", "86400"))
+    llm_cache_ttl_deal_naming: int = int(os.getenv("LLM_CACHE_TTL_DEAL_NAMING", "3600"))
+    llm_cache_ttl_inventory_match: int = int(os.getenv("LLM_CACHE_TTL_INVENTORY_MATCH", "600"))
+
+    # Inventory file is stat-polled at most this often (seconds) and hot-reloaded on change
+    inventory_poll_interval: float = float(os.getenv("INVENTORY_POLL_INTERVAL", "5.0"))
+    # Vehicles sent to the matching LLM after deterministic pre-ranking
+    inventory_prompt_top_k: int = int(os.getenv("INVENTORY_PROMPT_TOP_K", "10"))
+
+    # Shared LLM HTTP pool (one keep-alive pool for every ChatGroq client)
+    llm_max_connections: int = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+    llm_max_keepalive_connections: int = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    llm_keepalive_expiry: float = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60.0"))
+    # HTTP/2 is only used when the optional `h2` package is installed
+    llm_http2: bool = os.getenv("LLM_HTTP2", "true").lower() == "true"
+
+    # Client-side Groq budgets for the whole deployment (0 = unlimited), split evenly
+    # across WEB_CONCURRENCY workers, and retry policy for 429 / transient errors
+    llm_scheduler_enabled: bool = os.getenv("LLM_SCHEDULER_ENABLED", "true").lower() == "true"
+    llm_requests_per_minute: float = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "30"))
+    llm_tokens_per_minute: float = float(os.getenv("LLM_TOKENS_PER_MINUTE", "6000"))
+    llm_max_retries: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    llm_retry_base_delay: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+
+    # Redis sessions: append-only logs for messages/offers/emotions instead of
+    # rewriting the whole session; get() loads the last N entries of each log
+    session_append_log: bool = os.getenv("SESSION_APPEND_LOG", "false").lower() == "true"
+    session_history_window: int = int(os.getenv("SESSION_HISTORY_WINDOW", "20"))
+    # In-memory session store bounds per worker (0 = unlimited), least recently saved evicted first
+    session_max_sessions: int = int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+    session_max_bytes: int = int(os.getenv("SESSION_MAX_BYTES", "0"))
+
     # Financial Config
     lld_rate_48: float = float(os.getenv("LLD_RATE_48", "4.5"))
     lld_rate_36: float = float(os.getenv("LLD_RATE_36", "4.0"))
@@ -24,4 +85,8 @@ class Settings:
     credit_rate_48: float = float(os.getenv("CREDIT_RATE_48", "5.0"))
     subscription_markup: float = float(os.getenv("SUBSCRIPTION_MARKUP", "1.35"))
 
+    def uses_redis(self, backend: str) -> bool:
+        """Whether a backend choice ("auto", "memory", "redis") resolves to Redis"""
+        return backend == "redis" or (backend == "auto" and bool(self.redis_url))
+
 settings = Settings()
@@ -0,0 +1,73 @@
+"""
+Request-scoped Agent Execution Context
+Agents are module-level singletons shared by every request, so per-request
+state (explainability steps, timings, bound logger) must not live on `self`.
+It is carried in a ContextVar instead: each asyncio task gets its own copy,
+so interleaved coroutines never mix or wipe each other's steps.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.logger import logger
+from src.infrastructure.monitoring import AGENT_NODE_DURATION
+
+
+@dataclass
+class AgentContext:
+    """Per-request state for one agent execution"""
+    steps: List[Any] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    logger: Any = field(default_factory=lambda: logger)
+    agent: str = "unknown"
+
+    def add_step(self, step: Any) -> Any:
+        """Record an explainability step"""
+        self.steps.append(step)
+        return step
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Record the duration of a block in milliseconds under `name` (also exported to Prometheus)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.timings[name] = round(duration * 1000, 2)
+            AGENT_NODE_DURATION.labels(agent=self.agent, node=name).observe(duration)
+
+
+_current_context: ContextVar[Optional[AgentContext]] = ContextVar("agent_context", default=None)
+
+
+def get_agent_context() -> AgentContext:
+    """
+    Get the context of the running request.
+    Outside of `agent_context()` a fresh context is bound to the current
+    task so steps are still collected, never shared across requests.
+    """
+    ctx = _current_context.get()
+    if ctx is None:
+        ctx = AgentContext()
+        _current_context.set(ctx)
+    return ctx
+
+
+@contextmanager
+def agent_context(**bindings: Any) -> Iterator[AgentContext]:
+    """
+    Open a fresh context for one agent request.
+
+    Example:
+        with agent_context(agent="Valuation Agent", trade_in_id="123") as ctx:
+            ctx.logger.info("valuation_start")
+    """
+    ctx = AgentContext(logger=logger.bind(**bindings), agent=bindings.get("agent", "unknown"))
+    token = _current_context.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current_context.reset(token)
@@ -0,0 +1,224 @@
+"""
+LLM Result Cache
+Memoizes deterministic LLM calls (valuation insights, deal naming, inventory
+matching) keyed on their normalized prompt inputs, so repeated requests skip
+the Groq round-trip.
+
+Backends:
+- InMemoryLLMCache: per-process LRU with per-entry TTL (default)
+- RedisLLMCache: shared across workers, native TTL (LLM_CACHE_BACKEND=redis)
+"""
+import copy
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from config.settings import settings
+from core.logger import logger
+from src.infrastructure.monitoring import CACHE_ENTRIES
+
+
+def make_cache_key(namespace: str, inputs: Dict[str, Any]) -> str:
+    """
+    Build a stable key from prompt inputs.
+    Strings are stripped and lower-cased, dict keys sorted, so cosmetic
+    differences ("Dacia " vs "dacia") hit the same entry.
+    """
+    def normalize(value: Any) -> Any:
+        if isinstance(value, str):
+            return " ".join(value.split()).lower()
+        if isinstance(value, dict):
+            return {str(k): normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+
+    payload = json.dumps(normalize(inputs), sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class LLMCache(ABC):
+    """Abstract LLM result cache with per-namespace hit/miss counters"""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, None on miss or expiry"""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """Store a JSON-serializable value for `ttl` seconds"""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop every cached entry"""
+        pass
+
+    async def get_or_compute(
+        self,
+        namespace: str,
+        inputs: Dict[str, Any],
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        bypass: bool = False
+    ) -> Any:
+        """
+        Return the cached result for `inputs`, or await `compute()` and cache it.
+        Exceptions from `compute` propagate and nothing is cached, so agent
+        fallbacks are never memoized.
+        """
+        if bypass or not settings.llm_cache_enabled or ttl <= 0:
+            self._record(namespace, "bypass")
+            return await compute()
+
+        key = make_cache_key(namespace, inputs)
+        try:
+            cached = await self.get(key)
+        except Exception as e:
+            logger.warning("llm_cache_get_failed", namespace=namespace, error=str(e))
+            cached = None
+
+        if cached is not None:
+            self._record(namespace, "hits")
+            return cached
+
+        self._record(namespace, "misses")
+        value = await compute()
+        try:
+            await self.set(key, value, ttl)
+        except Exception as e:
+            logger.warning("llm_cache_set_failed", namespace=namespace, error=str(e))
+        return value
+
+    def _record(self, namespace: str, outcome: str) -> None:
+        counters = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "bypass": 0})
+        counters[outcome] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss counters and hit rate per namespace"""
+        result = {}
+        for namespace, counters in self._stats.items():
+            lookups = counters["hits"] + counters["misses"]
+            result[namespace] = {
+                **counters,
+                "hit_rate": round(counters["hits"] / lookups, 3) if lookups else 0.0
+            }
+        return result
+
+
+class InMemoryLLMCache(LLMCache):
+    """
+    Per-process LRU cache.
+    Entries expire after their TTL; the least recently used entry is
+    evicted once `max_entries` is reached. Values are copied in and out so
+    callers can mutate results without corrupting the cache (same semantics
+    as the Redis backend).
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        super().__init__()
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            CACHE_ENTRIES.labels(cache="llm").set(len(self._entries))
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        CACHE_ENTRIES.labels(cache="llm").set(len(self._entries))
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        CACHE_ENTRIES.labels(cache="llm").set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisLLMCache(LLMCache):
+    """
+    Redis-backed cache shared by all workers.
+
+    Requires: pip install redis
+    """
+
+    def __init__(self, redis_url: str = "redis://localhost:6379/0"):
+        super().__init__()
+        self._redis_url = redis_url
+        self._redis = None
+        self._prefix = "llm_cache:"
+
+    async def _get_redis(self):
+        """Lazy connection initialization"""
+        if self._redis is None:
+            try:
+                import redis.asyncio as redis
+                self._redis = redis.from_url(
+                    self._redis_url,
+                    encoding="utf-8",
+                    decode_responses=True
+                )
+            except ImportError as e:
+                raise RuntimeError(
+                    "Redis library not installed. "
+                    "Install with: pip install redis"
+                ) from e
+        return self._redis
+
+    async def get(self, key: str) -> Optional[Any]:
+        redis_client = await self._get_redis()
+        data = await redis_client.get(f"{self._prefix}{key}")
+        return json.loads(data) if data else None
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        redis_client = await self._get_redis()
+        await redis_client.setex(f"{self._prefix}{key}", ttl, json.dumps(value, ensure_ascii=False))
+
+    async def clear(self) -> None:
+        redis_client = await self._get_redis()
+        async for key in redis_client.scan_iter(f"{self._prefix}*"):
+            await redis_client.delete(key)
+
+
+# Singleton instance
+_cache_instance: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """
+    Factory function for the LLM cache.
+    The backend is chosen by LLM_CACHE_BACKEND ("memory", "redis", or "auto" =
+    redis when REDIS_URL is set, so workers share cached answers).
+    """
+    global _cache_instance
+
+    if _cache_instance is None:
+        if settings.uses_redis(settings.llm_cache_backend):
+            url = settings.redis_url or "redis://localhost:6379/0"
+            _cache_instance = RedisLLMCache(redis_url=url)
+        else:
+            _cache_instance = InMemoryLLMCache(max_entries=settings.llm_cache_max_entries)
+
+    return _cache_instance
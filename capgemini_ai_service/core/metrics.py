@@ -205,8 +205,39 @@ class WinWinCalculator:
 
 @dataclass
 class EmotionalTrend:
-    """Tracks emotional trend over conversation"""
+    """
+    Tracks emotional trend over conversation.
+    
+    Running aggregates (prefix sums, last reading, mean absolute change,
+    emotion counts) are updated by add_reading(), so get_trend() is O(1).
+    `history` keeps the last `max_history` readings (trimmed in batches).
+    """
     history: List[Dict[str, Any]] = field(default_factory=list)
+    max_history: int = 50
+    
+    # Running aggregates over every reading, including trimmed ones
+    _prefix_sums: List[float] = field(default_factory=lambda: [0.0], init=False, repr=False, compare=False)
+    _abs_diff_sum: float = field(default=0.0, init=False, repr=False, compare=False)
+    _last_sentiment: float = field(default=0.0, init=False, repr=False, compare=False)
+    _last_intensity: float = field(default=0.0, init=False, repr=False, compare=False)
+    _emotion_counts: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Restored sessions: rebuild the aggregates from the persisted readings
+        for reading in self.history:
+            self._accumulate(reading["emotion"], reading["intensity"], reading["sentiment"])
+    
+    @property
+    def _count(self) -> int:
+        return len(self._prefix_sums) - 1
+    
+    def _accumulate(self, emotion: str, intensity: float, sentiment: float) -> None:
+        if self._count:
+            self._abs_diff_sum += abs(sentiment - self._last_sentiment)
+        self._prefix_sums.append(self._prefix_sums[-1] + sentiment)
+        self._last_sentiment = sentiment
+        self._last_intensity = intensity
+        self._emotion_counts[emotion] = self._emotion_counts.get(emotion, 0) + 1
     
     def add_reading(self, emotion: str, intensity: float, sentiment: float, message: str = ""):
         """Add a new emotional reading"""
@@ -217,10 +248,14 @@ class EmotionalTrend:
             "sentiment": sentiment,
             "message_snippet": message[:50] if message else ""
         })
+        self._accumulate(emotion, intensity, sentiment)
+        if self.max_history and len(self.history) > 2 * self.max_history:
+            del self.history[:-self.max_history]
     
     def get_trend(self) -> Dict[str, Any]:
         """Analyze emotional trend over conversation"""
-        if not self.history:
+        count = self._count
+        if not count:
             return {
                 "trend": "neutral",
                 "direction": "stable",
@@ -229,17 +264,15 @@ class EmotionalTrend:
                 "risk_level": "low"
             }
         
-        sentiments = [r["sentiment"] for r in self.history]
-        intensities = [r["intensity"] for r in self.history]
-        
         # Current state
-        current_sentiment = sentiments[-1]
-        current_intensity = intensities[-1]
+        current_sentiment = self._last_sentiment
+        current_intensity = self._last_intensity
         
         # Trend direction (comparing recent to earlier)
-        if len(sentiments) >= 3:
-            early_avg = sum(sentiments[:len(sentiments)//2]) / (len(sentiments)//2)
-            recent_avg = sum(sentiments[len(sentiments)//2:]) / (len(sentiments) - len(sentiments)//2)
+        if count >= 3:
+            half = count // 2
+            early_avg = self._prefix_sums[half] / half
+            recent_avg = (self._prefix_sums[count] - self._prefix_sums[half]) / (count - half)
             
             if recent_avg > early_avg + 0.2:
                 direction = "improving"
@@ -251,11 +284,7 @@ class EmotionalTrend:
             direction = "insufficient_data"
         
         # Volatility (how much emotions swing)
-        if len(sentiments) >= 2:
-            diffs = [abs(sentiments[i] - sentiments[i-1]) for i in range(1, len(sentiments))]
-            volatility = sum(diffs) / len(diffs)
-        else:
-            volatility = 0.0
+        volatility = self._abs_diff_sum / (count - 1) if count >= 2 else 0.0
         
         # Risk assessment
         if current_sentiment < -0.5 or (direction == "declining" and current_intensity > 0.7):
@@ -280,7 +309,7 @@ class EmotionalTrend:
             "current_sentiment": round(current_sentiment, 2),
             "current_intensity": round(current_intensity, 2),
             "risk_level": risk_level,
-            "readings_count": len(self.history),
+            "readings_count": count,
             "recommendation": self._get_emotional_recommendation(trend, direction, risk_level)
         }
     
@@ -300,14 +329,10 @@ class EmotionalTrend:
     
     def get_average_sentiment(self) -> float:
         """Get average sentiment across conversation"""
-        if not self.history:
+        if not self._count:
             return 0.0
-        return sum(r["sentiment"] for r in self.history) / len(self.history)
+        return self._prefix_sums[-1] / self._count
     
     def get_emotion_distribution(self) -> Dict[str, int]:
         """Get count of each emotion type"""
-        distribution = {}
-        for reading in self.history:
-            emotion = reading["emotion"]
-            distribution[emotion] = distribution.get(emotion, 0) + 1
-        return distribution
+        return dict(self._emotion_counts)
@@ -4,11 +4,15 @@ Provides endpoints for valuation and negotiation agents
 """
 from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import APIKeyHeader
 from datetime import datetime
 import uvicorn
+import asyncio
 import uuid
+import json
 import os
+import sys
 
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -18,18 +22,32 @@ from config.settings import settings
 from schemas.models import (
     ValuationRequestModel,
     ValuationResponseModel,
+    ValuationBatchRequestModel,
     NegotiationRequestModel,
     NegotiationResponseModel,
     HealthResponse,
     OrchestratorRequestModel,
     OrchestratorResponseModel,
-    DealStructuringRequestModel
+    DealStructuringRequestModel,
+    DealGridRequestModel
 )
-from agents import valuation_agent, negotiation_agent, profiling_agent, inventory_agent, deal_agent, orchestrator_agent
+# Agents (langchain, langgraph, Groq SDK) are built on first use, or by the warm-up hook
+from agents import get_agent, warm_up_agents
 from core.logger import logger
+from src.infrastructure.monitoring import http_metrics_middleware, mark_worker_dead, render_latest
 
-# Rate limiter setup
-limiter = Limiter(key_func=get_remote_address)
+def rate_limit_storage_uri() -> str:
+    """Rate limit counters: shared in Redis across workers when REDIS_URL is set (RATE_LIMIT_STORAGE=auto)"""
+    if settings.rate_limit_storage != "auto":
+        return settings.rate_limit_storage
+    return settings.redis_url or "memory://"
+
+# Rate limiter setup (per-process counters while the shared storage is unreachable)
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=rate_limit_storage_uri(),
+    in_memory_fallback_enabled=True
+)
 
 # API Key security (optional - check environment variable)
 API_KEY_NAME = "X-API-Key"
@@ -63,6 +81,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-endpoint latency histogram
+app.middleware("http")(http_metrics_middleware)
+
+@app.on_event("startup")
+async def warm_up():
+    """Build the agents in the background so /health answers before they are ready"""
+    if settings.agent_warmup:
+        asyncio.get_running_loop().run_in_executor(None, _warm_up_agents)
+
+def _warm_up_agents():
+    try:
+        logger.info("agents_warm", agents=warm_up_agents())
+    except Exception as e:
+        logger.error("agents_warm_up_failed", error=str(e))
+
+@app.on_event("shutdown")
+async def shutdown_llm_clients():
+    """Close the shared LLM connection pool (if it was ever opened)"""
+    if "src.infrastructure.llm.client_registry" in sys.modules:
+        from src.infrastructure.llm.client_registry import close_clients
+        await close_clients()
+
+@app.on_event("shutdown")
+async def shutdown_metrics():
+    """Drop this worker's live gauges from the Prometheus multiprocess directory"""
+    mark_worker_dead()
+
 @app.get("/", response_model=HealthResponse)
 async def root():
     """Root endpoint"""
@@ -81,9 +126,11 @@ async def health_check():
         # Test Groq connection only if API key is configured
         from config.settings import settings
         if settings.groq_api_key:
-            from agents import get_llm
-            llm = get_llm()
             groq_connected = True
+            # Building the client imports the Groq SDK: only check it once the agents have loaded it
+            if "src.infrastructure.llm.client_registry" in sys.modules:
+                from agents import get_llm
+                llm = get_llm()
     except Exception as e:
         logger.warning("groq_connection_failed", error=str(e))
         groq_connected = False
@@ -98,13 +145,41 @@ async def negotiate(request: Request, neg_request: NegotiationRequestModel, api_
     """
     try:
         logger.info("negotiation_turn_start", session_id=neg_request.session_id)
-        response = await negotiation_agent.negotiate(neg_request)
+        response = await get_agent("negotiation_agent").negotiate(neg_request)
         logger.info("negotiation_turn_end", session_id=neg_request.session_id)
         return response
     except Exception as e:
         logger.error("negotiation_error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/ai/negotiate/stream")
+@limiter.limit("30/minute")  # Same budget as /ai/negotiate
+async def negotiate_stream(request: Request, neg_request: NegotiationRequestModel, api_key: str = Depends(verify_api_key)):
+    """
+    Streaming endpoint for the Negotiation Agent (Server-Sent Events).
+    Emits `token` events as the reply is generated, then one `final` event
+    carrying the full NegotiationResponseModel (offer, emotion, win-win score, vehicle_card).
+    """
+    async def event_stream():
+        logger.info("negotiation_stream_start", session_id=neg_request.session_id)
+        try:
+            async for event in get_agent("negotiation_agent").negotiate_stream(neg_request):
+                if event["event"] == "token":
+                    data = json.dumps({"text": event["data"]}, ensure_ascii=False)
+                else:
+                    data = event["data"].model_dump_json()
+                yield f"event: {event['event']}\ndata: {data}\n\n"
+            logger.info("negotiation_stream_end", session_id=neg_request.session_id)
+        except Exception as e:
+            logger.error("negotiation_stream_error", error=str(e))
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/ai/orchestrate")
 @limiter.limit("10/minute")  # 10 full orchestrations per minute per IP
 async def orchestrate_flow(request: Request, orch_request: OrchestratorRequestModel, api_key: str = Depends(verify_api_key)):
@@ -128,7 +203,7 @@ async def orchestrate_flow(request: Request, orch_request: OrchestratorRequestMo
             "trade_in_data": trade_in_data
         }
         
-        result = await orchestrator_agent.run_flow(inputs)
+        result = await get_agent("orchestrator_agent").run_flow(inputs)
         logger.info("orchestrator_complete", session_id=session_id, 
                    win_win_score=result.get("win_win_score", 0))
         return result
@@ -147,7 +222,7 @@ async def analyze_profile(request: Request, profile_request: OrchestratorRequest
         history = [] 
         
         logger.info("profile_analysis_start", customer_id=profile_request.customer_id)
-        result = await profiling_agent.analyze_profile(
+        result = await get_agent("profiling_agent").analyze_profile(
             conversation_history=history,
             stated_preferences=profile_request.preferences.model_dump() if profile_request.preferences else {}
         )
@@ -166,7 +241,7 @@ async def match_inventory(request: Request, match_request: OrchestratorRequestMo
         profile = match_request.preferences.model_dump() if match_request.preferences else {}
         logger.info("inventory_match_start", segment=profile.get("segment"))
 
-        result = await inventory_agent.find_matches(
+        result = await get_agent("inventory_agent").find_matches(
             profile=profile,
             inventory=None 
         )
@@ -191,7 +266,7 @@ async def structure_deal(request: Request, deal_request: DealStructuringRequestM
             "monthly_budget": deal_request.preferences.monthly_budget
         }
         
-        result = await deal_agent.structure_deal(
+        result = await get_agent("deal_agent").structure_deal(
             vehicle_price=deal_request.vehicle_price,
             trade_in_value=deal_request.trade_in_value,
             profile=profile
@@ -202,6 +277,37 @@ async def structure_deal(request: Request, deal_request: DealStructuringRequestM
         logger.error("deal_structuring_error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/ai/structuring/grid")
+@limiter.limit("20/minute")
+async def structure_deal_grid(request: Request, grid_request: DealGridRequestModel, api_key: str = Depends(verify_api_key)):
+    """
+    Financing what-if grid: durations x down payments x trade-in values for
+    LLD, Credit and Subscription, reduced to the Pareto-optimal options
+    (monthly payment, total cost, down payment) within the monthly budget
+    """
+    try:
+        logger.info("deal_grid_start", vehicle_price=grid_request.vehicle_price)
+        preferences = grid_request.preferences
+        # Up to ~110k combinations of NumPy work: keep it off the event loop
+        result = await asyncio.to_thread(
+            get_agent("deal_agent").structure_grid,
+            vehicle_price=grid_request.vehicle_price,
+            profile={
+                "monthly_budget": preferences.monthly_budget,
+                "financing_preference": preferences.financing_preference,
+                "priorities": preferences.priorities
+            },
+            trade_in_values=grid_request.trade_in_values,
+            durations=grid_request.durations,
+            down_payments=grid_request.down_payments,
+            max_per_scenario=grid_request.max_options
+        )
+        logger.info("deal_grid_complete", evaluated=result["evaluated"], options=len(result["options"]))
+        return result
+    except Exception as e:
+        logger.error("deal_grid_error", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/ai/session/{session_id}")
 async def get_session(session_id: str, api_key: str = Depends(verify_api_key)):
     """
@@ -211,7 +317,7 @@ async def get_session(session_id: str, api_key: str = Depends(verify_api_key)):
     try:
         from core.session_store import get_session_store
         store = get_session_store()
-        session = await store.get(session_id)
+        session = await store.get_full(session_id)
         
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -251,10 +357,22 @@ async def get_session(session_id: str, api_key: str = Depends(verify_api_key)):
 @app.get("/metrics")
 async def get_metrics():
     """Get AI service metrics (basic info)"""
+    from core.llm_cache import get_llm_cache
+    from core.repositories import get_inventory_repository
+    from src.infrastructure.llm.client_registry import registry_stats
+    from src.infrastructure.llm.scheduler import get_llm_scheduler
     return {
         "service": settings.service_name,
         "model": settings.default_model,
         "status": "operational",
+        "llm_cache": {
+            "enabled": settings.llm_cache_enabled,
+            "backend": "redis" if settings.uses_redis(settings.llm_cache_backend) else "memory",
+            "namespaces": get_llm_cache().stats()
+        },
+        "inventory": get_inventory_repository().snapshot_stats(),
+        "llm_clients": registry_stats(),
+        "llm_scheduler": get_llm_scheduler().stats(),
         "features": [
             "Explainable AI (Transparency)",
             "Emotional Intelligence (Empathy)",
@@ -265,22 +383,9 @@ async def get_metrics():
 
 @app.get("/metrics/prometheus")
 async def prometheus_metrics():
-    """Prometheus-compatible metrics endpoint"""
-    try:
-        from prometheus_client import generate_latest, CONTENT_TYPE_LATEST, Counter, Histogram, Gauge
-        from prometheus_client import CollectorRegistry, multiprocess
-        from starlette.responses import Response
-        
-        # Create custom registry for this service
-        registry = CollectorRegistry()
-        
-        # Return metrics in Prometheus format
-        return Response(
-            content=generate_latest(),
-            media_type=CONTENT_TYPE_LATEST
-        )
-    except ImportError:
-        return {"error": "prometheus_client not installed"}
+    """Prometheus-compatible metrics endpoint (aggregates all workers in multiprocess mode)"""
+    content, content_type = render_latest()
+    return Response(content=content, media_type=content_type)
 
 @app.post("/ai/valuation", response_model=ValuationResponseModel)
 async def valuate_vehicle(request: ValuationRequestModel, api_key: str = Depends(verify_api_key)):
@@ -289,17 +394,43 @@ async def valuate_vehicle(request: ValuationRequestModel, api_key: str = Depends
     """
     try:
         logger.info("valuation_start", vehicle=request.vehicle.model_dump())
-        response = await valuation_agent.valuate(request)
+        response = await get_agent("valuation_agent").valuate(request)
         logger.info("valuation_complete", value=response.estimated_value)
         return response
     except Exception as e:
         logger.error("valuation_error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/ai/valuation/batch")
+@limiter.limit("10/minute")
+async def valuate_vehicles_batch(request: Request, batch_request: ValuationBatchRequestModel, api_key: str = Depends(verify_api_key)):
+    """
+    Batch valuation for trade-in re-pricing campaigns (NDJSON stream).
+    One `valuation` (or `error`) line per vehicle in request order, then
+    `analysis` lines when include_analysis is set, then a `summary` line.
+    """
+    async def ndjson_stream():
+        logger.info("valuation_batch_start", vehicles=len(batch_request.vehicles))
+        try:
+            async for line in get_agent("valuation_agent").valuate_batch(
+                batch_request.vehicles,
+                include_analysis=batch_request.include_analysis,
+                max_analyses=batch_request.max_analyses
+            ):
+                yield line.model_dump_json() + "\n"
+        except Exception as e:
+            logger.error("valuation_batch_error", error=str(e))
+            yield json.dumps({"type": "error", "error": str(e)}) + "\n"
+
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+
 if __name__ == "__main__":
+    # Several workers: production mode (no reload); see WEB_CONCURRENCY in .env.example
+    workers = max(1, settings.web_concurrency)
     uvicorn.run(
         "main:app",
         host=settings.host,
         port=settings.port,
-        reload=True
+        workers=workers,
+        reload=settings.reload and workers == 1
     )
@@ -1,7 +1,7 @@
 """
 Pydantic models for API request/response validation
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, NonNegativeFloat, PositiveInt
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from schemas.types import EmotionType, NegotiationIntent
@@ -59,6 +59,44 @@ class ValuationResponseModel(BaseModel):
     explanation: str
     agent_steps: List[AgentStepModel]
 
+class ValuationBatchRequestModel(BaseModel):
+    """API model for batch valuation (NDJSON response)"""
+    vehicles: List[ValuationRequestModel] = Field(min_length=1, max_length=5000)
+    include_analysis: bool = False  # LLM commentary, in a second pass once per distinct vehicle profile
+    max_analyses: int = Field(default=20, ge=0, le=100, description="LLM commentaries at most (largest vehicle groups first)")
+
+class ValuationBatchItemModel(BaseModel):
+    """Batch valuation NDJSON line: deterministic valuation of one vehicle"""
+    type: str = "valuation"
+    trade_in_id: str
+    estimated_value: float
+    value_range: Dict[str, float]
+    breakdown: ValuationBreakdownModel
+    confidence: float
+
+class ValuationBatchErrorModel(BaseModel):
+    """Batch valuation NDJSON line: vehicle that could not be valuated"""
+    type: str = "error"
+    trade_in_id: str
+    error: str
+
+class ValuationBatchAnalysisModel(BaseModel):
+    """Batch valuation NDJSON line: LLM commentary shared by identical vehicle profiles"""
+    type: str = "analysis"
+    trade_in_ids: List[str]
+    analysis: Optional[str] = None
+    error: Optional[str] = None
+
+class ValuationBatchSummaryModel(BaseModel):
+    """Batch valuation NDJSON line: last line of the stream"""
+    type: str = "summary"
+    vehicles: int
+    valuated: int
+    failed: int
+    price_lookups: int
+    analyses: int
+    analyses_skipped: int = 0  # vehicle groups left without commentary (max_analyses)
+
 class EmotionalContextModel(BaseModel):
     """Emotional intelligence analysis"""
     primary_emotion: EmotionType
@@ -143,6 +181,15 @@ class DealStructuringRequestModel(BaseModel):
     trade_in_value: float = Field(default=0.0, description="Trade-in value in MAD")
     preferences: CustomerPreferences
 
+class DealGridRequestModel(BaseModel):
+    """API request for the financing what-if grid"""
+    vehicle_price: float = Field(gt=0, description="Vehicle price in MAD")
+    trade_in_values: List[NonNegativeFloat] = Field(default=[0.0], min_length=1, max_length=20, description="Trade-in scenarios in MAD")
+    durations: Optional[List[PositiveInt]] = Field(default=None, min_length=1, max_length=100, description="Months (default: 12 to 84, every 6)")
+    down_payments: Optional[List[NonNegativeFloat]] = Field(default=None, min_length=1, max_length=50, description="MAD (default: 0 to 40% of the price)")
+    max_options: int = Field(default=8, ge=1, le=50, description="Pareto options kept per product and trade-in value")
+    preferences: CustomerPreferences
+
 class OrchestratorRequestModel(BaseModel):
     """API request to start orchestration"""
     customer_id: str
@@ -1,4 +1,5 @@
-from typing import TypedDict, List, Optional, Dict, Any
+import operator
+from typing import Annotated, TypedDict, List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
 
@@ -94,8 +95,8 @@ class NegotiationState(TypedDict):
     min_acceptable_terms: Dict[str, Any]
     max_concession_limit: Dict[str, Any]
     
-    # Explainability
-    agent_steps: List[AgentStep]
+    # Explainability (reducer: parallel graph branches append, never overwrite)
+    agent_steps: Annotated[List[AgentStep], operator.add]
     decision_tree: List[Dict[str, Any]]
     
     # Metrics
@@ -1,8 +1,16 @@
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, asdict
 from datetime import datetime
 from src.domain.shared.metrics import EmotionalTrend, WinWinCalculator
 
+# Version of the NegotiationSession.to_dict() layout
+# 1: dataclasses.asdict() dump (no "schema_version" key)
+# 2: shallow dump, emotional trend only under "emotional_trend_history"
+SESSION_SCHEMA_VERSION = 2
+
+# Fields serialized separately from the plain attributes
+_STRUCTURED_FIELDS = ("created_at", "updated_at", "customer_profile", "emotional_trend")
+
 @dataclass
 class CustomerProfile:
     """Evolving customer profile that updates during conversation"""
@@ -250,12 +258,19 @@ class NegotiationSession:
         }
 
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
+        """
+        Serializable view of the session.
+        Shallow: lists and dicts are the session's own objects (no deep copy of
+        the history on every save), so encode the result before mutating the session.
+        """
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name not in _STRUCTURED_FIELDS}
+        data['schema_version'] = SESSION_SCHEMA_VERSION
         data['created_at'] = self.created_at.isoformat()
         data['updated_at'] = self.updated_at.isoformat()
-        # Handle complex objects recursion
         data['customer_profile'] = self.customer_profile.to_dict()
         data['emotional_trend_history'] = self.emotional_trend.history
+        # Optional: older payloads without it rebuild the statistics from the history
+        data['emotional_trend_stats'] = self.emotional_trend.aggregates()
         return data
 
     @classmethod
@@ -275,13 +290,16 @@ class NegotiationSession:
                      "customer_needs", "stated_budget", "budget_type", "interested_vehicles", "language",
                      "vehicle_features", "vehicle_specs", "vehicle_year", 
                      "vehicle_condition", "vehicle_mileage", "vehicle_location",
-                     "comparison_vehicles", "customer_proposed_price"]:  
+                     "comparison_vehicles", "customer_proposed_price",
+                     "payment_preference", "repeated_intents", "frustration_level"]:  
             if field in data:
                 setattr(session, field, data[field])
         
         if "customer_profile" in data:
             session.customer_profile = CustomerProfile(**data["customer_profile"])
         if "emotional_trend_history" in data:
-            session.emotional_trend = EmotionalTrend(history=data["emotional_trend_history"])
+            session.emotional_trend = EmotionalTrend.restore(
+                data["emotional_trend_history"], data.get("emotional_trend_stats")
+            )
             
         return session
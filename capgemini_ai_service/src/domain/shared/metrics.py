@@ -7,7 +7,8 @@ This module provides the core metrics for ensuring fair negotiations:
 - EmotionalTrend: Tracks customer sentiment over conversation
 - DealMetrics: Data class for deal financial analysis
 """
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -211,8 +212,67 @@ class EmotionalTrend:
     - Direction: improving/declining/stable
     - Volatility: how much emotions fluctuate
     - Risk level: likelihood of deal falling through
+    
+    Statistics are running aggregates updated by add_reading(), so get_trend()
+    is O(1). `history` keeps the last `max_history` readings for display and
+    persistence (trimmed in batches, so it briefly holds up to twice that).
+    The aggregates cover trimmed readings too, so they are persisted alongside
+    the history (aggregates() / restore()) rather than rebuilt from it.
     """
     history: List[Dict[str, Any]] = field(default_factory=list)
+    max_history: int = 50
+    
+    # Running aggregates over every reading, including trimmed ones
+    _count: int = field(default=0, init=False, repr=False, compare=False)
+    _sentiment_sum: float = field(default=0.0, init=False, repr=False, compare=False)
+    _sentiment_sq_sum: float = field(default=0.0, init=False, repr=False, compare=False)
+    _negative_count: int = field(default=0, init=False, repr=False, compare=False)
+    _recent: Deque[float] = field(default_factory=lambda: deque(maxlen=3), init=False, repr=False, compare=False)
+    _emotion_counts: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Restored sessions: rebuild the aggregates from the persisted readings
+        for reading in self.history:
+            self._accumulate(reading["emotion"], reading["sentiment"])
+    
+    def _accumulate(self, emotion: str, sentiment: float) -> None:
+        self._count += 1
+        self._sentiment_sum += sentiment
+        self._sentiment_sq_sum += sentiment * sentiment
+        if sentiment < -0.2:
+            self._negative_count += 1
+        self._recent.append(sentiment)
+        self._emotion_counts[emotion] = self._emotion_counts.get(emotion, 0) + 1
+    
+    def aggregates(self) -> Dict[str, Any]:
+        """Running statistics, for persistence next to `history`"""
+        return {
+            "count": self._count,
+            "sentiment_sum": self._sentiment_sum,
+            "sentiment_sq_sum": self._sentiment_sq_sum,
+            "negative_count": self._negative_count,
+            "recent": list(self._recent),
+            "emotion_counts": dict(self._emotion_counts),
+        }
+    
+    @classmethod
+    def restore(
+        cls,
+        history: List[Dict[str, Any]],
+        aggregates: Optional[Dict[str, Any]] = None
+    ) -> "EmotionalTrend":
+        """Persisted trend; without saved aggregates they are rebuilt from `history`"""
+        if not aggregates:
+            return cls(history=history)
+        trend = cls()
+        trend.history = history
+        trend._count = aggregates["count"]
+        trend._sentiment_sum = aggregates["sentiment_sum"]
+        trend._sentiment_sq_sum = aggregates["sentiment_sq_sum"]
+        trend._negative_count = aggregates["negative_count"]
+        trend._recent.extend(aggregates["recent"])
+        trend._emotion_counts = dict(aggregates["emotion_counts"])
+        return trend
     
     def add_reading(
         self, 
@@ -229,6 +289,9 @@ class EmotionalTrend:
             "message": message,
             "timestamp": datetime.now().isoformat(),
         })
+        self._accumulate(emotion, sentiment)
+        if self.max_history and len(self.history) > 2 * self.max_history:
+            del self.history[:-self.max_history]
     
     def get_trend(self) -> Dict[str, Any]:
         """
@@ -241,7 +304,7 @@ class EmotionalTrend:
         - risk_level: "low", "medium", "high"
         - recommendation: Suggested approach
         """
-        if len(self.history) < 2:
+        if self._count < 2:
             return {
                 "direction": "stable",
                 "average_sentiment": 0.5,
@@ -250,39 +313,29 @@ class EmotionalTrend:
                 "recommendation": "Continue building rapport",
             }
         
-        sentiments = [h["sentiment"] for h in self.history]
-        avg_sentiment = sum(sentiments) / len(sentiments)
+        avg_sentiment = self._sentiment_sum / self._count
         
         # Calculate direction from recent trend
-        recent = sentiments[-3:] if len(sentiments) >= 3 else sentiments
-        if len(recent) >= 2:
-            trend = recent[-1] - recent[0]
-            if trend > 0.2:
-                direction = "improving"
-            elif trend < -0.2:
-                direction = "declining"
-            else:
-                direction = "stable"
+        trend = self._recent[-1] - self._recent[0]
+        if trend > 0.2:
+            direction = "improving"
+        elif trend < -0.2:
+            direction = "declining"
         else:
             direction = "stable"
         
         # Calculate volatility (standard deviation)
-        if len(sentiments) > 1:
-            mean = avg_sentiment
-            variance = sum((s - mean) ** 2 for s in sentiments) / len(sentiments)
-            volatility = variance ** 0.5
-        else:
-            volatility = 0.0
+        variance = max(0.0, self._sentiment_sq_sum / self._count - avg_sentiment ** 2)
+        volatility = variance ** 0.5
         
         # Determine volatility level
         if volatility > 0.4:
             direction = "volatile"
         
         # Risk assessment
-        negative_count = sum(1 for s in sentiments if s < -0.2)
         if direction == "declining" and avg_sentiment < -0.2:
             risk_level = "high"
-        elif negative_count >= len(sentiments) * 0.5:
+        elif self._negative_count >= self._count * 0.5:
             risk_level = "high"
         elif direction == "volatile" or avg_sentiment < 0:
             risk_level = "medium"
@@ -294,7 +347,7 @@ class EmotionalTrend:
             "average_sentiment": round(avg_sentiment, 2),
             "volatility": round(volatility, 2),
             "risk_level": risk_level,
-            "reading_count": len(self.history),
+            "reading_count": self._count,
             "recommendation": self._get_emotional_recommendation(direction, risk_level),
         }
     
@@ -313,14 +366,10 @@ class EmotionalTrend:
     
     def get_average_sentiment(self) -> float:
         """Get average sentiment across conversation"""
-        if not self.history:
+        if not self._count:
             return 0.0
-        return sum(h["sentiment"] for h in self.history) / len(self.history)
+        return self._sentiment_sum / self._count
     
     def get_emotion_distribution(self) -> Dict[str, int]:
         """Get count of each emotion type"""
-        distribution = {}
-        for h in self.history:
-            emotion = h["emotion"]
-            distribution[emotion] = distribution.get(emotion, 0) + 1
-        return distribution
+        return dict(self._emotion_counts)
@@ -3,7 +3,8 @@ Domain Types and Enums
 Core type definitions used across the domain layer.
 """
 from enum import Enum
-from typing import TypedDict, List, Optional, Dict, Any
+import operator
+from typing import Annotated, TypedDict, List, Optional, Dict, Any
 from datetime import datetime
 
 
@@ -115,8 +116,8 @@ class NegotiationState(TypedDict):
     min_acceptable_terms: Dict[str, Any]
     max_concession_limit: Dict[str, Any]
     
-    # Explainability
-    agent_steps: List[AgentStep]
+    # Explainability (reducer: parallel graph branches append, never overwrite)
+    agent_steps: Annotated[List[AgentStep], operator.add]
     decision_tree: List[Dict[str, Any]]
     
     # Metrics
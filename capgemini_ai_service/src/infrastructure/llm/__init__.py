@@ -3,6 +3,18 @@ LLM Adapters Package
 Provides abstract interface and concrete implementations for LLM providers.
 """
 from src.infrastructure.llm.base import BaseLLM, LLMResponse
+from src.infrastructure.llm.client_registry import close_clients, get_chat_model
 from src.infrastructure.llm.groq_adapter import GroqAdapter
+from src.infrastructure.llm.prompt_registry import (
+    PromptRegistry,
+    format_instructions_for,
+    get_prompt_registry,
+    register_prompt,
+)
+from src.infrastructure.llm.scheduler import LLMScheduler, get_llm_scheduler
 
-__all__ = ["BaseLLM", "LLMResponse", "GroqAdapter"]
+__all__ = [
+    "BaseLLM", "LLMResponse", "GroqAdapter", "get_chat_model", "close_clients",
+    "LLMScheduler", "get_llm_scheduler",
+    "PromptRegistry", "get_prompt_registry", "register_prompt", "format_instructions_for",
+]
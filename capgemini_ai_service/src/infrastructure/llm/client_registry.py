@@ -0,0 +1,216 @@
+"""
+LLM Client Registry
+Process-wide ChatGroq clients, one per (model, temperature, max_tokens),
+all sharing a single pooled HTTP transport.
+
+Building a ChatGroq per agent (or per override) also built a new Groq SDK
+client with its own connection pool, so TCP + TLS setup landed in call
+latency. Here connections are kept alive and reused across agents, and
+HTTP/2 multiplexes concurrent calls when the `h2` package is available.
+
+Async calls of registered clients go through the process-wide LLMScheduler
+(rate budgets, priorities, 429 handling), so the SDK's own retries are off.
+"""
+import importlib.util
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_groq import ChatGroq
+
+from config.settings import settings
+from src.infrastructure.llm.scheduler import get_llm_scheduler, priority_for
+from src.infrastructure.monitoring import llm_metrics_callback
+
+ClientKey = Tuple[str, float, int, str]  # (model, temperature, max_tokens, api_key)
+
+_lock = threading.Lock()
+_clients: Dict[ClientKey, ChatGroq] = {}
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+
+
+class PooledChatGroq(ChatGroq):
+    """
+    ChatGroq bound to the registry's shared pool. Agents keep their client for
+    the life of the process, so once close_clients() has closed the pool the
+    next call rebinds to a fresh one instead of failing on a closed client.
+    """
+
+    def _ensure_pool(self) -> None:
+        if self.http_client.is_closed or self.http_async_client.is_closed:
+            self.http_client, self.http_async_client = get_http_clients()
+            # Rebuild the Groq SDK clients around the new pool
+            self.client = self.async_client = None
+            self.validate_environment()
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        self._ensure_pool()
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        self._ensure_pool()
+        return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        self._ensure_pool()
+        return super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        self._ensure_pool()
+        async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            yield chunk
+
+
+class ScheduledChatGroq(PooledChatGroq):
+    """
+    ChatGroq whose async calls are admitted by the LLMScheduler.
+    The priority comes from the prompt type in the run metadata (see llm_config).
+    """
+
+    def _schedule(self, messages: List[BaseMessage], run_manager: Any) -> Tuple[int, float]:
+        metadata = getattr(run_manager, "metadata", None) or {}
+        prompt_chars = sum(len(str(m.content)) for m in messages)
+        # ~4 characters per token, plus the worst-case completion
+        return priority_for(metadata.get("prompt_type")), prompt_chars / 4 + (self.max_tokens or 0)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        priority, tokens = self._schedule(messages, run_manager)
+        return await get_llm_scheduler().run(
+            lambda: PooledChatGroq._agenerate(self, messages, stop=stop, run_manager=run_manager, **kwargs),
+            priority=priority,
+            tokens=tokens,
+            usage=lambda result: ((result.llm_output or {}).get("token_usage") or {}).get("total_tokens"),
+        )
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        scheduler = get_llm_scheduler()
+        priority, tokens = self._schedule(messages, run_manager)
+        attempt = 0
+        while True:
+            await scheduler.acquire(priority, tokens)
+            emitted = False
+            try:
+                async for chunk in PooledChatGroq._astream(self, messages, stop=stop, run_manager=run_manager, **kwargs):
+                    emitted = True
+                    yield chunk
+                return
+            except Exception as e:
+                # Only retry while nothing has been streamed to the caller yet
+                if emitted or not await scheduler.backoff(e, attempt, tokens):
+                    raise
+                attempt += 1
+
+
+def _http2_enabled() -> bool:
+    return settings.llm_http2 and importlib.util.find_spec("h2") is not None
+
+
+def _pool_options() -> Dict[str, Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections,
+            keepalive_expiry=settings.llm_keepalive_expiry,
+        ),
+        "http2": _http2_enabled(),
+    }
+
+
+def get_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """Shared sync/async HTTP clients backing every registered LLM client"""
+    global _http_client, _http_async_client
+
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(**_pool_options())
+        if _http_async_client is None:
+            _http_async_client = httpx.AsyncClient(**_pool_options())
+        return _http_client, _http_async_client
+
+
+def get_chat_model(
+    model_name: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    api_key: Optional[str] = None,
+) -> ChatGroq:
+    """
+    Get the shared ChatGroq client for this configuration.
+    Defaults come from settings (DEFAULT_MODEL, TEMPERATURE, MAX_TOKENS, GROQ_API_KEY).
+    """
+    key = (
+        model_name or settings.default_model,
+        settings.temperature if temperature is None else temperature,
+        max_tokens or settings.max_tokens,
+        api_key or settings.groq_api_key,
+    )
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    http_client, http_async_client = get_http_clients()
+    model_class = ScheduledChatGroq if settings.llm_scheduler_enabled else PooledChatGroq
+    with _lock:
+        if key not in _clients:
+            _clients[key] = model_class(
+                groq_api_key=key[3],
+                model_name=key[0],
+                temperature=key[1],
+                max_tokens=key[2],
+                http_client=http_client,
+                http_async_client=http_async_client,
+                callbacks=[llm_metrics_callback],
+                # Retries are the scheduler's job (it knows about the shared quota)
+                max_retries=0 if settings.llm_scheduler_enabled else 2,
+            )
+        return _clients[key]
+
+
+async def close_clients() -> None:
+    """
+    Close the shared connection pool (application shutdown).
+    Clients still held by agents reopen a pool on their next call.
+    """
+    global _http_client, _http_async_client
+
+    with _lock:
+        http_client, http_async_client = _http_client, _http_async_client
+        _http_client = _http_async_client = None
+        _clients.clear()
+
+    if http_async_client is not None:
+        await http_async_client.aclose()
+    if http_client is not None:
+        http_client.close()
+
+
+def registry_stats() -> Dict[str, Any]:
+    """Registered client configurations and pool settings"""
+    return {
+        "clients": [
+            {"model": model, "temperature": temperature, "max_tokens": max_tokens}
+            for model, temperature, max_tokens, _ in _clients
+        ],
+        "http2": _http2_enabled(),
+        "max_connections": settings.llm_max_connections,
+    }
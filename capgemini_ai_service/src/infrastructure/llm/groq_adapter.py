@@ -4,6 +4,7 @@ Implements BaseLLM interface using Groq's ultra-fast inference API.
 """
 import json
 import asyncio
+import random
 from typing import Any, Dict, List, Optional, Type, TypeVar
 from dataclasses import dataclass, field
 
@@ -13,6 +14,9 @@ from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel
 
 from src.infrastructure.llm.base import BaseLLM, LLMResponse
+from src.infrastructure.llm.client_registry import ScheduledChatGroq, get_chat_model
+from src.infrastructure.llm.prompt_registry import format_instructions_for
+from src.infrastructure.llm.scheduler import retry_after_seconds
 from config.settings import settings
 
 T = TypeVar("T", bound=BaseModel)
@@ -62,12 +66,12 @@ class GroqAdapter(BaseLLM):
         self._max_retries = max_retries
         self._usage = UsageTracker()
         
-        # Initialize LangChain ChatGroq
-        self._client = ChatGroq(
-            groq_api_key=self._api_key,
+        # Shared LangChain ChatGroq (pooled connections)
+        self._client = get_chat_model(
             model_name=self._model_name,
             temperature=self._temperature,
             max_tokens=self._max_tokens,
+            api_key=self._api_key,
         )
     
     @property
@@ -113,7 +117,7 @@ class GroqAdapter(BaseLLM):
     ) -> T:
         """Send prompt and parse into Pydantic model"""
         parser = JsonOutputParser(pydantic_object=response_schema)
-        format_instructions = parser.get_format_instructions()
+        format_instructions = format_instructions_for(response_schema)
         
         enhanced_prompt = f"{prompt}\n\n{format_instructions}"
         
@@ -184,19 +188,23 @@ class GroqAdapter(BaseLLM):
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
     ) -> ChatGroq:
-        """Create client with optional parameter overrides"""
+        """Get the shared client for optional parameter overrides"""
         if temperature is None and max_tokens is None:
             return self._client
         
-        return ChatGroq(
-            groq_api_key=self._api_key,
+        return get_chat_model(
             model_name=self._model_name,
             temperature=temperature or self._temperature,
             max_tokens=max_tokens or self._max_tokens,
+            api_key=self._api_key,
         )
     
     async def _invoke_with_retry(self, client: ChatGroq, messages: list) -> Any:
         """Invoke with exponential backoff retry"""
+        if isinstance(client, ScheduledChatGroq):
+            # Budgets, Retry-After and backoff are handled by the shared scheduler
+            return await client.ainvoke(messages)
+        
         last_error = None
         
         for attempt in range(self._max_retries):
@@ -205,8 +213,8 @@ class GroqAdapter(BaseLLM):
             except Exception as e:
                 last_error = e
                 if attempt < self._max_retries - 1:
-                    wait_time = (2 ** attempt) * 0.5  # 0.5s, 1s, 2s
-                    await asyncio.sleep(wait_time)
+                    wait_time = retry_after_seconds(e) or (2 ** attempt) * 0.5  # 0.5s, 1s, 2s
+                    await asyncio.sleep(wait_time + random.uniform(0, 0.25))
         
         raise last_error
     
@@ -0,0 +1,90 @@
+"""
+Prompt Registry
+Process-wide ChatPromptTemplates, parsed once instead of on every call.
+
+Agents keep their template text as module constants (static instructions
+only, everything that varies per turn is a template variable) and register
+it at init. Parser format instructions are computed once and bound as a
+partial variable, so a registered prompt is a fixed prefix plus inputs,
+which also lets provider-side prompt prefix caching kick in.
+"""
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Type
+
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel
+
+
+@lru_cache(maxsize=None)
+def format_instructions_for(schema: Type[BaseModel]) -> str:
+    """JSON format instructions of a pydantic schema (computed once per schema)"""
+    return JsonOutputParser(pydantic_object=schema).get_format_instructions()
+
+
+class PromptRegistry:
+    """Named prompt templates; registering an existing name returns the first one"""
+
+    def __init__(self):
+        self._prompts: Dict[str, ChatPromptTemplate] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        template: str,
+        parser: Optional[JsonOutputParser] = None,
+        **partials: Any,
+    ) -> ChatPromptTemplate:
+        """
+        Build (once) and return the prompt `name`.
+        With `parser`, its format instructions fill {format_instructions}.
+        """
+        prompt = self._prompts.get(name)
+        if prompt is not None:
+            return prompt
+
+        with self._lock:
+            if name not in self._prompts:
+                prompt = ChatPromptTemplate.from_template(template)
+                if parser is not None:
+                    partials["format_instructions"] = parser.get_format_instructions()
+                if partials:
+                    prompt = prompt.partial(**partials)
+                self._prompts[name] = prompt
+            return self._prompts[name]
+
+    def get(self, name: str) -> ChatPromptTemplate:
+        """Registered prompt (KeyError if the owning agent was never built)"""
+        return self._prompts[name]
+
+    def names(self) -> List[str]:
+        return sorted(self._prompts)
+
+    def stats(self) -> Dict[str, List[str]]:
+        """Input variables of every registered prompt"""
+        return {name: list(prompt.input_variables) for name, prompt in sorted(self._prompts.items())}
+
+
+# Singleton instance
+_registry_instance: Optional[PromptRegistry] = None
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Process-wide prompt registry"""
+    global _registry_instance
+
+    if _registry_instance is None:
+        _registry_instance = PromptRegistry()
+    return _registry_instance
+
+
+def register_prompt(
+    name: str,
+    template: str,
+    parser: Optional[JsonOutputParser] = None,
+    **partials: Any,
+) -> ChatPromptTemplate:
+    """Shortcut for get_prompt_registry().register(...)"""
+    return get_prompt_registry().register(name, template, parser, **partials)
@@ -0,0 +1,270 @@
+"""
+LLM Request Scheduler
+Client-side admission control for Groq calls, shared by every agent in the process.
+
+- Token buckets for requests/min and tokens/min, refilled continuously
+- Priority queue: negotiation replies and turn analysis go before profiling,
+  matching and valuation, which go before creative deal naming
+- 429s pause the whole scheduler until Retry-After (plus jitter), then the
+  call is retried; transient 5xx/connection errors retry with jittered backoff
+
+Token usage is estimated up front (prompt size + max_tokens) and reconciled
+with the real usage once the answer arrives.
+"""
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from config.settings import settings
+from src.infrastructure.monitoring import (
+    LLM_SCHEDULER_QUEUE,
+    LLM_SCHEDULER_WAIT,
+    is_rate_limit_error,
+)
+
+T = TypeVar("T")
+
+# Lower value = served first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+PROMPT_PRIORITIES: Dict[str, int] = {
+    "negotiation_reply": PRIORITY_HIGH,
+    "turn_analysis": PRIORITY_HIGH,
+    "emotion": PRIORITY_HIGH,
+    "intent": PRIORITY_HIGH,
+    "profiling": PRIORITY_NORMAL,
+    "inventory_match": PRIORITY_NORMAL,
+    "valuation_analysis": PRIORITY_NORMAL,
+    "valuation_batch_analysis": PRIORITY_LOW,
+    "deal_naming": PRIORITY_LOW,
+}
+
+PRIORITY_NAMES = {PRIORITY_HIGH: "high", PRIORITY_NORMAL: "normal", PRIORITY_LOW: "low"}
+
+
+def priority_for(prompt_type: Optional[str]) -> int:
+    """Scheduling priority of a prompt type (see llm_config)"""
+    return PROMPT_PRIORITIES.get(prompt_type or "", PRIORITY_NORMAL)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Retry-After hint of a provider error, if any"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except ValueError:
+            continue
+    return None
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Server-side or network failures worth retrying"""
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status >= 500
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+class TokenBucket:
+    """Continuously refilled bucket; a capacity of 0 means unlimited"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (requests above capacity only wait for a full bucket)"""
+        if self.capacity <= 0:
+            return 0.0
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        if self.capacity > 0:
+            self._refill()
+            self.level -= amount
+
+    def give_back(self, amount: float) -> None:
+        """Reconcile an estimate; negative amounts record extra usage as debt"""
+        if self.capacity > 0:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+
+
+class LLMScheduler:
+    """Admits LLM calls within the request/token budgets, highest priority first"""
+
+    def __init__(
+        self,
+        requests_per_minute: float = 30,
+        tokens_per_minute: float = 6000,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_jitter: float = 0.25,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_jitter = max_jitter
+        self._paused_until = 0.0
+        self._waiters: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._condition: Optional[asyncio.Condition] = None
+        self._stats = {"admitted": 0, "rate_limited": 0, "retried": 0}
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Condition of the running loop (asyncio primitives cannot cross loops)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._condition = asyncio.Condition()
+            self._waiters = []
+        return self._condition
+
+    def _jitter(self) -> float:
+        return random.uniform(0, self.max_jitter)
+
+    def _time_until_admitted(self, tokens: float) -> float:
+        pause = max(0.0, self._paused_until - time.monotonic())
+        return max(pause, self.requests.time_until(1), self.tokens.time_until(tokens))
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL, tokens: float = 0) -> None:
+        """Wait for this call's turn and budget, then consume it"""
+        entry = (priority, next(self._sequence))
+        start = time.perf_counter()
+        condition = self._get_condition()
+        async with condition:
+            heapq.heappush(self._waiters, entry)
+            LLM_SCHEDULER_QUEUE.set(len(self._waiters))
+            try:
+                while True:
+                    timeout = None
+                    if self._waiters[0] == entry:
+                        timeout = self._time_until_admitted(tokens)
+                        if timeout <= 0:
+                            break
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                # Leave the queue on admission and on cancellation alike
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                LLM_SCHEDULER_QUEUE.set(len(self._waiters))
+                condition.notify_all()
+
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self._stats["admitted"] += 1
+
+        LLM_SCHEDULER_WAIT.labels(priority=PRIORITY_NAMES.get(priority, str(priority))).observe(
+            time.perf_counter() - start
+        )
+
+    def record_usage(self, estimated: float, actual: Optional[float]) -> None:
+        """Correct the token bucket once the real usage is known"""
+        if actual is not None:
+            self.tokens.give_back(estimated - actual)
+
+    async def backoff(self, error: BaseException, attempt: int, tokens: float = 0) -> bool:
+        """
+        Handle a failed call: pause on 429 (honoring Retry-After), back off on
+        transient errors. Returns False when the call should not be retried.
+        """
+        # A failed call produced no tokens, and one that never reached the
+        # provider (no HTTP status) did not use a request either
+        self.tokens.give_back(tokens)
+        if getattr(error, "status_code", None) is None:
+            self.requests.give_back(1)
+
+        rate_limited = is_rate_limit_error(error)
+        if attempt >= self.max_retries or not (rate_limited or is_transient_error(error)):
+            return False
+
+        delay = self.base_delay * (2 ** attempt)
+        if rate_limited:
+            self._stats["rate_limited"] += 1
+            delay = retry_after_seconds(error) or delay
+            # Everyone waits: the provider quota is shared by the whole process
+            self._paused_until = max(self._paused_until, time.monotonic() + delay + self._jitter())
+            condition = self._get_condition()
+            async with condition:
+                condition.notify_all()
+        else:
+            await asyncio.sleep(delay + self._jitter())
+
+        self._stats["retried"] += 1
+        return True
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        priority: int = PRIORITY_NORMAL,
+        tokens: float = 0,
+        usage: Optional[Callable[[T], Optional[float]]] = None,
+    ) -> T:
+        """Run `call` under the budgets, retrying 429s and transient errors"""
+        attempt = 0
+        while True:
+            await self.acquire(priority, tokens)
+            try:
+                result = await call()
+            except Exception as e:
+                if not await self.backoff(e, attempt, tokens):
+                    raise
+                attempt += 1
+                continue
+            if usage is not None:
+                self.record_usage(tokens, usage(result))
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Budget levels and counters"""
+        return {
+            **self._stats,
+            "queued": len(self._waiters),
+            "requests_available": round(self.requests.level, 1),
+            "tokens_available": round(self.tokens.level, 1),
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 2),
+        }
+
+
+# Singleton instance
+_scheduler_instance: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Process-wide scheduler configured from settings"""
+    global _scheduler_instance
+
+    if _scheduler_instance is None:
+        # Groq budgets are per account: each worker process gets an equal share
+        workers = max(1, settings.web_concurrency)
+        _scheduler_instance = LLMScheduler(
+            requests_per_minute=settings.llm_requests_per_minute / workers,
+            tokens_per_minute=settings.llm_tokens_per_minute / workers,
+            max_retries=settings.llm_max_retries,
+            base_delay=settings.llm_retry_base_delay,
+        )
+    return _scheduler_instance
@@ -0,0 +1,59 @@
+"""
+Monitoring Infrastructure
+Prometheus metrics for endpoints, agents, LLM calls and stores.
+"""
+from src.infrastructure.monitoring.prometheus import (
+    ACTIVE_SESSIONS,
+    AGENT_NODE_DURATION,
+    BUDGET_SOLUTIONS,
+    CACHE_ENTRIES,
+    FALLBACKS,
+    HTTP_REQUEST_DURATION,
+    INTENT_CLASSIFICATIONS,
+    INVENTORY_RELOAD_DURATION,
+    INVENTORY_SNAPSHOT_SIZE,
+    INVENTORY_SNAPSHOT_VERSION,
+    JSON_PARSE_FAILURES,
+    LLM_CALL_DURATION,
+    LLM_RATE_LIMITED,
+    LLM_SCHEDULER_QUEUE,
+    LLM_SCHEDULER_WAIT,
+    LLM_TOKENS,
+    SESSION_EVICTIONS,
+    http_metrics_middleware,
+    is_rate_limit_error,
+    llm_config,
+    llm_metrics_callback,
+    mark_worker_dead,
+    observe_session_op,
+    render_latest,
+    track_duration,
+)
+
+__all__ = [
+    "ACTIVE_SESSIONS",
+    "AGENT_NODE_DURATION",
+    "BUDGET_SOLUTIONS",
+    "CACHE_ENTRIES",
+    "FALLBACKS",
+    "HTTP_REQUEST_DURATION",
+    "INTENT_CLASSIFICATIONS",
+    "INVENTORY_RELOAD_DURATION",
+    "INVENTORY_SNAPSHOT_SIZE",
+    "INVENTORY_SNAPSHOT_VERSION",
+    "JSON_PARSE_FAILURES",
+    "LLM_CALL_DURATION",
+    "LLM_RATE_LIMITED",
+    "LLM_SCHEDULER_QUEUE",
+    "LLM_SCHEDULER_WAIT",
+    "LLM_TOKENS",
+    "SESSION_EVICTIONS",
+    "http_metrics_middleware",
+    "is_rate_limit_error",
+    "llm_config",
+    "llm_metrics_callback",
+    "mark_worker_dead",
+    "observe_session_op",
+    "render_latest",
+    "track_duration",
+]
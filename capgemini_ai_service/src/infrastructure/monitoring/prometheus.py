@@ -0,0 +1,263 @@
+"""
+Prometheus Instrumentation
+Every metric of the service is declared here, so dashboards have one source of truth.
+
+Multi-worker deployments: set PROMETHEUS_MULTIPROC_DIR to an empty, writable
+directory before the workers start. Each worker then writes its samples there
+and `render_latest()` aggregates all of them. Gauges use "live" modes: a worker
+that shuts down cleanly drops out via `mark_worker_dead()` (main.py shutdown
+hook), while one that crashes keeps reporting its last values until the
+directory is wiped on the next start (`make serve-prod` does).
+"""
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+
+# ============ Metrics ============
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by endpoint",
+    ["method", "endpoint", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+AGENT_NODE_DURATION = Histogram(
+    "agent_node_duration_seconds",
+    "Latency of each agent pipeline stage / orchestrator node",
+    ["agent", "node"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_CALL_DURATION = Histogram(
+    "llm_call_duration_seconds",
+    "Latency of a single LLM call",
+    ["prompt_type", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Histogram(
+    "llm_tokens_per_call",
+    "Tokens consumed per LLM call",
+    ["prompt_type", "kind"],
+    buckets=TOKEN_BUCKETS,
+)
+LLM_ERRORS = Counter(
+    "llm_errors_total",
+    "LLM calls that raised",
+    ["prompt_type"],
+)
+LLM_RATE_LIMITED = Counter(
+    "llm_rate_limited_total",
+    "LLM calls rejected with HTTP 429",
+    ["prompt_type"],
+)
+LLM_SCHEDULER_WAIT = Histogram(
+    "llm_scheduler_wait_seconds",
+    "Time an LLM call waited for its rate-limit budget",
+    ["priority"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_SCHEDULER_QUEUE = Gauge(
+    "llm_scheduler_queue_depth",
+    "LLM calls waiting for their rate-limit budget",
+    multiprocess_mode="livesum",
+)
+FALLBACKS = Counter(
+    "agent_fallbacks_total",
+    "Deterministic fallbacks used instead of an LLM answer",
+    ["component"],
+)
+JSON_PARSE_FAILURES = Counter(
+    "llm_json_parse_failures_total",
+    "LLM answers that could not be parsed as JSON",
+    ["component"],
+)
+SESSION_STORE_DURATION = Histogram(
+    "session_store_operation_duration_seconds",
+    "Session store operation latency",
+    ["backend", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+ACTIVE_SESSIONS = Gauge(
+    "active_sessions",
+    "Sessions held by the in-memory session store",
+    multiprocess_mode="livesum",
+)
+INTENT_CLASSIFICATIONS = Counter(
+    "intent_classifications_total",
+    "Customer turns whose intent was classified, by classifier",
+    ["source"],  # rules | llm
+)
+BUDGET_SOLUTIONS = Counter(
+    "negotiation_budget_solutions_total",
+    "Concessions solved directly from the customer's stated budget",
+    ["outcome"],  # met | infeasible
+)
+SESSION_EVICTIONS = Counter(
+    "session_evictions_total",
+    "Sessions dropped by the in-memory session store",
+    ["reason"],  # expired | capacity
+)
+CACHE_ENTRIES = Gauge(
+    "cache_entries",
+    "Entries held by in-process caches",
+    ["cache"],
+    multiprocess_mode="livesum",
+)
+INVENTORY_RELOAD_DURATION = Histogram(
+    "inventory_reload_duration_seconds",
+    "Time to read, parse and index the inventory file",
+    buckets=LATENCY_BUCKETS,
+)
+INVENTORY_SNAPSHOT_VERSION = Gauge(
+    "inventory_snapshot_version",
+    "Version of the inventory snapshot currently served",
+    multiprocess_mode="livemax",
+)
+INVENTORY_SNAPSHOT_SIZE = Gauge(
+    "inventory_snapshot_vehicles",
+    "Number of vehicles in the inventory snapshot currently served",
+    multiprocess_mode="livemax",
+)
+
+
+# ============ Helpers ============
+
+@contextmanager
+def track_duration(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Observe the duration of a block (also on error)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+def observe_session_op(operation: str) -> Callable:
+    """Decorator timing an async session store method, labelled by store class"""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            with track_duration(SESSION_STORE_DURATION, backend=type(self).__name__, operation=operation):
+                return await func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def http_metrics_middleware(request: Any, call_next: Callable) -> Any:
+    """
+    ASGI HTTP middleware observing request latency.
+    The endpoint label is the route template ("/ai/session/{session_id}"),
+    never the raw path, to keep label cardinality bounded.
+    """
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.labels(
+            method=request.method,
+            endpoint=getattr(route, "path", "unmatched"),
+            status=str(status),
+        ).observe(time.perf_counter() - start)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """True for Groq/HTTP 429 errors"""
+    return getattr(error, "status_code", None) == 429 or "429" in str(error)
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """
+    LangChain callback recording latency, tokens, errors and 429s of every chat-model call.
+
+    The prompt type label comes from the run metadata, e.g.:
+        chain.ainvoke(inputs, config={"metadata": {"prompt_type": "emotion"}})
+    """
+
+    def __init__(self):
+        self._runs: Dict[UUID, Tuple[float, str, str]] = {}
+
+    def _start(self, run_id: UUID, serialized: Optional[Dict[str, Any]], metadata: Optional[Dict[str, Any]]) -> None:
+        metadata = metadata or {}
+        model = metadata.get("ls_model_name") or (serialized or {}).get("kwargs", {}).get("model_name") or "unknown"
+        self._runs[run_id] = (time.perf_counter(), metadata.get("prompt_type", "unknown"), model)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs) -> None:
+        self._start(run_id, serialized, metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, metadata=None, **kwargs) -> None:
+        self._start(run_id, serialized, metadata)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs) -> None:
+        start, prompt_type, model = self._runs.pop(run_id, (None, "unknown", "unknown"))
+        if start is not None:
+            LLM_CALL_DURATION.labels(prompt_type=prompt_type, model=model).observe(time.perf_counter() - start)
+
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if not usage and response.generations and response.generations[0]:
+            message = getattr(response.generations[0][0], "message", None)
+            usage_metadata = getattr(message, "usage_metadata", None) or {}
+            usage = {
+                "prompt_tokens": usage_metadata.get("input_tokens"),
+                "completion_tokens": usage_metadata.get("output_tokens"),
+            }
+        for kind in ("prompt", "completion"):
+            tokens = usage.get(f"{kind}_tokens")
+            if tokens:
+                LLM_TOKENS.labels(prompt_type=prompt_type, kind=kind).observe(tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        start, prompt_type, model = self._runs.pop(run_id, (None, "unknown", "unknown"))
+        if start is not None:
+            LLM_CALL_DURATION.labels(prompt_type=prompt_type, model=model).observe(time.perf_counter() - start)
+        LLM_ERRORS.labels(prompt_type=prompt_type).inc()
+        if is_rate_limit_error(error):
+            LLM_RATE_LIMITED.labels(prompt_type=prompt_type).inc()
+
+
+# Shared handler: attach to every chat model via `callbacks=[llm_metrics_callback]`
+llm_metrics_callback = LLMMetricsCallback()
+
+
+def llm_config(prompt_type: str) -> Dict[str, Any]:
+    """Runnable config labelling an LLM call for the metrics above"""
+    return {"metadata": {"prompt_type": prompt_type}}
+
+
+def mark_worker_dead(pid: Optional[int] = None) -> None:
+    """Remove a worker's live gauges from the multiprocess directory (no-op for a single worker)"""
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        multiprocess.mark_process_dead(pid or os.getpid(), path)
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Exposition payload; aggregates all workers in multiprocess mode"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -4,7 +4,10 @@ Abstract interfaces and implementations for data access.
 """
 from src.infrastructure.repositories.base import InventoryRepository, SessionRepository
 from src.infrastructure.repositories.inventory import JSONFileInventoryRepository, get_inventory_repository
+from src.infrastructure.repositories.inventory_index import InventoryIndex
+from src.infrastructure.repositories.serialization import decode_session, encode_session
 from src.infrastructure.repositories.session import (
+    AppendLogRedisSessionStore,
     InMemorySessionStore,
     RedisSessionStore,
     get_session_store,
@@ -14,8 +17,12 @@ __all__ = [
     "InventoryRepository",
     "SessionRepository",
     "JSONFileInventoryRepository",
+    "InventoryIndex",
     "InMemorySessionStore",
     "RedisSessionStore",
+    "AppendLogRedisSessionStore",
     "get_inventory_repository",
     "get_session_store",
+    "encode_session",
+    "decode_session",
 ]
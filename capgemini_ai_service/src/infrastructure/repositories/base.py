@@ -97,6 +97,10 @@ class SessionRepository(ABC):
         """List active sessions, optionally filtered by customer"""
         pass
     
+    async def get_full(self, session_id: str) -> Optional[Any]:
+        """Get a session with its complete history (get() may load a recent window only)"""
+        return await self.get(session_id)
+    
     async def exists(self, session_id: str) -> bool:
         """Check if session exists"""
         return await self.get(session_id) is not None
@@ -1,15 +1,14 @@
 """
 JSON File Inventory Repository
-Production-grade file-based implementation with async I/O and caching.
+Production-grade file-based implementation with async I/O, hot-reloaded
+snapshots (see inventory_snapshot.py) and an in-memory index (see inventory_index.py).
 """
-import json
-import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import aiofiles
-
+from config.settings import settings
 from src.infrastructure.repositories.base import InventoryRepository
+from src.infrastructure.repositories.inventory_snapshot import InventorySnapshotLoader
 
 
 class JSONFileInventoryRepository(InventoryRepository):
@@ -18,45 +17,21 @@ class JSONFileInventoryRepository(InventoryRepository):
     
     Features:
     - Async I/O to prevent event loop blocking
-    - In-memory caching with TTL
+    - Hot reload: file mtime/size polling, background rebuild, atomic swap
     - Lazy loading (only reads file when needed)
+    - Indexed lookups (O(1) by ID, bisect range filters)
     """
     
-    def __init__(self, file_path: Path, cache_ttl_seconds: int = 300):
+    def __init__(self, file_path: Path, poll_interval_seconds: float = None):
         self.file_path = file_path
-        self._cache: Optional[List[Dict[str, Any]]] = None
-        self._last_loaded: float = 0
-        self._cache_ttl = cache_ttl_seconds
+        self._loader = InventorySnapshotLoader(
+            file_path,
+            poll_interval=settings.inventory_poll_interval if poll_interval_seconds is None else poll_interval_seconds
+        )
     
-    async def _load(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
-        """
-        Lazy async load with caching.
-        
-        Args:
-            force_refresh: If True, bypass cache and reload from file
-        """
-        now = time.time()
-        
-        # Return cached data if valid
-        if not force_refresh and self._cache is not None:
-            if now - self._last_loaded < self._cache_ttl:
-                return self._cache
-        
-        try:
-            async with aiofiles.open(self.file_path, mode='r', encoding='utf-8') as f:
-                content = await f.read()
-                self._cache = json.loads(content)
-                self._last_loaded = now
-                return self._cache
-        except FileNotFoundError:
-            print(f"Warning: Inventory file not found at {self.file_path}")
-            return []
-        except json.JSONDecodeError as e:
-            print(f"Error parsing inventory JSON: {e}")
-            return []
-        except Exception as e:
-            print(f"Error loading inventory: {e}")
-            return []
+    async def _load(self) -> List[Dict[str, Any]]:
+        """Vehicles of the current snapshot (first call loads the file)"""
+        return (await self._loader.current()).vehicles
     
     async def get_all_vehicles(self) -> List[Dict[str, Any]]:
         """Get all vehicles in inventory"""
@@ -64,16 +39,8 @@ class JSONFileInventoryRepository(InventoryRepository):
     
     async def get_vehicle_by_id(self, vehicle_id: str) -> Optional[Dict[str, Any]]:
         """Get vehicle by ID, VIN, or _id (MongoDB format)"""
-        inventory = await self._load()
-        vehicle_id_str = str(vehicle_id)
-        
-        for car in inventory:
-            # Handle various ID formats
-            cid = str(car.get('_id') or car.get('id') or car.get('vin') or '')
-            if cid == vehicle_id_str:
-                return car
-        
-        return None
+        snapshot = await self._loader.current()
+        return snapshot.index.get(vehicle_id)
     
     async def search_vehicles(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -88,53 +55,16 @@ class JSONFileInventoryRepository(InventoryRepository):
         - fuel_type: Fuel type (from specifications)
         - min_seats: Minimum number of seats
         """
-        inventory = await self._load()
-        results = []
-        
-        for car in inventory:
-            match = True
-            price = car.get('price', 0)
-            
-            # Price filters
-            if "max_price" in criteria:
-                if price > criteria['max_price']:
-                    match = False
-            if "min_price" in criteria:
-                if price < criteria['min_price']:
-                    match = False
-            
-            # Make filter
-            if "make" in criteria:
-                if car.get('make', '').lower() != criteria['make'].lower():
-                    match = False
-            
-            # Year filters
-            year = car.get('year', 0)
-            if "min_year" in criteria:
-                if year < criteria['min_year']:
-                    match = False
-            if "max_year" in criteria:
-                if year > criteria['max_year']:
-                    match = False
-            
-            # Specification filters
-            specs = car.get('specifications', {})
-            if "fuel_type" in criteria:
-                if specs.get('fuelType', '').lower() != criteria['fuel_type'].lower():
-                    match = False
-            if "min_seats" in criteria:
-                if specs.get('seats', 0) < criteria['min_seats']:
-                    match = False
-            
-            if match:
-                results.append(car)
-        
-        return results
+        snapshot = await self._loader.current()
+        return snapshot.index.search(criteria)
     
     def invalidate_cache(self):
         """Force cache invalidation"""
-        self._cache = None
-        self._last_loaded = 0
+        self._loader.invalidate()
+    
+    def snapshot_stats(self) -> Dict[str, Any]:
+        """Current snapshot version and last reload duration"""
+        return self._loader.stats()
 
 
 # Singleton instance
@@ -0,0 +1,100 @@
+"""
+In-Memory Inventory Index
+Built once per inventory load so lookups no longer scan the whole stock.
+
+- Hash map by id / _id / vin: O(1) lookups
+- Sorted price and year arrays: range filters via bisect, O(log n + k)
+- Inverted indexes for make, fuelType and seats: equality filters in O(k)
+
+Multi-criteria searches intersect the candidate sets, smallest first.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class InventoryIndex:
+    """Immutable index over one snapshot of the inventory"""
+
+    def __init__(self, vehicles: List[Dict[str, Any]]):
+        self.vehicles = vehicles
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_make: Dict[str, Set[int]] = {}
+        self._by_fuel: Dict[str, Set[int]] = {}
+        self._by_seats: Dict[int, Set[int]] = {}
+
+        prices: List[Tuple[float, int]] = []
+        years: List[Tuple[int, int]] = []
+
+        for pos, car in enumerate(vehicles):
+            # Every ID format resolves (Mongo _id, demo id, VIN); first one wins
+            for id_field in ("_id", "id", "vin"):
+                if car.get(id_field):
+                    self._by_id.setdefault(str(car[id_field]), car)
+
+            specs = car.get("specifications") or {}
+            self._by_make.setdefault((car.get("make") or "").lower(), set()).add(pos)
+            self._by_fuel.setdefault((specs.get("fuelType") or "").lower(), set()).add(pos)
+            self._by_seats.setdefault(specs.get("seats") or 0, set()).add(pos)
+
+            prices.append((car.get("price") or 0, pos))
+            years.append((car.get("year") or 0, pos))
+
+        prices.sort()
+        years.sort()
+        self._price_keys = [p for p, _ in prices]
+        self._price_pos = [pos for _, pos in prices]
+        self._year_keys = [y for y, _ in years]
+        self._year_pos = [pos for _, pos in years]
+
+    def __len__(self) -> int:
+        return len(self.vehicles)
+
+    def get(self, vehicle_id: str) -> Optional[Dict[str, Any]]:
+        """Get vehicle by ID, VIN, or _id"""
+        return self._by_id.get(str(vehicle_id))
+
+    @staticmethod
+    def _range(keys: List[Any], positions: List[int], low: Any = None, high: Any = None) -> Set[int]:
+        start = bisect_left(keys, low) if low is not None else 0
+        end = bisect_right(keys, high) if high is not None else len(keys)
+        return set(positions[start:end])
+
+    def search(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Search vehicles by criteria, results in inventory order.
+
+        Supported filters:
+        - max_price / min_price: Price range
+        - make: Vehicle make (case-insensitive)
+        - min_year / max_year: Model year range
+        - fuel_type: Fuel type (from specifications)
+        - min_seats: Minimum number of seats
+        """
+        candidates: List[Set[int]] = []
+
+        if "min_price" in criteria or "max_price" in criteria:
+            candidates.append(self._range(
+                self._price_keys, self._price_pos,
+                criteria.get("min_price"), criteria.get("max_price")
+            ))
+        if "min_year" in criteria or "max_year" in criteria:
+            candidates.append(self._range(
+                self._year_keys, self._year_pos,
+                criteria.get("min_year"), criteria.get("max_year")
+            ))
+        if "make" in criteria:
+            candidates.append(self._by_make.get(criteria["make"].lower(), set()))
+        if "fuel_type" in criteria:
+            candidates.append(self._by_fuel.get(criteria["fuel_type"].lower(), set()))
+        if "min_seats" in criteria:
+            candidates.append(set().union(*(
+                positions for seats, positions in self._by_seats.items()
+                if seats >= criteria["min_seats"]
+            )))
+
+        if not candidates:
+            return list(self.vehicles)
+
+        candidates.sort(key=len)
+        matched = candidates[0].intersection(*candidates[1:])
+        return [self.vehicles[pos] for pos in sorted(matched)]
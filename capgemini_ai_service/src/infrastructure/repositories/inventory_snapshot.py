@@ -0,0 +1,147 @@
+"""
+Hot-Reloading Inventory Snapshots
+Keeps an immutable (vehicles + index) snapshot of the inventory file and
+replaces it when the file changes on disk.
+
+- Change detection: os.stat mtime/size, polled at most every `poll_interval`
+- Rebuild: read + parse + index in the background, off the event loop
+- Swap: the snapshot reference is replaced in one assignment, so readers
+  never block on a reload and never observe a half-built index
+"""
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiofiles
+
+from src.infrastructure.logging import get_logger
+from src.infrastructure.monitoring import (
+    INVENTORY_RELOAD_DURATION,
+    INVENTORY_SNAPSHOT_SIZE,
+    INVENTORY_SNAPSHOT_VERSION,
+)
+from src.infrastructure.repositories.inventory_index import InventoryIndex
+
+logger = get_logger(__name__)
+
+FileSignature = Tuple[int, int]  # (mtime_ns, size)
+
+
+@dataclass(frozen=True)
+class InventorySnapshot:
+    """One immutable, fully-indexed version of the inventory"""
+    vehicles: List[Dict[str, Any]]
+    index: InventoryIndex
+    version: int
+    signature: Optional[FileSignature]
+    loaded_at: float
+
+
+class InventorySnapshotLoader:
+    """
+    Serves the current inventory snapshot and reloads it when the file changes.
+
+    Only the very first load is awaited by callers; later reloads run in a
+    background task while the previous snapshot keeps being served.
+    """
+
+    def __init__(self, file_path: Path, poll_interval: float = 5.0):
+        self.file_path = Path(file_path)
+        self.poll_interval = poll_interval
+        self._snapshot: Optional[InventorySnapshot] = None
+        self._version = 0
+        self._last_check = 0.0
+        self._last_reload_ms = 0.0
+        self._initial_load = asyncio.Lock()
+        self._reload_task: Optional[asyncio.Task] = None
+
+    def _stat(self) -> Optional[FileSignature]:
+        try:
+            st = os.stat(self.file_path)
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    async def current(self) -> InventorySnapshot:
+        """Get the snapshot to serve, scheduling a background reload if the file changed"""
+        if self._snapshot is None:
+            async with self._initial_load:
+                if self._snapshot is None:
+                    await self._reload()
+            return self._snapshot
+
+        now = time.monotonic()
+        if now - self._last_check >= self.poll_interval:
+            self._last_check = now
+            if self._stat() != self._snapshot.signature and not self._reloading:
+                self._reload_task = asyncio.create_task(self._reload())
+        return self._snapshot
+
+    @property
+    def _reloading(self) -> bool:
+        return self._reload_task is not None and not self._reload_task.done()
+
+    async def _reload(self) -> None:
+        """Build a new snapshot and swap it in; keep the old one on failure"""
+        start = time.perf_counter()
+        signature = self._stat()
+        try:
+            async with aiofiles.open(self.file_path, mode='r', encoding='utf-8') as f:
+                content = await f.read()
+            vehicles, index = await asyncio.to_thread(self._parse, content)
+        except FileNotFoundError:
+            logger.warning("inventory_file_not_found", path=str(self.file_path))
+            if self._snapshot is not None:
+                # e.g. a rename-based deploy between unlink and rename: keep serving
+                return
+            vehicles, index = [], InventoryIndex([])
+        except Exception as e:
+            # Typically a file caught mid-write: keep serving the previous snapshot
+            logger.error("inventory_reload_failed", path=str(self.file_path), error=str(e))
+            if self._snapshot is None:
+                self._snapshot = InventorySnapshot([], InventoryIndex([]), 0, None, time.time())
+            return
+
+        if self._stat() != signature:
+            # File changed while we were reading it; the next poll picks it up
+            signature = None
+
+        self._version += 1
+        self._snapshot = InventorySnapshot(vehicles, index, self._version, signature, time.time())
+        self._last_check = time.monotonic()
+
+        duration = time.perf_counter() - start
+        self._last_reload_ms = round(duration * 1000, 2)
+        INVENTORY_RELOAD_DURATION.observe(duration)
+        INVENTORY_SNAPSHOT_VERSION.set(self._version)
+        INVENTORY_SNAPSHOT_SIZE.set(len(vehicles))
+        logger.info(
+            "inventory_reloaded",
+            version=self._version,
+            vehicles=len(vehicles),
+            duration_ms=self._last_reload_ms,
+        )
+
+    @staticmethod
+    def _parse(content: str) -> Tuple[List[Dict[str, Any]], InventoryIndex]:
+        vehicles = json.loads(content)
+        return vehicles, InventoryIndex(vehicles)
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next access reloads the file inline"""
+        self._snapshot = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot version and last reload duration"""
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else 0,
+            "vehicles": len(snapshot.vehicles) if snapshot else 0,
+            "loaded_at": snapshot.loaded_at if snapshot else None,
+            "last_reload_ms": self._last_reload_ms,
+            "reloading": self._reloading,
+        }
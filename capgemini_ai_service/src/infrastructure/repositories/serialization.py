@@ -0,0 +1,62 @@
+"""
+Session Serialization
+Compact, versioned encoding of NegotiationSession for external stores.
+
+orjson is used when installed (pip install orjson, part of the `redis` extra)
+and is several times faster than the standard json module on large
+conversation histories; payloads are plain JSON either way, so both
+encoders read each other's output.
+"""
+import json
+from typing import Any, Dict, List, Tuple, Union
+
+from src.domain.negotiation.entities import SESSION_SCHEMA_VERSION, NegotiationSession
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+# Append-only parts of a session (to_dict key), persisted as logs by
+# AppendLogRedisSessionStore rather than inside the session payload
+LOG_FIELDS = ("conversation_history", "offer_history", "emotional_trend_history")
+
+
+def encode_value(value: Any) -> bytes:
+    """Any JSON-serializable value -> compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def decode_value(payload: Union[bytes, str]) -> Any:
+    return orjson.loads(payload) if orjson is not None else json.loads(payload)
+
+
+def encode_session(session: NegotiationSession) -> bytes:
+    """Session -> JSON bytes (schema_version included)"""
+    return encode_value(session.to_dict())
+
+
+def decode_session(payload: Union[bytes, str]) -> NegotiationSession:
+    """JSON bytes/str -> Session; accepts every schema version up to the current one"""
+    return session_from_data(decode_value(payload))
+
+
+def split_session(session: NegotiationSession) -> Tuple[Dict[str, Any], Dict[str, List[Any]]]:
+    """Session -> (scalar state, logs), see LOG_FIELDS"""
+    state = session.to_dict()
+    logs = {name: state.pop(name) for name in LOG_FIELDS}
+    return state, logs
+
+
+def session_from_data(data: Dict[str, Any]) -> NegotiationSession:
+    """to_dict() output (possibly reassembled from split_session) -> Session"""
+    version = data.get("schema_version", 1)
+    if version > SESSION_SCHEMA_VERSION:
+        raise ValueError(
+            f"Session {data.get('session_id')} has schema v{version}, "
+            f"this service reads up to v{SESSION_SCHEMA_VERSION}"
+        )
+    return NegotiationSession.from_dict(data)
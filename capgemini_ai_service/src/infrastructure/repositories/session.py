@@ -2,17 +2,32 @@
 Session Storage Implementations
 Provides in-memory and Redis-backed session stores.
 """
-import json
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from config.settings import settings
+from src.infrastructure.monitoring import ACTIVE_SESSIONS, SESSION_EVICTIONS, observe_session_op
 from src.infrastructure.repositories.base import SessionRepository
+from src.infrastructure.repositories.serialization import (
+    LOG_FIELDS,
+    decode_session,
+    decode_value,
+    encode_session,
+    encode_value,
+    session_from_data,
+    split_session,
+)
 
 
 from src.domain.negotiation.entities import NegotiationSession, CustomerProfile
 
+# Session attribute recording which log entries are already in Redis
+LOG_MARKS_ATTR = "_persisted_logs"
+
 
 class InMemorySessionStore(SessionRepository):
     """
@@ -22,19 +37,44 @@ class InMemorySessionStore(SessionRepository):
     - Fast access
     - TTL-based expiration
     - Automatic cleanup
+    - Bounded size (max sessions / approximate bytes, least recently saved evicted)
+    
+    Sessions are kept in save order (OrderedDict, moved to the end on every
+    save), so the oldest `updated_at` is always at the front: expiry pops from
+    the front in bounded batches, and capacity eviction pops the same end.
+    No operation scans the whole store except list_active().
     """
     
-    def __init__(self, ttl_minutes: int = 60):
-        self._sessions: Dict[str, NegotiationSession] = {}
+    # Expired sessions dropped per save (amortized O(1))
+    EXPIRY_BATCH_SIZE = 64
+    # Rough memory model for max_bytes: fixed part + per history/offer/emotion entry
+    SESSION_BASE_BYTES = 2048
+    LOG_ENTRY_BYTES = 512
+    
+    def __init__(self, ttl_minutes: int = 60, max_sessions: int = 0, max_bytes: int = 0):
+        self._sessions: "OrderedDict[str, NegotiationSession]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
         self._ttl = timedelta(minutes=ttl_minutes)
+        self._max_sessions = max_sessions
+        self._max_bytes = max_bytes
     
+    @observe_session_op("save")
     async def save(self, session: NegotiationSession) -> None:
         """Save or update a session"""
         session.updated_at = datetime.now()
         self._sessions[session.session_id] = session
-        # Periodic cleanup
-        self._cleanup_expired()
+        self._sessions.move_to_end(session.session_id)
+        
+        size = self._estimate_size(session)
+        self._total_bytes += size - self._sizes.get(session.session_id, 0)
+        self._sizes[session.session_id] = size
+        
+        self._expire(self.EXPIRY_BATCH_SIZE)
+        self._enforce_limits()
+        ACTIVE_SESSIONS.set(len(self._sessions))
     
+    @observe_session_op("get")
     async def get(self, session_id: str) -> Optional[NegotiationSession]:
         """Get a session by ID"""
         session = self._sessions.get(session_id)
@@ -43,16 +83,20 @@ class InMemorySessionStore(SessionRepository):
             return None
         return session
     
+    @observe_session_op("delete")
     async def delete(self, session_id: str) -> bool:
         """Delete a session"""
         if session_id in self._sessions:
-            del self._sessions[session_id]
+            self._remove(session_id)
+            ACTIVE_SESSIONS.set(len(self._sessions))
             return True
         return False
     
+    @observe_session_op("list_active")
     async def list_active(self, customer_id: Optional[str] = None) -> List[NegotiationSession]:
         """List active sessions"""
-        self._cleanup_expired()
+        self._expire()
+        ACTIVE_SESSIONS.set(len(self._sessions))
         sessions = list(self._sessions.values())
         
         if customer_id:
@@ -63,13 +107,51 @@ class InMemorySessionStore(SessionRepository):
     def _is_expired(self, session: NegotiationSession) -> bool:
         return datetime.now() - session.updated_at > self._ttl
     
-    def _cleanup_expired(self):
-        expired = [
-            sid for sid, session in self._sessions.items()
-            if self._is_expired(session)
-        ]
-        for sid in expired:
-            del self._sessions[sid]
+    def _estimate_size(self, session: NegotiationSession) -> int:
+        entries = (
+            len(session.conversation_history)
+            + len(session.offer_history)
+            + len(session.emotional_trend.history)
+        )
+        return self.SESSION_BASE_BYTES + entries * self.LOG_ENTRY_BYTES
+    
+    def _remove(self, session_id: str) -> None:
+        del self._sessions[session_id]
+        self._total_bytes -= self._sizes.pop(session_id, 0)
+    
+    def _expire(self, limit: Optional[int] = None) -> None:
+        """Drop expired sessions from the front, at most `limit` of them"""
+        removed = 0
+        while self._sessions and (limit is None or removed < limit):
+            session_id, session = next(iter(self._sessions.items()))
+            if not self._is_expired(session):
+                break
+            self._remove(session_id)
+            removed += 1
+        if removed:
+            SESSION_EVICTIONS.labels(reason="expired").inc(removed)
+    
+    def _enforce_limits(self) -> None:
+        """Evict the least recently saved sessions beyond max_sessions / max_bytes"""
+        evicted = 0
+        # Never evict the session that was just saved
+        while len(self._sessions) > 1 and (
+            (self._max_sessions and len(self._sessions) > self._max_sessions)
+            or (self._max_bytes and self._total_bytes > self._max_bytes)
+        ):
+            self._remove(next(iter(self._sessions)))
+            evicted += 1
+        if evicted:
+            SESSION_EVICTIONS.labels(reason="capacity").inc(evicted)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Occupancy against the configured limits"""
+        return {
+            "sessions": len(self._sessions),
+            "approx_bytes": self._total_bytes,
+            "max_sessions": self._max_sessions,
+            "max_bytes": self._max_bytes,
+        }
 
 
 class RedisSessionStore(SessionRepository):
@@ -80,10 +162,15 @@ class RedisSessionStore(SessionRepository):
     - Distributed storage
     - Native TTL support
     - Connection pooling
+    - One round trip per save/delete (pipelined), batched MGET for listings
+    - Active-session index (sorted set scored by expiry) instead of SCAN
     
-    Requires: pip install redis
+    Requires: pip install redis (orjson optional, see serialization.py)
     """
     
+    # Keys per MGET, keeps single replies (and server blocking) bounded
+    MGET_BATCH_SIZE = 500
+    
     def __init__(
         self, 
         redis_url: str = "redis://localhost:6379/0",
@@ -93,6 +180,7 @@ class RedisSessionStore(SessionRepository):
         self._ttl = ttl_seconds
         self._redis = None
         self._prefix = "negotiation_session:"
+        self._active_key = f"{self._prefix}index:active"
     
     async def _get_redis(self):
         """Lazy connection initialization"""
@@ -111,72 +199,263 @@ class RedisSessionStore(SessionRepository):
                 )
         return self._redis
     
+    def _key(self, session_id: str) -> str:
+        return f"{self._prefix}{session_id}"
+    
+    def _customer_key(self, customer_id: str) -> str:
+        return f"{self._prefix}customer:{customer_id}"
+    
+    async def _mget_sessions(self, redis_client, session_ids: List[str]):
+        """Fetch sessions in MGET batches; yields (session_id, session or None)"""
+        for start in range(0, len(session_ids), self.MGET_BATCH_SIZE):
+            batch = session_ids[start:start + self.MGET_BATCH_SIZE]
+            payloads = await redis_client.mget([self._key(sid) for sid in batch])
+            for sid, payload in zip(batch, payloads):
+                yield sid, decode_session(payload) if payload else None
+    
+    def _queue_index_updates(self, pipe, session: NegotiationSession) -> None:
+        """Active index and customer index commands for a saved session"""
+        if session.is_finalized:
+            pipe.zrem(self._active_key, session.session_id)
+        else:
+            pipe.zadd(self._active_key, {session.session_id: time.time() + self._ttl})
+        # Also index by customer_id for list_active
+        if session.customer_id:
+            customer_key = self._customer_key(session.customer_id)
+            pipe.sadd(customer_key, session.session_id)
+            pipe.expire(customer_key, self._ttl)
+    
+    @observe_session_op("save")
     async def save(self, session: NegotiationSession) -> None:
-        """Save session to Redis with TTL"""
+        """Save session, refresh its indexes and TTLs in a single round trip"""
         redis_client = await self._get_redis()
-        key = f"{self._prefix}{session.session_id}"
         session.updated_at = datetime.now()
-        data = json.dumps(session.to_dict())
-        await redis_client.setex(key, self._ttl, data)
         
-        # Also index by customer_id for list_active
-        if session.customer_id:
-            customer_key = f"{self._prefix}customer:{session.customer_id}"
-            await redis_client.sadd(customer_key, session.session_id)
-            await redis_client.expire(customer_key, self._ttl)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.setex(self._key(session.session_id), self._ttl, encode_session(session))
+            self._queue_index_updates(pipe, session)
+            await pipe.execute()
     
+    @observe_session_op("get")
     async def get(self, session_id: str) -> Optional[NegotiationSession]:
         """Get session from Redis"""
         redis_client = await self._get_redis()
-        key = f"{self._prefix}{session_id}"
-        data = await redis_client.get(key)
+        data = await redis_client.get(self._key(session_id))
         
         if data:
-            return NegotiationSession.from_dict(json.loads(data))
+            return decode_session(data)
         return None
     
+    @observe_session_op("delete")
     async def delete(self, session_id: str) -> bool:
         """Delete session from Redis"""
         redis_client = await self._get_redis()
-        key = f"{self._prefix}{session_id}"
-        result = await redis_client.delete(key)
-        return result > 0
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.delete(self._key(session_id))
+            pipe.zrem(self._active_key, session_id)
+            deleted, _ = await pipe.execute()
+        return deleted > 0
     
+    @observe_session_op("list_active")
     async def list_active(self, customer_id: Optional[str] = None) -> List[NegotiationSession]:
         """List active sessions"""
         redis_client = await self._get_redis()
         sessions = []
         
         if customer_id:
-            customer_key = f"{self._prefix}customer:{customer_id}"
-            session_ids = await redis_client.smembers(customer_key)
-            for sid in session_ids:
-                session = await self.get(sid)
-                if session and not session.is_finalized:
+            customer_key = self._customer_key(customer_id)
+            session_ids = list(await redis_client.smembers(customer_key))
+            expired = []
+            async for sid, session in self._mget_sessions(redis_client, session_ids):
+                if session is None:
+                    expired.append(sid)
+                elif not session.is_finalized:
                     sessions.append(session)
+            if expired:
+                await redis_client.srem(customer_key, *expired)
         else:
-            # Scan for all sessions (use carefully in production)
-            async for key in redis_client.scan_iter(f"{self._prefix}*"):
-                if not key.startswith(f"{self._prefix}customer:"):
-                    data = await redis_client.get(key)
-                    if data:
-                        session = NegotiationSession.from_dict(json.loads(data))
-                        if not session.is_finalized:
-                            sessions.append(session)
+            # Drop index entries whose session key has expired, then read the rest
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.zremrangebyscore(self._active_key, "-inf", time.time())
+                pipe.zrange(self._active_key, 0, -1)
+                _, session_ids = await pipe.execute()
+            async for _, session in self._mget_sessions(redis_client, session_ids):
+                if session and not session.is_finalized:
+                    sessions.append(session)
         
         return sessions
 
 
+class AppendLogRedisSessionStore(RedisSessionStore):
+    """
+    Redis session store that appends instead of rewriting.
+    
+    Layout per session:
+    - {prefix}{id}:state            hash, one JSON value per scalar field
+    - {prefix}{id}:log:<name>       list per LOG_FIELDS entry (messages, offers, emotions)
+    
+    save() rewrites the small state hash and RPUSHes only the log entries added
+    since the session was loaded, so write cost no longer grows with the turn
+    count. get() rehydrates the last `history_window` entries of each log (the
+    agents read conversation_history[-6:] and the last few emotions);
+    get_full() loads everything. Bounded logs (the emotion history) are
+    LTRIMmed after each push: a rehydrated window never reaches the in-memory
+    trim threshold, so the append path alone would grow them forever.
+    """
+    
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379/0",
+        ttl_seconds: int = 3600,
+        history_window: int = 20
+    ):
+        super().__init__(redis_url=redis_url, ttl_seconds=ttl_seconds)
+        self._window = history_window
+    
+    def _state_key(self, session_id: str) -> str:
+        return f"{self._prefix}{session_id}:state"
+    
+    def _log_key(self, session_id: str, name: str) -> str:
+        return f"{self._prefix}{session_id}:log:{name}"
+    
+    def _session_keys(self, session_id: str) -> List[str]:
+        return [self._state_key(session_id)] + [self._log_key(session_id, name) for name in LOG_FIELDS]
+    
+    @staticmethod
+    def _pending_logs(session: NegotiationSession, logs: Dict[str, List[Any]]) -> Dict[str, Tuple[bool, List[Any]]]:
+        """
+        Per log: (rewrite, entries) to persist.
+        Entries appended since the last load/save are pushed; a log that was
+        replaced, shortened or trimmed at the front (bounded emotion history)
+        in the meantime is rewritten from the session.
+        """
+        marks = getattr(session, LOG_MARKS_ATTR, {})
+        pending = {}
+        for name, entries in logs.items():
+            persisted, count, last = marks.get(name, (None, 0, None))
+            appended_only = (
+                persisted is entries
+                and len(entries) >= count
+                and (count == 0 or entries[count - 1] is last)
+            )
+            if appended_only:
+                pending[name] = (False, entries[count:])
+            else:
+                pending[name] = (True, entries)
+        return pending
+    
+    @staticmethod
+    def _log_limits(session: NegotiationSession) -> Dict[str, int]:
+        """Per bounded log: entries kept in Redis"""
+        return {"emotional_trend_history": session.emotional_trend.max_history}
+    
+    @staticmethod
+    def _mark_persisted(session: NegotiationSession, logs: Dict[str, List[Any]]) -> None:
+        # Kept on the session object: it is the one thing that knows which
+        # entries this process loaded, whatever store instance saves it
+        setattr(session, LOG_MARKS_ATTR, {
+            name: (entries, len(entries), entries[-1] if entries else None)
+            for name, entries in logs.items()
+        })
+    
+    @observe_session_op("save")
+    async def save(self, session: NegotiationSession) -> None:
+        """Write the state hash and append new log entries in one transaction"""
+        redis_client = await self._get_redis()
+        session.updated_at = datetime.now()
+        state, logs = split_session(session)
+        limits = self._log_limits(session)
+        
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                self._state_key(session.session_id),
+                mapping={name: encode_value(value) for name, value in state.items()}
+            )
+            for name, (rewrite, entries) in self._pending_logs(session, logs).items():
+                log_key = self._log_key(session.session_id, name)
+                if rewrite:
+                    pipe.delete(log_key)
+                if entries:
+                    pipe.rpush(log_key, *(encode_value(entry) for entry in entries))
+                    if limits.get(name):
+                        pipe.ltrim(log_key, -limits[name], -1)
+            for key in self._session_keys(session.session_id):
+                pipe.expire(key, self._ttl)
+            self._queue_index_updates(pipe, session)
+            await pipe.execute()
+        
+        self._mark_persisted(session, logs)
+    
+    async def _load(self, redis_client, session_ids: List[str], window: Optional[int]):
+        """Pipelined HGETALL + LRANGE per session; yields (session_id, session or None)"""
+        start = -window if window else 0
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for sid in session_ids:
+                pipe.hgetall(self._state_key(sid))
+                for name in LOG_FIELDS:
+                    pipe.lrange(self._log_key(sid, name), start, -1)
+            replies = await pipe.execute()
+        
+        step = 1 + len(LOG_FIELDS)
+        for i, sid in enumerate(session_ids):
+            state, *log_replies = replies[i * step:(i + 1) * step]
+            if not state:
+                yield sid, None
+                continue
+            data = {name: decode_value(value) for name, value in state.items()}
+            logs = {
+                name: [decode_value(entry) for entry in entries]
+                for name, entries in zip(LOG_FIELDS, log_replies)
+            }
+            session = session_from_data({**data, **logs})
+            _, loaded = split_session(session)
+            self._mark_persisted(session, loaded)
+            yield sid, session
+    
+    async def _mget_sessions(self, redis_client, session_ids: List[str]):
+        for start in range(0, len(session_ids), self.MGET_BATCH_SIZE):
+            async for item in self._load(redis_client, session_ids[start:start + self.MGET_BATCH_SIZE], self._window):
+                yield item
+    
+    @observe_session_op("get")
+    async def get(self, session_id: str) -> Optional[NegotiationSession]:
+        """Get session with the recent window of each log"""
+        redis_client = await self._get_redis()
+        async for _, session in self._load(redis_client, [session_id], self._window):
+            return session
+        return None
+    
+    async def get_full(self, session_id: str) -> Optional[NegotiationSession]:
+        """Get session with its complete logs"""
+        redis_client = await self._get_redis()
+        async for _, session in self._load(redis_client, [session_id], None):
+            return session
+        return None
+    
+    @observe_session_op("delete")
+    async def delete(self, session_id: str) -> bool:
+        """Delete session state and logs"""
+        redis_client = await self._get_redis()
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.delete(*self._session_keys(session_id))
+            pipe.zrem(self._active_key, session_id)
+            deleted, _ = await pipe.execute()
+        return deleted > 0
+
+
 # Singleton instance
 _store_instance: Optional[SessionRepository] = None
 
 
-def get_session_store(use_redis: bool = False, redis_url: str = None) -> SessionRepository:
+def get_session_store(use_redis: Optional[bool] = None, redis_url: str = None) -> SessionRepository:
     """
     Factory function for session store.
     
     Args:
-        use_redis: If True, use Redis store (requires Redis running)
+        use_redis: If True, use Redis store (requires Redis running);
+            the append-log variant when SESSION_APPEND_LOG is enabled.
+            Defaults to SESSION_BACKEND ("auto" = Redis when REDIS_URL is set,
+            so every worker sees the same sessions)
         redis_url: Redis connection URL
     
     Returns:
@@ -185,11 +464,20 @@ def get_session_store(use_redis: bool = False, redis_url: str = None) -> Session
     global _store_instance
     
     if _store_instance is None:
+        if use_redis is None:
+            use_redis = settings.uses_redis(settings.session_backend)
         if use_redis:
-            import os
-            url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
-            _store_instance = RedisSessionStore(redis_url=url)
+            url = redis_url or settings.redis_url or "redis://localhost:6379/0"
+            if settings.session_append_log:
+                _store_instance = AppendLogRedisSessionStore(
+                    redis_url=url, history_window=settings.session_history_window
+                )
+            else:
+                _store_instance = RedisSessionStore(redis_url=url)
         else:
-            _store_instance = InMemorySessionStore()
+            _store_instance = InMemorySessionStore(
+                max_sessions=settings.session_max_sessions,
+                max_bytes=settings.session_max_bytes,
+            )
     
     return _store_instance
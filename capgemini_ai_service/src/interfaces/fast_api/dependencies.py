@@ -57,12 +57,10 @@ def get_session_repo() -> SessionRepository:
     """
     Get session repository instance.
     
-    Uses Redis in production if REDIS_URL is set,
+    Uses Redis in production if REDIS_URL is set (SESSION_BACKEND=auto),
     otherwise falls back to in-memory store.
     """
-    import os
-    use_redis = bool(os.getenv("REDIS_URL"))
-    return get_session_store(use_redis=use_redis)
+    return get_session_store()
 
 
 # ============ Domain Service Dependencies ============
@@ -17,6 +17,8 @@ from fastapi.responses import JSONResponse
 
 from config.settings import settings
 from src.infrastructure.logging.structured import configure_logging, get_logger
+from src.infrastructure.llm import close_clients
+from src.infrastructure.monitoring import http_metrics_middleware
 
 # Import route modules
 from src.interfaces.fast_api.routes import health, negotiate, valuate, orchestrate
@@ -52,6 +54,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     
     # Shutdown
     logger.info("shutting_down_service")
+    await close_clients()
 
 
 # ============ Create App ============
@@ -94,6 +97,10 @@ app.add_middleware(
 )
 
 
+# Per-endpoint latency histogram
+app.middleware("http")(http_metrics_middleware)
+
+
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -2,12 +2,13 @@
 Health Check Routes
 Provides endpoints for service health monitoring and readiness checks.
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
 from typing import Dict, Any
 from datetime import datetime
 
 from config.settings import settings
+from src.infrastructure.monitoring import render_latest
 
 router = APIRouter(tags=["Health"])
 
@@ -85,3 +86,14 @@ async def get_metrics():
     return MetricsResponse(
         uptime_seconds=uptime,
     )
+
+
+@router.get("/metrics/prometheus")
+async def prometheus_metrics():
+    """
+    Prometheus scrape endpoint.
+    
+    Aggregates all workers when PROMETHEUS_MULTIPROC_DIR is set.
+    """
+    content, content_type = render_latest()
+    return Response(content=content, media_type=content_type)
@@ -149,7 +149,7 @@ async def get_session(
     from src.infrastructure.repositories.session import get_session_store
     
     store = get_session_store()
-    session = await store.get(session_id)
+    session = await store.get_full(session_id)
     
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -0,0 +1,121 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import MagicMock
+from agents.negotiation.analysis import AnalysisService
+from schemas.models import EmotionalContextModel
+from schemas.types import EmotionType, NegotiationIntent
+from config.settings import settings
+
+
+@pytest.fixture(autouse=True)
+def llm_intent_only(monkeypatch):
+    """These tests exercise the LLM paths, so the rule-based fast path is off"""
+    monkeypatch.setattr(settings, "intent_fast_path_enabled", False)
+
+
+def _emotion(emotion=EmotionType.HAPPY):
+    return EmotionalContextModel(
+        primary_emotion=emotion,
+        intensity=0.6,
+        sentiment_score=0.7,
+        key_concerns=[],
+        recommended_tone="énergique",
+        recommended_strategy="closing",
+        detected_language="fr"
+    )
+
+
+@pytest.mark.asyncio
+async def test_analyze_turn_runs_calls_concurrently():
+    """Turn latency should be bounded by the slower call, not the sum"""
+    service = AnalysisService(MagicMock())
+    intervals = {}
+
+    async def slow_emotion(message):
+        start = time.perf_counter()
+        await asyncio.sleep(0.05)
+        intervals["emotion"] = (start, time.perf_counter())
+        return _emotion()
+
+    async def slow_intent(message, phase, recent_messages=None):
+        start = time.perf_counter()
+        await asyncio.sleep(0.05)
+        intervals["intent"] = (start, time.perf_counter())
+        return {"intent": NegotiationIntent.ACCEPT, "confidence": 0.9, "reasoning": "ok", "needs_clarification": False}
+
+    service.analyze_emotion = slow_emotion
+    service.detect_intent = slow_intent
+
+    emotion, intent = await service.analyze_turn("D'accord", "negotiation")
+
+    # Each call started before the other one finished
+    starts, ends = zip(*intervals.values())
+    assert len(starts) == 2
+    assert max(starts) < min(ends)
+    assert emotion.primary_emotion == EmotionType.HAPPY
+    assert intent["intent"] == NegotiationIntent.ACCEPT
+
+
+@pytest.mark.asyncio
+async def test_analyze_turn_partial_failure_keeps_other_result():
+    """A timeout on one call falls back without discarding the other"""
+    service = AnalysisService(MagicMock())
+
+    async def hanging_emotion(message):
+        await asyncio.sleep(5)
+
+    async def fast_intent(message, phase, recent_messages=None):
+        return {"intent": NegotiationIntent.COUNTER_OFFER, "confidence": 0.8, "reasoning": "prix", "needs_clarification": False}
+
+    service.analyze_emotion = hanging_emotion
+    service.detect_intent = fast_intent
+
+    emotion, intent = await service.analyze_turn("Je la prends à 120000", "negotiation", timeout=0.05)
+
+    assert emotion.primary_emotion == EmotionType.NEUTRAL
+    assert intent["intent"] == NegotiationIntent.COUNTER_OFFER
+
+
+def _routing_llm(emotion_json, intent_json, fused_json):
+    """Fake chat model answering each analysis prompt with canned JSON"""
+    from langchain_core.messages import AIMessage
+    from langchain_core.runnables import RunnableLambda
+
+    def answer(prompt_value):
+        text = prompt_value.to_string()
+        if "ANALYSE COMPLÈTE DU TOUR" in text:
+            return AIMessage(content=fused_json)
+        if "INTENTIONS POSSIBLES" in text:
+            return AIMessage(content=intent_json)
+        return AIMessage(content=emotion_json)
+
+    return RunnableLambda(answer)
+
+
+@pytest.mark.asyncio
+async def test_fused_mode_parity_with_split_mode():
+    """Fused and split paths must yield identical analyses for identical answers"""
+    emotion_json = '{"primary_emotion": "budget_stressed", "sentiment_score": 0.3, "intensity": 7, "recommended_tone": "rassurant", "detected_language": "ma"}'
+    intent_json = '```json\n{"intent": "COUNTER_OFFER", "confidence": 85, "reasoning": "Propose un prix"}\n```'
+    fused_json = '{"primary_emotion": "budget_stressed", "sentiment_score": 0.3, "intensity": 7, "recommended_tone": "rassurant", "detected_language": "ma", "intent": "COUNTER_OFFER", "confidence": 85, "reasoning": "Propose un prix"}'
+    service = AnalysisService(_routing_llm(emotion_json, intent_json, fused_json))
+    history = [{"role": "assistant", "content": "Je vous propose 130000 MAD"}]
+
+    split = await service.analyze_turn("Bghit nakhodha b 120000", "negotiation", history, mode="split")
+    fused = await service.analyze_turn("Bghit nakhodha b 120000", "negotiation", history, mode="fused")
+
+    assert split[0] == fused[0]
+    assert split[1] == fused[1]
+    assert fused[1]["intent"] == NegotiationIntent.COUNTER_OFFER
+    assert fused[0].detected_language == "ma"
+
+
+@pytest.mark.asyncio
+async def test_fused_mode_falls_back_on_invalid_json():
+    service = AnalysisService(_routing_llm("{}", "{}", "not json"))
+
+    emotion, intent = await service.analyze_turn("Bonjour", "discovery", mode="fused")
+
+    assert emotion.primary_emotion == EmotionType.NEUTRAL
+    assert intent["needs_clarification"] is True
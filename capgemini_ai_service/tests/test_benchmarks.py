@@ -0,0 +1,53 @@
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+from benchmarks.fake_llm import DEFAULT_REPLY, ScriptedChatModel
+from benchmarks.harness import compare, measure
+from benchmarks.scenarios import load_conversations
+
+
+@pytest.mark.asyncio
+async def test_scripted_llm_routes_by_prompt_marker():
+    llm = ScriptedChatModel(latency_ms=0, script=[("INTENTIONS POSSIBLES", '{"intent": "ACCEPT"}')])
+    chain = ChatPromptTemplate.from_template("{text}") | llm
+
+    intent = await chain.ainvoke({"text": "INTENTIONS POSSIBLES: ..."})
+    reply = await chain.ainvoke({"text": "Tu es Karim"})
+
+    assert intent.content == '{"intent": "ACCEPT"}'
+    assert reply.content == DEFAULT_REPLY
+    assert intent.usage_metadata["input_tokens"] > 0
+
+
+@pytest.mark.asyncio
+async def test_measure_and_compare():
+    async def turn():
+        return None
+
+    result = await measure(lambda run: [turn, turn], iterations=2, warmup=0)
+
+    assert result["turns"] == 4
+    assert result["p50_ms"] <= result["p99_ms"]
+    assert "alloc_kib_per_turn" in result
+
+    baseline = {"negotiate": {"p95_ms": 100.0, "turns_per_sec": 10.0}}
+    assert compare({"negotiate": {"p95_ms": 110.0, "turns_per_sec": 9.0}}, baseline, 0.25) == []
+    assert len(compare({"negotiate": {"p95_ms": 200.0, "turns_per_sec": 5.0}}, baseline, 0.25)) == 2
+
+
+def test_p99_and_foreign_timings_are_not_gated():
+    baseline = {"api": {"p50_ms": 50.0, "p99_ms": 80.0, "turns_per_sec": 18.0, "alloc_kib_per_turn": 90.0}}
+
+    # p99 is one slow turn: reported, never a regression
+    assert compare({"api": {"p50_ms": 50.0, "p99_ms": 160.0, "turns_per_sec": 18.0}}, baseline, 0.25) == []
+
+    # Baseline from another machine: only allocations count
+    slower = {"api": {"p50_ms": 100.0, "turns_per_sec": 9.0, "alloc_kib_per_turn": 200.0}}
+    assert compare(slower, baseline, 0.25, timings=False) == ["api.alloc_kib_per_turn: 200.0 > 90.0 (+25%)"]
+
+
+def test_json_test_requests_grouped_into_conversations():
+    conversations = load_conversations()
+    by_session = {c[0]["session_id"]: c for c in conversations}
+
+    assert len(by_session["test-new-456"]) == 2  # test_turn2 + test_turn3
+    assert by_session["script-family_budget"][0]["vehicle_context"]["price"] == 250000
@@ -0,0 +1,178 @@
+import pytest
+from agents.negotiation.agent import NegotiationAgent
+from agents.negotiation.budget_solver import financing_factor, solve_budget
+from agents.negotiation.concession import ConcessionEngine
+from config.settings import settings
+from schemas.models import EmotionalContextModel
+from schemas.types import EmotionType, NegotiationIntent
+from src.infrastructure.monitoring import BUDGET_SOLUTIONS
+
+PRICE = 250000
+COST = PRICE * 0.85
+FLOOR = COST * 1.03
+
+
+def _offer(monthly, duration=60, price=PRICE, down_payment=0):
+    return {"monthly": monthly, "duration": duration, "price": price, "down_payment": down_payment}
+
+
+def _emotion():
+    return EmotionalContextModel(
+        primary_emotion=EmotionType.NEUTRAL,
+        intensity=0.5,
+        sentiment_score=0.5,
+        key_concerns=[],
+        recommended_tone="professionnel",
+        recommended_strategy="standard",
+        detected_language="fr"
+    )
+
+
+def test_monthly_budget_met_with_minimal_concession():
+    offer = _offer(5000)
+
+    solution = solve_budget(offer, 4600, FLOOR, durations=(60,))
+
+    assert solution.feasible
+    assert solution.monthly == pytest.approx(4600)
+    assert solution.duration == 60
+    assert solution.concession == pytest.approx(400 * 60 / financing_factor(60))
+    assert FLOOR <= solution.price < PRICE
+
+
+def test_longer_duration_preferred_over_price_cut():
+    # 84 months brings the payment under budget without touching the price
+    solution = solve_budget(_offer(5000), 4300, FLOOR)
+
+    assert solution.feasible
+    assert solution.concession == 0
+    assert solution.price == PRICE
+    assert solution.duration == 84
+    assert solution.monthly <= 4300
+
+
+def test_down_payment_used_before_price_cut():
+    solution = solve_budget(_offer(5000), 4200, FLOOR, max_down_payment=100000, durations=(60,))
+
+    assert solution.concession == 0
+    assert solution.down_payment == pytest.approx(800 * 60 / financing_factor(60))
+    assert solution.monthly == pytest.approx(4200)
+
+
+def test_unreachable_monthly_budget_is_infeasible():
+    solution = solve_budget(_offer(5000), 1500, FLOOR)
+
+    assert not solution.feasible
+    assert solution.price == pytest.approx(FLOOR)
+    assert solution.duration == 84
+    assert solution.monthly > 1500
+
+
+def test_total_budget():
+    met = solve_budget(_offer(PRICE / 60), 235000, FLOOR, cash=True)
+    out_of_reach = solve_budget(_offer(PRICE / 60), 200000, FLOOR)
+
+    assert met.feasible and met.budget_type == "total"
+    assert met.price == 235000
+    assert met.monthly == pytest.approx(235000 / 60)
+    assert not out_of_reach.feasible
+    assert out_of_reach.price == pytest.approx(FLOOR)
+
+
+def test_total_budget_cut_lowers_the_financed_payment():
+    solution = solve_budget(_offer(5000), 235000, FLOOR)
+
+    assert solution.budget_type == "total"
+    assert solution.monthly == pytest.approx(5000 - 15000 * financing_factor(60) / 60)
+
+
+@pytest.mark.parametrize("message, intent, expected", [
+    ("La Clio 2019 est trop chère pour moi", NegotiationIntent.EXPRESS_CONCERN, None),
+    ("Mon budget c'est pour une 2019", NegotiationIntent.BUDGET_MENTION, None),
+    ("Elle a 120000 km, c'est trop cher", NegotiationIntent.EXPRESS_CONCERN, None),
+    ("Je ne peux pas dépasser 3 500 dh par mois", NegotiationIntent.EXPRESS_CONCERN, 3500),
+    ("Mon budget est de 4000", NegotiationIntent.BUDGET_MENTION, 4000),
+    ("Max 230k", NegotiationIntent.REJECT, 230000),
+    ("Mon budget est de 9 dh", NegotiationIntent.BUDGET_MENTION, None),  # not about this car
+])
+def test_solver_only_gets_explicit_budgets(message, intent, expected):
+    assert NegotiationAgent()._explicit_budget(message, intent, PRICE) == expected
+
+
+@pytest.mark.asyncio
+async def test_engine_floor_includes_trade_in():
+    trade_in = 100000
+    offer, _ = await ConcessionEngine().calculate_smart_concession(
+        current_offer=_offer(5000),
+        intent=NegotiationIntent.BUDGET_MENTION,
+        emotion=_emotion(),
+        history_len=1,
+        vehicle_cost=COST,
+        target_vehicle_price=PRICE,
+        session_budget=1500,
+        trade_in_value=trade_in
+    )
+
+    assert offer["price"] == round(FLOOR - trade_in * 0.05)
+
+
+@pytest.mark.parametrize("budget", [5000, 5500, 300000, 0, None])
+def test_no_solution_when_offer_already_fits(budget):
+    assert solve_budget(_offer(5000), budget, FLOOR) is None
+
+
+@pytest.mark.asyncio
+async def test_engine_meets_budget_in_one_move():
+    met_before = BUDGET_SOLUTIONS.labels(outcome="met")._value.get()
+
+    offer, reasoning = await ConcessionEngine().calculate_smart_concession(
+        current_offer=_offer(5000),
+        intent=NegotiationIntent.BUDGET_MENTION,
+        emotion=_emotion(),
+        history_len=1,
+        vehicle_cost=COST,
+        target_vehicle_price=PRICE,
+        session_budget=3600
+    )
+
+    # Far beyond the 2.5% per-round cap of the stepwise path
+    assert offer["price"] < PRICE * 0.975
+    assert offer["monthly"] <= 3600
+    assert offer["budget_monthly"] == 3600
+    assert not offer.get("suggest_alternatives")
+    assert "budget" in reasoning
+    assert BUDGET_SOLUTIONS.labels(outcome="met")._value.get() == met_before + 1
+
+
+@pytest.mark.asyncio
+async def test_engine_goes_to_alternatives_when_budget_out_of_reach():
+    offer, _ = await ConcessionEngine().calculate_smart_concession(
+        current_offer=_offer(5000),
+        intent=NegotiationIntent.BUDGET_MENTION,
+        emotion=_emotion(),
+        history_len=1,
+        vehicle_cost=COST,
+        target_vehicle_price=PRICE,
+        session_budget=1500
+    )
+
+    assert offer["suggest_alternatives"] is True
+    assert offer["price"] == round(FLOOR)
+
+
+@pytest.mark.asyncio
+async def test_engine_steps_without_solver(monkeypatch):
+    monkeypatch.setattr(settings, "budget_solver_enabled", False)
+
+    offer, _ = await ConcessionEngine().calculate_smart_concession(
+        current_offer=_offer(5000),
+        intent=NegotiationIntent.BUDGET_MENTION,
+        emotion=_emotion(),
+        history_len=1,
+        vehicle_cost=COST,
+        target_vehicle_price=PRICE,
+        session_budget=3600
+    )
+
+    assert offer["price"] >= PRICE * 0.975 - 1
+    assert "budget_monthly" not in offer
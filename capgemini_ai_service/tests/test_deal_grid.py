@@ -0,0 +1,126 @@
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from agents.deal_agent import DealStructuringAgent, FinancialCalculator
+from agents.deal_grid import amortized_payment, evaluate_grid, pareto_mask
+
+
+@pytest.fixture(scope="module")
+def agent():
+    return DealStructuringAgent()
+
+
+@pytest.mark.parametrize("vehicle_price, trade_in", [(250000, 0), (185000, 40000), (420000, 120000)])
+def test_grid_matches_scalar_options(agent, vehicle_price, trade_in):
+    scalar = {opt.type: opt for opt in agent._calculate_all_options(vehicle_price, trade_in)}
+
+    grids = evaluate_grid(vehicle_price, agent.config, [24, 48, 60], [0.0], [trade_in])
+
+    for product, months in (("LLD", 48), ("Credit", 60), ("Subscription", 24)):
+        grid = grids[product]
+        i = int(np.flatnonzero(grid["months"] == months)[0])
+        assert grid["monthly_payment"][i] == pytest.approx(scalar[product].monthly_payment)
+        assert grid["total_cost"][i] == pytest.approx(scalar[product].total_cost, abs=0.01)
+        assert grid["interest_rate"][i] == scalar[product].interest_rate
+
+
+def test_amortized_payment_matches_calculator():
+    principal = np.array([150000.0, 90000.0, 0.0, 120000.0])
+    rate = np.array([5.5, 0.0, 5.0, 4.5])
+    months = np.array([60, 36, 48, 0])
+
+    vectorized = amortized_payment(principal, rate, months)
+
+    expected = [FinancialCalculator.calculate_monthly_payment(p, r, int(m)) for p, r, m in zip(principal, rate, months)]
+    assert vectorized == pytest.approx(expected)
+
+
+def test_pareto_mask_matches_brute_force():
+    rng = np.random.default_rng(3)
+    costs = rng.integers(0, 6, size=(300, 3)).astype(float)
+
+    mask = pareto_mask(costs)
+
+    for i, point in enumerate(costs):
+        dominated = np.any(np.all(costs <= point, axis=1) & np.any(costs < point, axis=1))
+        if dominated:
+            assert not mask[i]
+    front = costs[mask]
+    assert len(np.unique(front, axis=0)) == len(front)
+    # Every non-dominated point is represented on the front
+    for point in costs[~mask]:
+        assert np.any(np.all(front <= point, axis=1))
+
+
+def test_structure_grid_returns_budget_fitting_pareto_options(agent):
+    profile = {"monthly_budget": 3500, "financing_preference": "any"}
+
+    start = time.perf_counter()
+    result = agent.structure_grid(250000, profile, trade_in_values=[0, 30000, 60000])
+    elapsed = time.perf_counter() - start
+
+    assert result["evaluated"] > 400
+    assert elapsed < 1.0
+    options = result["options"]
+    assert options and all(option["fits_budget"] for option in options)
+    assert {option["type"] for option in options} <= {"LLD", "Credit", "Subscription"}
+    for product in ("LLD", "Credit"):
+        for trade_in in (0, 30000, 60000):
+            front = [o for o in options if o["type"] == product and o["trade_in_value"] == trade_in]
+            assert len(front) <= 8
+            for a in front:
+                assert not any(
+                    b["monthly_payment"] <= a["monthly_payment"] and b["total_cost"] <= a["total_cost"]
+                    and b["down_payment"] <= a["down_payment"] and b != a
+                    for b in front
+                )
+
+
+def test_financing_preference_restricts_products(agent):
+    result = agent.structure_grid(200000, {"monthly_budget": 6000, "financing_preference": "Crédit"})
+
+    assert {option["type"] for option in result["options"]} == {"Credit"}
+
+
+def test_grid_endpoint(monkeypatch):
+    from main import app, limiter
+
+    monkeypatch.setattr(limiter, "enabled", False)
+    payload = {
+        "vehicle_price": 220000,
+        "trade_in_values": [0, 50000],
+        "durations": [24, 36, 48, 60, 72],
+        "max_options": 5,
+        "preferences": {
+            "vehicle_type": "SUV",
+            "monthly_budget": 4000,
+            "financing_preference": "any",
+            "priorities": []
+        }
+    }
+
+    response = TestClient(app).post("/ai/structuring/grid", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["options"]
+    assert all(option["duration_months"] in payload["durations"] for option in data["options"])
+    assert data["calculation_details"]["trade_in_values"] == [0, 50000]
+
+
+@pytest.mark.parametrize("field, values", [("trade_in_values", [0, -20000]), ("down_payments", [-5000]), ("durations", [0, 24])])
+def test_grid_endpoint_rejects_negative_inputs(monkeypatch, field, values):
+    from main import app, limiter
+
+    monkeypatch.setattr(limiter, "enabled", False)
+    payload = {
+        "vehicle_price": 220000,
+        field: values,
+        "preferences": {"vehicle_type": "SUV", "monthly_budget": 4000, "financing_preference": "any", "priorities": []}
+    }
+
+    response = TestClient(app).post("/ai/structuring/grid", json=payload)
+
+    assert response.status_code == 422
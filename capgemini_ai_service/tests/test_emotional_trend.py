@@ -0,0 +1,79 @@
+import pytest
+from core.metrics import EmotionalTrend as CoreEmotionalTrend
+from src.domain.shared.metrics import EmotionalTrend
+
+READINGS = [
+    ("neutral", 0.5, 0.1),
+    ("frustrated", 0.9, -0.6),
+    ("interested", 0.6, 0.4),
+    ("happy", 0.7, 0.8),
+    ("frustrated", 0.8, -0.3),
+    ("happy", 0.6, 0.9),
+]
+
+
+def _fill(trend):
+    for emotion, intensity, sentiment in READINGS:
+        trend.add_reading(emotion, intensity, sentiment)
+    return trend
+
+
+def test_domain_trend_matches_full_history_statistics():
+    trend = _fill(EmotionalTrend())
+    sentiments = [s for _, _, s in READINGS]
+    mean = sum(sentiments) / len(sentiments)
+    std = (sum((s - mean) ** 2 for s in sentiments) / len(sentiments)) ** 0.5
+
+    result = trend.get_trend()
+
+    assert result["average_sentiment"] == round(mean, 2)
+    assert result["volatility"] == round(std, 2)
+    assert result["direction"] == "volatile"
+    assert result["reading_count"] == 6
+    assert trend.get_emotion_distribution() == {"neutral": 1, "frustrated": 2, "interested": 1, "happy": 2}
+
+
+def test_core_trend_matches_full_history_statistics():
+    trend = _fill(CoreEmotionalTrend())
+    sentiments = [s for _, _, s in READINGS]
+    diffs = [abs(b - a) for a, b in zip(sentiments, sentiments[1:])]
+
+    result = trend.get_trend()
+
+    assert result["volatility"] == round(sum(diffs) / len(diffs), 2)
+    assert result["current_sentiment"] == 0.9
+    assert result["direction"] == "improving"  # 0.57 recent vs -0.03 early
+    assert trend.get_average_sentiment() == pytest.approx(sum(sentiments) / len(sentiments))
+
+
+@pytest.mark.parametrize("trend_class", [EmotionalTrend, CoreEmotionalTrend])
+def test_history_is_bounded_but_statistics_cover_every_reading(trend_class):
+    trend = trend_class(max_history=2)
+    _fill(trend)
+
+    assert len(trend.history) <= 4
+    assert trend.get_emotion_distribution()["happy"] == 2
+
+    # A restored trend rebuilds its statistics from the persisted readings
+    restored = trend_class(history=list(trend.history))
+    kept = [h["sentiment"] for h in trend.history]
+    assert restored.get_average_sentiment() == pytest.approx(sum(kept) / len(kept))
+
+
+def test_restored_session_keeps_trend_statistics():
+    from src.domain.negotiation.entities import NegotiationSession
+    from src.infrastructure.repositories.serialization import decode_session, encode_session
+
+    session = NegotiationSession(session_id="s1", customer_id="c1")
+    session.emotional_trend = EmotionalTrend(max_history=2)
+    _fill(session.emotional_trend)
+    # Another worker only sees what was persisted (a trimmed history)
+    restored = decode_session(encode_session(session))
+
+    assert len(restored.emotional_trend.history) < len(READINGS)
+    assert restored.emotional_trend.get_trend() == session.emotional_trend.get_trend()
+    assert restored.emotional_trend.get_emotion_distribution() == session.emotional_trend.get_emotion_distribution()
+
+    restored.emotional_trend.add_reading("happy", 0.5, 0.7)
+    session.emotional_trend.add_reading("happy", 0.5, 0.7)
+    assert restored.emotional_trend.get_trend() == session.emotional_trend.get_trend()
@@ -0,0 +1,119 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from agents.negotiation.analysis import AnalysisService
+from agents.negotiation.intent_rules import classify_intent
+from config.settings import settings
+from schemas.models import EmotionalContextModel
+from schemas.types import EmotionType, NegotiationIntent
+from src.infrastructure.monitoring import INTENT_CLASSIFICATIONS
+
+
+def _service():
+    service = AnalysisService(MagicMock())
+    service.analyze_emotion = AsyncMock(return_value=EmotionalContextModel(
+        primary_emotion=EmotionType.HAPPY,
+        intensity=0.6,
+        sentiment_score=0.7,
+        key_concerns=[],
+        recommended_tone="énergique",
+        recommended_strategy="closing",
+        detected_language="ma"
+    ))
+    service.detect_intent = AsyncMock(return_value={
+        "intent": NegotiationIntent.EXPRESS_CONCERN, "confidence": 0.7, "reasoning": "llm", "needs_clarification": False
+    })
+    return service
+
+
+def _count(source):
+    return INTENT_CLASSIFICATIONS.labels(source=source)._value.get()
+
+
+PRICE = 135000
+OFFER_TURN = [
+    {"speaker": "customer", "message": "C'est combien ?"},
+    {"speaker": "agent", "message": "Je peux vous la faire à 129 000 MAD, soit 2 450 MAD/mois."},
+]
+QUESTION_TURN = [{"speaker": "agent", "message": "Vous préférez la version diesel ou essence ?"}]
+
+
+@pytest.mark.parametrize("message, phase, expected", [
+    ("Bonjour !", "discovery", NegotiationIntent.GREETING),
+    ("Salam alaykoum", "discovery", NegotiationIntent.GREETING),
+    ("Wakha", "negotiation", NegotiationIntent.ACCEPT),
+    ("D’accord.", "closing", NegotiationIntent.ACCEPT),
+    ("Non merci", "negotiation", NegotiationIntent.REJECT),
+    ("Je vous propose 120k", "negotiation", NegotiationIntent.COUNTER_OFFER),
+    ("Mon offre c'est 125 000 MAD", "negotiation", NegotiationIntent.COUNTER_OFFER),
+])
+def test_rules_classify_unambiguous_messages(message, phase, expected):
+    result = classify_intent(message, phase, OFFER_TURN, PRICE)
+
+    assert result["intent"] == expected
+    assert result["needs_clarification"] is False
+
+
+@pytest.mark.parametrize("message, phase", [
+    ("Ok", "discovery"),  # nothing to accept yet
+    ("Ok", "negotiation"),  # bare acknowledgement, even after an offer
+    ("Safi", "negotiation"),
+    ("Bonjour, je cherche un SUV familial", "discovery"),
+    ("D'accord mais c'est un peu cher", "negotiation"),
+    ("Je propose de revenir demain", "negotiation"),  # no amount
+    ("Quel est le prix total pour 120000 ?", "negotiation"),
+    ("Je vous propose 2019 pour la Clio 2019", "negotiation"),  # a year, not a price
+    ("Je vous propose 20k", "negotiation"),  # far below the price
+])
+def test_rules_leave_ambiguous_messages_to_llm(message, phase):
+    assert classify_intent(message, phase, OFFER_TURN, PRICE) is None
+
+
+@pytest.mark.parametrize("message", ["D'accord", "Non merci"])
+def test_agreement_and_refusal_need_an_offer_on_the_table(message):
+    assert classify_intent(message, "negotiation") is None
+    assert classify_intent(message, "negotiation", QUESTION_TURN) is None
+    assert classify_intent(message, "negotiation", OFFER_TURN) is not None
+
+
+def test_counter_offer_needs_the_vehicle_price():
+    assert classify_intent("Je vous propose 120k", "negotiation", OFFER_TURN) is None
+
+
+@pytest.mark.asyncio
+async def test_fast_path_skips_llm_intent_detection():
+    service = _service()
+    rules_before = _count("rules")
+
+    emotion, intent = await service.analyze_turn("wakha", "negotiation", OFFER_TURN)
+
+    service.detect_intent.assert_not_called()
+    service.analyze_emotion.assert_awaited_once()
+    assert intent["intent"] == NegotiationIntent.ACCEPT
+    assert emotion.detected_language == "ma"
+    assert _count("rules") == rules_before + 1
+
+
+@pytest.mark.asyncio
+async def test_ambiguous_message_goes_to_llm():
+    service = _service()
+    llm_before = _count("llm")
+
+    _, intent = await service.analyze_turn("Wakha, mais chhal la garantie ?", "negotiation")
+
+    service.detect_intent.assert_awaited_once()
+    assert intent["intent"] == NegotiationIntent.EXPRESS_CONCERN
+    assert _count("llm") == llm_before + 1
+
+
+@pytest.mark.asyncio
+async def test_threshold_and_switch_gate_the_fast_path(monkeypatch):
+    service = _service()
+
+    monkeypatch.setattr(settings, "intent_fast_path_threshold", 0.99)
+    await service.analyze_turn("Non merci", "negotiation", OFFER_TURN)
+    assert service.detect_intent.await_count == 1
+
+    monkeypatch.setattr(settings, "intent_fast_path_threshold", 0.85)
+    monkeypatch.setattr(settings, "intent_fast_path_enabled", False)
+    await service.analyze_turn("Bonjour", "discovery")
+    assert service.detect_intent.await_count == 2
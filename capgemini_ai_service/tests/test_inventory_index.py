@@ -0,0 +1,142 @@
+import json
+import random
+import pytest
+from src.infrastructure.repositories.inventory import JSONFileInventoryRepository
+from src.infrastructure.repositories.inventory_index import InventoryIndex
+
+
+def _fleet(n=500, seed=7):
+    rng = random.Random(seed)
+    makes = ["Dacia", "Renault", "Peugeot", "Toyota", "Hyundai"]
+    fuels = ["Diesel", "Essence", "Hybride", "Électrique"]
+    return [
+        {
+            "id": str(i),
+            "vin": f"VIN{i:06d}",
+            "make": rng.choice(makes),
+            "model": f"Model {i}",
+            "year": rng.randint(2015, 2025),
+            "price": rng.randrange(80000, 600000, 500),
+            "specifications": {"fuelType": rng.choice(fuels), "seats": rng.choice([2, 4, 5, 7])}
+        }
+        for i in range(n)
+    ]
+
+
+def _linear_search(fleet, criteria):
+    """Reference implementation: the former linear scan"""
+    results = []
+    for car in fleet:
+        specs = car["specifications"]
+        if "max_price" in criteria and car["price"] > criteria["max_price"]:
+            continue
+        if "min_price" in criteria and car["price"] < criteria["min_price"]:
+            continue
+        if "make" in criteria and car["make"].lower() != criteria["make"].lower():
+            continue
+        if "min_year" in criteria and car["year"] < criteria["min_year"]:
+            continue
+        if "max_year" in criteria and car["year"] > criteria["max_year"]:
+            continue
+        if "fuel_type" in criteria and specs["fuelType"].lower() != criteria["fuel_type"].lower():
+            continue
+        if "min_seats" in criteria and specs["seats"] < criteria["min_seats"]:
+            continue
+        results.append(car)
+    return results
+
+
+@pytest.mark.parametrize("criteria", [
+    {},
+    {"max_price": 200000},
+    {"min_price": 150000, "max_price": 300000},
+    {"make": "dacia", "min_year": 2020},
+    {"fuel_type": "Diesel", "min_seats": 5, "max_price": 250000},
+    {"make": "Toyota", "fuel_type": "hybride", "min_year": 2018, "max_year": 2022, "min_seats": 7},
+    {"make": "Ferrari"},
+])
+def test_index_search_matches_linear_scan(criteria):
+    fleet = _fleet()
+    assert InventoryIndex(fleet).search(criteria) == _linear_search(fleet, criteria)
+
+
+def test_index_lookup_by_any_id_format():
+    fleet = _fleet(10) + [{"_id": "65ab12", "make": "Kia", "price": 150000}]
+    index = InventoryIndex(fleet)
+
+    assert index.get("3")["model"] == "Model 3"
+    assert index.get("VIN000003") is index.get(3)
+    assert index.get("65ab12")["make"] == "Kia"
+    assert index.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_repository_uses_index(tmp_path):
+    path = tmp_path / "inventory.json"
+    path.write_text(json.dumps(_fleet(50)), encoding="utf-8")
+    repo = JSONFileInventoryRepository(path)
+
+    assert (await repo.get_vehicle_by_id("VIN000042"))["id"] == "42"
+    cheap = await repo.search_vehicles({"max_price": 150000})
+    assert cheap and all(car["price"] <= 150000 for car in cheap)
+
+
+@pytest.mark.asyncio
+async def test_repository_hot_reloads_on_file_change(tmp_path):
+    """A changed file is picked up in the background; readers keep the old snapshot meanwhile"""
+    import asyncio
+    import os
+
+    path = tmp_path / "inventory.json"
+    path.write_text(json.dumps(_fleet(5)), encoding="utf-8")
+    repo = JSONFileInventoryRepository(path, poll_interval_seconds=0)
+
+    assert len(await repo.get_all_vehicles()) == 5
+    assert repo.snapshot_stats()["version"] == 1
+
+    path.write_text(json.dumps(_fleet(8)), encoding="utf-8")
+    os.utime(path, ns=(0, 10**9))  # make sure mtime differs on coarse filesystems
+
+    # The poll that notices the change still serves the current snapshot
+    assert len(await repo.get_all_vehicles()) == 5
+    for _ in range(50):
+        if repo.snapshot_stats()["version"] == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    assert len(await repo.get_all_vehicles()) == 8
+    assert await repo.get_vehicle_by_id("VIN000007") is not None
+
+
+@pytest.mark.asyncio
+async def test_repository_keeps_snapshot_on_half_written_file(tmp_path):
+    import asyncio
+
+    path = tmp_path / "inventory.json"
+    path.write_text(json.dumps(_fleet(5)), encoding="utf-8")
+    repo = JSONFileInventoryRepository(path, poll_interval_seconds=0)
+    await repo.get_all_vehicles()
+
+    path.write_text('[{"id": "1", "make": "Dac', encoding="utf-8")
+    await repo.get_all_vehicles()
+    await asyncio.sleep(0.05)
+
+    assert len(await repo.get_all_vehicles()) == 5
+    assert repo.snapshot_stats()["version"] == 1
+
+
+@pytest.mark.asyncio
+async def test_repository_keeps_snapshot_while_file_is_missing(tmp_path):
+    import asyncio
+
+    path = tmp_path / "inventory.json"
+    path.write_text(json.dumps(_fleet(5)), encoding="utf-8")
+    repo = JSONFileInventoryRepository(path, poll_interval_seconds=0)
+    await repo.get_all_vehicles()
+
+    path.unlink()
+    await repo.get_all_vehicles()
+    await asyncio.sleep(0.05)
+
+    assert len(await repo.get_all_vehicles()) == 5
+    assert repo.snapshot_stats()["version"] == 1
@@ -0,0 +1,56 @@
+import json
+import re
+import pytest
+from pathlib import Path
+from agents.inventory_agent import InventoryMatchingAgent
+from agents.inventory_ranking import InventoryRanker
+
+INVENTORY = json.loads((Path(__file__).parent.parent / "data" / "inventory.json").read_text(encoding="utf-8"))
+
+
+def test_family_profile_prefers_seven_seaters():
+    ranked = InventoryRanker().rank(INVENTORY, {"segment": "Famille", "priorities": ["Espace", "Sécurité"], "monthly_budget": 4000}, top_k=3)
+
+    assert all(v["specifications"]["seats"] == 7 for v, _ in ranked)
+    scores = [score for _, score in ranked]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_budget_caps_ranking():
+    ranked = InventoryRanker().rank(INVENTORY, {"segment": "Étudiant", "price_sensitivity": "High", "monthly_budget": 2000}, top_k=3)
+
+    assert all(v["price"] <= 2000 * 60 * 1.2 for v, _ in ranked)
+
+
+def test_economy_priority_boosts_electric_and_hybrid():
+    ranker = InventoryRanker()
+    ranked = ranker.rank(INVENTORY, {"segment": "Tech", "priorities": ["Économie de carburant"]}, top_k=3)
+
+    assert {v["specifications"]["fuelType"] for v, _ in ranked} <= {"Électrique", "Hybride", "Diesel"}
+    assert ranker.score([], {}).size == 0
+
+
+@pytest.mark.asyncio
+async def test_find_matches_sends_top_k_and_falls_back_on_ranking(monkeypatch):
+    from config.settings import settings
+    monkeypatch.setattr(settings, "inventory_prompt_top_k", 5)
+
+    prompts = []
+
+    def failing_llm(prompt_value):
+        prompts.append(prompt_value.to_string())
+        raise RuntimeError("LLM down")
+
+    agent = InventoryMatchingAgent()
+    agent.llm = failing_llm
+    profile = {"segment": "Famille", "priorities": ["Espace"], "monthly_budget": 4000}
+
+    result = await agent.find_matches(profile, inventory=INVENTORY, bypass_cache=True)
+
+    sent = re.findall(r"ID: (\S+) \|", prompts[0])
+    top_k = InventoryRanker().rank(INVENTORY, profile, top_k=5)
+    assert sent == [str(v.get("vin") or v["id"]) for v, _ in top_k]
+
+    expected = InventoryRanker().rank(INVENTORY, profile, top_k=3)
+    assert [m["vehicle_id"] for m in result["matches"]] == [v["id"] for v, _ in expected]
+    assert result["matches"][0]["match_score"] == round(expected[0][1])
@@ -0,0 +1,37 @@
+import importlib
+import os
+import subprocess
+import sys
+
+import pytest
+import agents
+from agents import get_agent
+
+
+def test_importing_app_does_not_build_agents():
+    """main.py must not pull in the agents, the Groq SDK or langgraph at import"""
+    code = (
+        "import sys, main; "
+        "print(sorted(m for m in ('agents.negotiation.agent', 'agents.orchestrator_agent', "
+        "'langchain_groq', 'langgraph') if m in sys.modules))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "GROQ_API_KEY": os.environ.get("GROQ_API_KEY", "dummy")}
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, env=env, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_agent_names_resolve_to_singletons():
+    module = importlib.import_module("agents.valuation_agent")
+
+    from agents import valuation_agent
+
+    assert valuation_agent is module.valuation_agent
+    assert agents.valuation_agent is get_agent("valuation_agent")
+    assert type(agents.valuation_agent).__name__ == "ValuationAgent"
+
+
+def test_unknown_agent_name_raises_attribute_error():
+    with pytest.raises(AttributeError, match="pricing_agent"):
+        get_agent("pricing_agent")
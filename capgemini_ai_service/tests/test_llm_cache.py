@@ -0,0 +1,51 @@
+import pytest
+from unittest.mock import AsyncMock
+from core.llm_cache import InMemoryLLMCache, make_cache_key
+
+
+def test_cache_key_normalizes_inputs():
+    assert make_cache_key("ns", {"make": " Dacia ", "year": 2020.0}) == make_cache_key("ns", {"year": 2020, "make": "dacia"})
+    assert make_cache_key("ns", {"make": "Dacia"}) != make_cache_key("other", {"make": "Dacia"})
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_hits_after_first_call():
+    cache = InMemoryLLMCache()
+    compute = AsyncMock(return_value={"analysis": "Forte demande"})
+
+    first = await cache.get_or_compute("valuation_analysis", {"model": "Duster"}, compute, ttl=60)
+    second = await cache.get_or_compute("valuation_analysis", {"model": "Duster"}, compute, ttl=60)
+
+    assert first == second == {"analysis": "Forte demande"}
+    assert compute.await_count == 1
+    assert cache.stats()["valuation_analysis"]["hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_bypass_and_failures_are_not_cached():
+    cache = InMemoryLLMCache()
+    failing = AsyncMock(side_effect=RuntimeError("429"))
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compute("deal_naming", {"segment": "Famille"}, failing, ttl=60)
+    assert len(cache) == 0
+
+    compute = AsyncMock(return_value="ok")
+    await cache.get_or_compute("deal_naming", {"segment": "Famille"}, compute, ttl=60, bypass=True)
+    assert len(cache) == 0
+    assert cache.stats()["deal_naming"]["bypass"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_ttl_expiry():
+    cache = InMemoryLLMCache(max_entries=2)
+    await cache.set("a", 1, ttl=60)
+    await cache.set("b", 2, ttl=60)
+    await cache.get("a")  # "b" becomes least recently used
+    await cache.set("c", 3, ttl=60)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+
+    await cache.set("expired", 4, ttl=-1)
+    assert await cache.get("expired") is None
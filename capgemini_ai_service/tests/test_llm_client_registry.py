@@ -0,0 +1,41 @@
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_groq import ChatGroq
+from agents import get_llm
+from src.infrastructure.llm.client_registry import close_clients, get_chat_model, get_http_clients, registry_stats
+
+
+def test_same_configuration_shares_one_client():
+    assert get_llm() is get_llm()
+    assert get_chat_model(temperature=0.3, max_tokens=1500) is get_chat_model(temperature=0.3, max_tokens=1500)
+
+
+def test_overrides_share_the_connection_pool():
+    _, http_async_client = get_http_clients()
+
+    focused = get_chat_model(temperature=0.1, max_tokens=64)
+    creative = get_chat_model(temperature=0.9, max_tokens=64)
+
+    assert focused is not creative
+    assert focused.http_async_client is http_async_client
+    assert creative.http_async_client is http_async_client
+    assert {"model": focused.model_name, "temperature": 0.1, "max_tokens": 64} in registry_stats()["clients"]
+
+
+@pytest.mark.asyncio
+async def test_clients_held_by_agents_survive_close_clients(monkeypatch):
+    model = get_chat_model(temperature=0.2, max_tokens=32)
+    pools = []
+
+    async def fake_agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        pools.append(self.http_async_client)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="ok"))])
+
+    monkeypatch.setattr(ChatGroq, "_agenerate", fake_agenerate)
+    await close_clients()
+
+    assert (await model.ainvoke("Bonjour")).content == "ok"
+    assert not pools[0].is_closed
+    assert pools[0] is get_http_clients()[1]
+    assert model.async_client._client._client is pools[0]
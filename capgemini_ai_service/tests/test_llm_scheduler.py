@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from src.infrastructure.llm.scheduler import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    LLMScheduler,
+    priority_for,
+)
+
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: str):
+        super().__init__("Error code: 429 - rate limit reached")
+        self.response = SimpleNamespace(headers={"retry-after": retry_after})
+
+
+@pytest.mark.asyncio
+async def test_high_priority_calls_are_admitted_first():
+    scheduler = LLMScheduler(requests_per_minute=600, tokens_per_minute=0, max_jitter=0)
+    scheduler.requests.level = 0  # budget exhausted: callers must queue
+    order = []
+
+    async def call(name, priority):
+        await scheduler.acquire(priority)
+        order.append(name)
+
+    low = asyncio.create_task(call("deal_naming", PRIORITY_LOW))
+    await asyncio.sleep(0)
+    high = asyncio.create_task(call("negotiation_reply", PRIORITY_HIGH))
+    await asyncio.gather(low, high)
+
+    assert order == ["negotiation_reply", "deal_naming"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_honors_retry_after_then_succeeds():
+    scheduler = LLMScheduler(requests_per_minute=0, tokens_per_minute=0, max_jitter=0)
+    attempts = []
+
+    async def call():
+        attempts.append(asyncio.get_running_loop().time())
+        if len(attempts) == 1:
+            raise FakeRateLimitError(retry_after="0.2")
+        return "ok"
+
+    assert await scheduler.run(call) == "ok"
+    assert attempts[1] - attempts[0] >= 0.2
+    assert scheduler.stats()["rate_limited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_non_transient_errors_are_not_retried():
+    scheduler = LLMScheduler(requests_per_minute=0, tokens_per_minute=0)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        await scheduler.run(call)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_token_estimate_is_reconciled_with_usage():
+    scheduler = LLMScheduler(requests_per_minute=0, tokens_per_minute=6000)
+
+    async def call():
+        return {"total_tokens": 300}
+
+    await scheduler.run(call, tokens=1000, usage=lambda result: result["total_tokens"])
+
+    assert scheduler.tokens.level == pytest.approx(5700, abs=5)
+
+
+def test_prompt_types_map_to_priorities():
+    assert priority_for("negotiation_reply") == PRIORITY_HIGH
+    assert priority_for("deal_naming") == PRIORITY_LOW
@@ -0,0 +1,69 @@
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+from prometheus_client import REGISTRY
+from main import app
+from src.infrastructure.monitoring import llm_config, llm_metrics_callback, mark_worker_dead
+from src.infrastructure.repositories.session import InMemorySessionStore
+from src.domain.negotiation.entities import NegotiationSession
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_llm_callback_records_latency_and_tokens():
+    message = AIMessage(
+        content="ok",
+        usage_metadata={"input_tokens": 120, "output_tokens": 8, "total_tokens": 128}
+    )
+    llm = GenericFakeChatModel(messages=iter([message]), callbacks=[llm_metrics_callback])
+    chain = ChatPromptTemplate.from_template("{q}") | llm
+
+    calls_before = _sample("llm_call_duration_seconds_count", prompt_type="test_prompt", model="unknown")
+    tokens_before = _sample("llm_tokens_per_call_sum", prompt_type="test_prompt", kind="prompt")
+
+    await chain.ainvoke({"q": "hello"}, config=llm_config("test_prompt"))
+
+    assert _sample("llm_call_duration_seconds_count", prompt_type="test_prompt", model="unknown") == calls_before + 1
+    assert _sample("llm_tokens_per_call_sum", prompt_type="test_prompt", kind="prompt") == tokens_before + 120
+
+
+@pytest.mark.asyncio
+async def test_session_store_ops_are_timed():
+    store = InMemorySessionStore()
+    before = _sample(
+        "session_store_operation_duration_seconds_count",
+        backend="InMemorySessionStore", operation="save"
+    )
+
+    await store.save(NegotiationSession(session_id="metrics-1", customer_id="c1"))
+
+    assert _sample(
+        "session_store_operation_duration_seconds_count",
+        backend="InMemorySessionStore", operation="save"
+    ) == before + 1
+    assert _sample("active_sessions") == 1
+
+
+def test_prometheus_endpoint_exposes_http_latency():
+    client = TestClient(app)
+    client.get("/metrics")
+
+    response = client.get("/metrics/prometheus")
+
+    assert response.status_code == 200
+    assert 'http_request_duration_seconds_count{endpoint="/metrics",method="GET",status="200"}' in response.text
+
+
+def test_dead_worker_gauges_are_removed(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    for name in ["gauge_livesum_123.db", "gauge_livemax_123.db", "gauge_livesum_456.db", "counter_123.db"]:
+        (tmp_path / name).write_bytes(b"")
+
+    mark_worker_dead(123)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["counter_123.db", "gauge_livesum_456.db"]
@@ -0,0 +1,75 @@
+import asyncio
+import importlib
+import time
+import pytest
+from types import SimpleNamespace
+from agents.orchestrator_agent import OrchestratorAgent
+
+# `agents.orchestrator_agent` is shadowed by the singleton re-exported from agents/__init__
+orchestrator_module = importlib.import_module("agents.orchestrator_agent")
+
+
+@pytest.fixture
+def slow_agents(monkeypatch):
+    """Replace the downstream agents with slow, deterministic fakes; returns their (start, end) times"""
+    intervals = {}
+
+    async def analyze_profile(history, prefs):
+        start = time.perf_counter()
+        await asyncio.sleep(0.05)
+        intervals["profile"] = (start, time.perf_counter())
+        return {"segment": "Famille", "confidence_score": 0.8, "monthly_budget": 3500}
+
+    async def valuate(request):
+        start = time.perf_counter()
+        await asyncio.sleep(0.05)
+        intervals["valuation"] = (start, time.perf_counter())
+        return SimpleNamespace(
+            model_dump=lambda: {"estimated_value": 60000},
+            agent_steps=[{"agent_name": "Valuation Agent", "action": "Évaluation"}]
+        )
+
+    async def find_matches(profile, inventory=None):
+        return {"matches": [{"vehicle_id": "1", "price": 200000, "make": "Dacia", "model": "Jogger"}]}
+
+    async def structure_deal(price, trade_in_value, profile):
+        return {"options": [{"monthly_payment": 3000, "duration_months": 60}]}
+
+    monkeypatch.setattr(orchestrator_module.profiling_agent, "analyze_profile", analyze_profile)
+    monkeypatch.setattr(orchestrator_module.valuation_agent, "valuate", valuate)
+    monkeypatch.setattr(orchestrator_module.inventory_agent, "find_matches", find_matches)
+    monkeypatch.setattr(orchestrator_module.deal_agent, "structure_deal", structure_deal)
+    return intervals
+
+
+@pytest.mark.asyncio
+async def test_profile_and_valuation_run_in_parallel(slow_agents):
+    inputs = {
+        "customer_id": "cust_1",
+        "trade_in_id": "trade_1",
+        "trade_in_data": {"make": "Renault", "model": "Clio", "year": 2018, "mileage": 90000, "condition": "Bon"},
+        "preferences": {"monthly_budget": 3500}
+    }
+
+    result = await OrchestratorAgent().run_flow(inputs)
+
+    # Each branch started before the other one finished
+    starts, ends = zip(*slow_agents.values())
+    assert len(starts) == 2
+    assert max(starts) < min(ends)
+    assert result["valuation_result"]["estimated_value"] == 60000
+    assert result["customer_profile"]["segment"] == "Famille"
+    # Reducer keeps the steps of both branches plus the downstream nodes
+    agents = [s["agent_name"] for s in result["agent_steps"]]
+    assert sorted(agents) == ["Deal Agent", "Inventory Agent", "Profiling Agent", "Valuation Agent"]
+    assert agents[-2:] == ["Inventory Agent", "Deal Agent"]
+    assert result["trade_in_context"]["value"] == 60000
+
+
+@pytest.mark.asyncio
+async def test_flow_without_trade_in_still_joins(slow_agents):
+    result = await OrchestratorAgent().run_flow({"customer_id": "cust_2", "preferences": {}})
+
+    assert result["status"] == "ready_for_negotiation"
+    assert "valuation_result" not in result or not result["valuation_result"]
+    assert [s["agent_name"] for s in result["agent_steps"]] == ["Profiling Agent", "Inventory Agent", "Deal Agent"]
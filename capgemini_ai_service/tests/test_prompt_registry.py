@@ -0,0 +1,43 @@
+from langchain_core.output_parsers import JsonOutputParser
+from pydantic import BaseModel
+
+from src.infrastructure.llm.prompt_registry import PromptRegistry, format_instructions_for
+
+
+class Answer(BaseModel):
+    value: int
+
+
+def test_prompt_is_built_once_with_bound_format_instructions():
+    registry = PromptRegistry()
+    parser = JsonOutputParser(pydantic_object=Answer)
+
+    prompt = registry.register("answer", "Q: {question}\n{format_instructions}", parser=parser)
+    again = registry.register("answer", "ignored {other}")
+
+    assert again is prompt
+    assert prompt.input_variables == ["question"]
+    text = prompt.format(question="2+2?")
+    assert parser.get_format_instructions() in text
+    assert registry.stats() == {"answer": ["question"]}
+
+
+def test_partials_are_values_not_templates():
+    registry = PromptRegistry()
+    prompt = registry.register("greet", "{intro} {name}", intro="Salut {pas une variable}")
+
+    assert prompt.format(name="Karim") == "Human: Salut {pas une variable} Karim"
+
+
+def test_format_instructions_are_cached_per_schema():
+    assert format_instructions_for(Answer) is format_instructions_for(Answer)
+
+
+def test_agents_register_their_prompts():
+    from agents import negotiation_agent  # noqa: F401  (builds every agent)
+    from src.infrastructure.llm.prompt_registry import get_prompt_registry
+
+    names = get_prompt_registry().names()
+    for name in ("emotion", "intent", "turn_analysis", "negotiation_reply.negotiation",
+                 "profiling.fr", "inventory_match", "deal_naming", "valuation_analysis"):
+        assert name in names
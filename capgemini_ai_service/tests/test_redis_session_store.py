@@ -0,0 +1,245 @@
+import time
+
+import pytest
+from src.domain.negotiation.entities import NegotiationSession
+from src.infrastructure.repositories.serialization import encode_value
+from src.infrastructure.repositories.session import AppendLogRedisSessionStore, RedisSessionStore
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio commands the session stores use"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.executed = []
+        self.last_commands = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    # Strings
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    # Keys
+    def delete(self, *keys):
+        deleted = sum(1 for key in keys if key in self.data)
+        for key in keys:
+            self.data.pop(key, None)
+            self.ttls.pop(key, None)
+        return deleted
+
+    def expire(self, key, ttl):
+        if key not in self.data:
+            return False
+        self.ttls[key] = ttl
+        return True
+
+    # Hashes
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    # Lists
+    def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(values)
+        return len(self.data[key])
+
+    def ltrim(self, key, start, end):
+        values = self.data.get(key, [])
+        size = len(values)
+        start, end = (start + size if start < 0 else start), (end + size if end < 0 else end)
+        self.data[key] = values[max(start, 0):end + 1]
+        return True
+
+    def lrange(self, key, start, end):
+        values = self.data.get(key, [])
+        return values[start:] if end == -1 else values[start:end + 1]
+
+    # Sets
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+        return len(members)
+
+    async def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    async def srem(self, key, *members):
+        self.data.get(key, set()).difference_update(members)
+        return len(members)
+
+    # Sorted sets
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    def zrem(self, key, *members):
+        zset = self.data.get(key, {})
+        return sum(1 for member in members if zset.pop(member, None) is not None)
+
+    def zremrangebyscore(self, key, low, high):
+        zset = self.data.get(key, {})
+        low, high = float(low), float(high)
+        expired = [member for member, score in zset.items() if low <= score <= high]
+        for member in expired:
+            del zset[member]
+        return len(expired)
+
+    def zrange(self, key, start, end):
+        members = sorted(self.data.get(key, {}).items(), key=lambda item: item[1])
+        return [member for member, _ in (members[start:] if end == -1 else members[start:end + 1])]
+
+
+class FakePipeline:
+    """Queues commands and runs them against the FakeRedis on execute()"""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        self._redis.executed.append([name for name, _, _ in self._commands])
+        self._redis.last_commands = self._commands
+        replies = []
+        for name, args, kwargs in self._commands:
+            reply = getattr(self._redis, name)(*args, **kwargs)
+            replies.append(await reply if hasattr(reply, "__await__") else reply)
+        self._commands = []
+        return replies
+
+
+def _store(store_cls=RedisSessionStore, **kwargs):
+    store = store_cls(ttl_seconds=600, **kwargs)
+    store._redis = FakeRedis()
+    return store
+
+
+def _session(session_id: str, customer_id: str = "cust-1") -> NegotiationSession:
+    return NegotiationSession(session_id=session_id, customer_id=customer_id)
+
+
+@pytest.mark.asyncio
+async def test_save_is_one_pipelined_round_trip():
+    store = _store()
+
+    await store.save(_session("s1"))
+
+    assert store._redis.executed == [["setex", "zadd", "sadd", "expire"]]
+    assert (await store.get("s1")).customer_id == "cust-1"
+    assert store._redis.ttls[store._key("s1")] == 600
+
+
+@pytest.mark.asyncio
+async def test_list_active_prunes_expired_sessions():
+    store = _store()
+    for session_id, customer_id in [("s1", "cust-1"), ("s2", "cust-1"), ("s3", "cust-2")]:
+        await store.save(_session(session_id, customer_id))
+    finalized = _session("s4", "cust-1")
+    finalized.status = "accepted"
+    await store.save(finalized)
+
+    # s1 expires: its key is gone and its index score is in the past
+    redis = store._redis
+    redis.delete(store._key("s1"))
+    redis.data[store._active_key]["s1"] = time.time() - 1
+
+    assert sorted(s.session_id for s in await store.list_active()) == ["s2", "s3"]
+    assert sorted(redis.data[store._active_key]) == ["s2", "s3"]
+
+    assert sorted(s.session_id for s in await store.list_active(customer_id="cust-1")) == ["s2"]
+    assert redis.data[store._customer_key("cust-1")] == {"s2", "s4"}
+
+
+@pytest.mark.asyncio
+async def test_list_active_batches_mget(monkeypatch):
+    store = _store()
+    monkeypatch.setattr(RedisSessionStore, "MGET_BATCH_SIZE", 2)
+    for i in range(5):
+        await store.save(_session(f"s{i}"))
+    batches = []
+    mget = store._redis.mget
+
+    async def counting_mget(keys):
+        batches.append(len(keys))
+        return await mget(keys)
+
+    store._redis.mget = counting_mget
+
+    assert len(await store.list_active()) == 5
+    assert batches == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_session_and_index_entry():
+    store = _store()
+    await store.save(_session("s1"))
+
+    assert await store.delete("s1") is True
+    assert await store.get("s1") is None
+    assert "s1" not in store._redis.data[store._active_key]
+    assert await store.delete("s1") is False
+
+
+@pytest.mark.asyncio
+async def test_append_log_store_round_trip():
+    store = _store(AppendLogRedisSessionStore, history_window=2)
+    redis = store._redis
+    session = _session("s1")
+    for text in ("Bonjour", "Je cherche un SUV", "Quel prix ?"):
+        session.add_message("customer", text, emotion="neutral")
+    await store.save(session)
+
+    loaded = await store.get("s1")
+    assert [m["message"] for m in loaded.conversation_history] == ["Je cherche un SUV", "Quel prix ?"]
+
+    loaded.add_message("agent", "Voici mon offre")
+    await store.save(loaded)
+
+    pushes = [args for name, args, _ in redis.last_commands if name == "rpush"]
+    assert pushes == [(store._log_key("s1", "conversation_history"), encode_value(loaded.conversation_history[-1]))]
+    full = await store.get_full("s1")
+    assert [m["message"] for m in full.conversation_history] == [
+        "Bonjour", "Je cherche un SUV", "Quel prix ?", "Voici mon offre"
+    ]
+
+    assert await store.delete("s1") is True
+    assert [key for key in redis.data if key.startswith(store._key("s1"))] == []
+    assert "s1" not in redis.data[store._active_key]
+
+
+@pytest.mark.asyncio
+async def test_append_log_store_keeps_emotion_log_bounded():
+    store = _store(AppendLogRedisSessionStore, history_window=20)
+    await store.save(_session("s1"))
+
+    for turn in range(120):
+        session = await store.get("s1")
+        session.emotional_trend.add_reading("neutral", 0.5, 0.0, f"turn {turn}")
+        await store.save(session)
+
+    log = store._redis.data[store._log_key("s1", "emotional_trend_history")]
+    assert len(log) == session.emotional_trend.max_history
+    assert (await store.get_full("s1")).emotional_trend.history[-1]["message"] == "turn 119"
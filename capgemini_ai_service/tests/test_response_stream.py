@@ -0,0 +1,137 @@
+import pytest
+from unittest.mock import MagicMock
+from types import SimpleNamespace
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from agents.negotiation.agent import negotiation_agent
+from agents.negotiation.response import ResponseGenerator
+from schemas.models import EmotionalContextModel, NegotiationRequestModel, NegotiationResponseModel
+from schemas.types import EmotionType, NegotiationIntent
+
+
+def _emotion():
+    return EmotionalContextModel(
+        primary_emotion=EmotionType.NEUTRAL,
+        intensity=0.5,
+        sentiment_score=0.0,
+        key_concerns=[],
+        recommended_tone="professionnel",
+        recommended_strategy="build_rapport",
+        detected_language="fr"
+    )
+
+
+def _response_kwargs(**overrides):
+    kwargs = dict(
+        customer_msg="C'est trop cher",
+        emotion=_emotion(),
+        new_offer={"price": 150000, "monthly": 2500, "duration": 60},
+        car_name="Dacia Duster",
+        needs_str="",
+        phase="negotiation",
+        reasoning="Concession légère",
+        session=SimpleNamespace(negotiated_price=None, payment_preference=None)
+    )
+    kwargs.update(overrides)
+    return kwargs
+
+
+@pytest.mark.asyncio
+async def test_stream_response_yields_chunks():
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="Je peux faire 150000 MAD.")]))
+    generator = ResponseGenerator(llm)
+
+    chunks = [chunk async for chunk in generator.stream_response(**_response_kwargs())]
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == "Je peux faire 150000 MAD."
+
+
+@pytest.mark.asyncio
+async def test_stream_response_falls_back_on_llm_error():
+    generator = ResponseGenerator(GenericFakeChatModel(messages=iter([])))
+
+    chunks = [chunk async for chunk in generator.stream_response(**_response_kwargs())]
+
+    assert len(chunks) == 1
+    assert "150,000 MAD" in chunks[0]
+
+
+@pytest.mark.asyncio
+async def test_negotiate_stream_ends_with_final_event(monkeypatch):
+    """Tokens are relayed as they come, the final event carries the full turn"""
+    async def fake_analyze_turn(message, phase, recent_messages=None, vehicle_price=None):
+        return _emotion(), {"intent": NegotiationIntent.INQUIRY, "confidence": 0.9, "reasoning": "", "needs_clarification": False}
+
+    async def fake_stream_response(**kwargs):
+        for chunk in ["Bonjour, ", "que ", "cherchez-vous ?"]:
+            yield chunk
+
+    monkeypatch.setattr(negotiation_agent.analysis, "analyze_turn", fake_analyze_turn)
+    monkeypatch.setattr(negotiation_agent.response, "stream_response", fake_stream_response)
+
+    request = NegotiationRequestModel(
+        session_id="stream_test",
+        customer_message="Bonjour",
+        vehicle_context={"vehicle_id": "1", "name": "Dacia Duster", "price": 160000, "cost": 140000}
+    )
+    events = [event async for event in negotiation_agent.negotiate_stream(request)]
+
+    assert [e["data"] for e in events[:-1]] == ["Bonjour, ", "que ", "cherchez-vous ?"]
+    final = events[-1]
+    assert final["event"] == "final"
+    assert isinstance(final["data"], NegotiationResponseModel)
+    assert final["data"].agent_message == "Bonjour, que cherchez-vous ?"
+    assert final["data"].vehicle_card.name == "Dacia Duster"
+    assert final["data"].agent_steps
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("save_fails, outcome", [
+    (False, "negotiation_stream_turn_completed_after_disconnect"),
+    (True, "negotiation_stream_turn_failed"),
+])
+async def test_turn_outcome_is_logged_after_client_disconnect(monkeypatch, save_fails, outcome):
+    import asyncio
+    import importlib
+    agent_module = importlib.import_module("agents.negotiation.agent")
+    release = asyncio.Event()
+    saved = []
+
+    async def fake_analyze_turn(message, phase, recent_messages=None, vehicle_price=None):
+        return _emotion(), {"intent": NegotiationIntent.INQUIRY, "confidence": 0.9, "reasoning": "", "needs_clarification": False}
+
+    async def fake_stream_response(**kwargs):
+        yield "Bonjour, "
+        await release.wait()
+        yield "que cherchez-vous ?"
+
+    async def fake_save_session(session):
+        if save_fails:
+            raise RuntimeError("store down")
+        saved.append(session.session_id)
+
+    logger = MagicMock()
+    monkeypatch.setattr(agent_module, "logger", logger)
+    monkeypatch.setattr(negotiation_agent.analysis, "analyze_turn", fake_analyze_turn)
+    monkeypatch.setattr(negotiation_agent.response, "stream_response", fake_stream_response)
+    monkeypatch.setattr(negotiation_agent, "_save_session", fake_save_session)
+
+    request = NegotiationRequestModel(
+        session_id="stream_disconnect",
+        customer_message="Bonjour",
+        vehicle_context={"vehicle_id": "1", "name": "Dacia Duster", "price": 160000, "cost": 140000}
+    )
+    stream = negotiation_agent.negotiate_stream(request)
+    assert (await stream.__anext__())["data"] == "Bonjour, "
+    await stream.aclose()
+
+    (turn,) = negotiation_agent._abandoned_turns
+    release.set()
+    await asyncio.wait([turn])
+    await asyncio.sleep(0)
+
+    assert not negotiation_agent._abandoned_turns
+    assert saved == ([] if save_fails else ["stream_disconnect"])
+    logged = [c.args[0] for c in logger.info.call_args_list + logger.error.call_args_list]
+    assert outcome in logged
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+from src.domain.negotiation.entities import SESSION_SCHEMA_VERSION, NegotiationSession
+from src.infrastructure.repositories.serialization import (
+    LOG_FIELDS,
+    decode_session,
+    encode_session,
+    session_from_data,
+    split_session,
+)
+from src.infrastructure.repositories.session import AppendLogRedisSessionStore
+
+
+def _session() -> NegotiationSession:
+    session = NegotiationSession(session_id="ser-1", customer_id="cust-1")
+    session.conversation_history = [{"role": "user", "content": "Bonjour"}]
+    session.offer_history = [{"monthly": 3200, "duration": 60}]
+    session.payment_preference = "cash"
+    session.repeated_intents = ["NEGOTIATE", "NEGOTIATE"]
+    session.frustration_level = 4
+    session.customer_profile.segment = "Family"
+    session.emotional_trend.add_reading("positive", 0.8, 0.6, "Bonjour")
+    return session
+
+
+def test_round_trip_keeps_all_fields():
+    session = _session()
+
+    restored = decode_session(encode_session(session))
+
+    assert restored.conversation_history == session.conversation_history
+    assert restored.offer_history == session.offer_history
+    assert restored.payment_preference == "cash"
+    assert restored.repeated_intents == ["NEGOTIATE", "NEGOTIATE"]
+    assert restored.frustration_level == 4
+    assert restored.customer_profile.segment == "Family"
+    assert restored.emotional_trend.history == session.emotional_trend.history
+    assert restored.updated_at == session.updated_at
+
+
+def test_to_dict_is_versioned_and_shallow():
+    session = _session()
+
+    data = session.to_dict()
+
+    assert data["schema_version"] == SESSION_SCHEMA_VERSION
+    assert "emotional_trend" not in data
+    # No deep copy of the history on every save
+    assert data["conversation_history"] is session.conversation_history
+
+
+def test_decodes_v1_payload_and_rejects_newer_versions():
+    data = _session().to_dict()
+    del data["schema_version"]
+    assert decode_session(json.dumps(data)).session_id == "ser-1"
+
+    data["schema_version"] = SESSION_SCHEMA_VERSION + 1
+    with pytest.raises(ValueError):
+        decode_session(json.dumps(data))
+
+
+def test_append_log_store_only_pushes_new_entries():
+    store = AppendLogRedisSessionStore(history_window=5)
+    session = _session()
+    _, logs = split_session(session)
+
+    # Never saved: everything is written
+    assert store._pending_logs(session, logs)["conversation_history"] == (True, session.conversation_history)
+
+    store._mark_persisted(session, logs)
+    session.add_message("agent", "Voici mon offre")
+    pending = store._pending_logs(session, split_session(session)[1])
+
+    assert pending["conversation_history"] == (False, [session.conversation_history[-1]])
+    assert pending["offer_history"] == (False, [])
+
+    # A replaced log is rewritten from the session
+    session.offer_history = session.offer_history[-1:]
+    assert store._pending_logs(session, split_session(session)[1])["offer_history"][0] is True
+
+
+def test_split_session_reassembles():
+    session = _session()
+    state, logs = split_session(session)
+
+    assert set(logs) == set(LOG_FIELDS)
+    assert "conversation_history" not in state
+
+    restored = session_from_data({**state, **logs})
+    assert restored.offer_history == session.offer_history
+    assert restored.emotional_trend.history == session.emotional_trend.history
+
+
+def test_append_log_store_rewrites_trimmed_emotion_history():
+    store = AppendLogRedisSessionStore()
+    session = _session()
+    session.emotional_trend.max_history = 2
+    store._mark_persisted(session, split_session(session)[1])
+
+    for _ in range(4):
+        session.emotional_trend.add_reading("neutral", 0.5, 0.0)
+    rewrite, entries = store._pending_logs(session, split_session(session)[1])["emotional_trend_history"]
+
+    assert rewrite is True
+    assert entries == session.emotional_trend.history
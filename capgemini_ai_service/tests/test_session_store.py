@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+import pytest
+from src.domain.negotiation.entities import NegotiationSession
+from src.infrastructure.repositories.session import InMemorySessionStore
+
+
+def _session(session_id: str) -> NegotiationSession:
+    return NegotiationSession(session_id=session_id, customer_id="cust-1")
+
+
+@pytest.mark.asyncio
+async def test_expired_sessions_are_dropped_from_the_front():
+    store = InMemorySessionStore(ttl_minutes=60)
+    for session_id in ("old-1", "old-2", "fresh"):
+        await store.save(_session(session_id))
+    for session_id in ("old-1", "old-2"):
+        store._sessions[session_id].updated_at = datetime.now() - timedelta(hours=2)
+
+    await store.save(_session("new"))
+
+    assert list(store._sessions) == ["fresh", "new"]
+    assert store.stats()["approx_bytes"] == 2 * InMemorySessionStore.SESSION_BASE_BYTES
+
+
+@pytest.mark.asyncio
+async def test_least_recently_saved_session_is_evicted():
+    store = InMemorySessionStore(max_sessions=2)
+    first, second = _session("s1"), _session("s2")
+    await store.save(first)
+    await store.save(second)
+    await store.save(first)  # s1 is now the most recent
+
+    await store.save(_session("s3"))
+
+    assert await store.get("s2") is None
+    assert await store.get("s1") is first
+    assert len(await store.list_active()) == 2
+
+
+@pytest.mark.asyncio
+async def test_byte_limit_counts_history():
+    store = InMemorySessionStore(max_bytes=5 * InMemorySessionStore.SESSION_BASE_BYTES // 2)
+    big = _session("big")
+    for i in range(4):
+        big.add_message("user", f"message {i}")
+    await store.save(big)
+
+    await store.save(_session("small"))
+
+    assert list(store._sessions) == ["small"]
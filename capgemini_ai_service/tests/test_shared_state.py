@@ -0,0 +1,66 @@
+import pytest
+from config.settings import settings
+from core import llm_cache
+from src.infrastructure.llm import scheduler
+from src.infrastructure.repositories import session
+from src.infrastructure.repositories.session import InMemorySessionStore, RedisSessionStore
+
+
+@pytest.fixture
+def fresh_singletons(monkeypatch):
+    monkeypatch.setattr(session, "_store_instance", None)
+    monkeypatch.setattr(llm_cache, "_cache_instance", None)
+    monkeypatch.setattr(scheduler, "_scheduler_instance", None)
+
+
+def test_auto_backends_follow_redis_url(monkeypatch):
+    monkeypatch.setattr(settings, "redis_url", "")
+    assert not settings.uses_redis("auto")
+    assert settings.uses_redis("redis")
+
+    monkeypatch.setattr(settings, "redis_url", "redis://cache:6379/0")
+    assert settings.uses_redis("auto")
+    assert not settings.uses_redis("memory")
+
+
+def test_stores_are_shared_when_redis_url_is_set(monkeypatch, fresh_singletons):
+    monkeypatch.setattr(settings, "redis_url", "redis://cache:6379/1")
+    monkeypatch.setattr(settings, "session_backend", "auto")
+    monkeypatch.setattr(settings, "llm_cache_backend", "auto")
+
+    store = session.get_session_store()
+
+    assert isinstance(store, RedisSessionStore)
+    assert isinstance(llm_cache.get_llm_cache(), llm_cache.RedisLLMCache)
+
+
+def test_stores_stay_in_process_without_redis_url(monkeypatch, fresh_singletons):
+    monkeypatch.setattr(settings, "redis_url", "")
+
+    assert isinstance(session.get_session_store(), InMemorySessionStore)
+    assert isinstance(llm_cache.get_llm_cache(), llm_cache.InMemoryLLMCache)
+
+
+def test_groq_budget_is_split_across_workers(monkeypatch, fresh_singletons):
+    monkeypatch.setattr(settings, "web_concurrency", 4)
+    monkeypatch.setattr(settings, "llm_requests_per_minute", 30.0)
+    monkeypatch.setattr(settings, "llm_tokens_per_minute", 6000.0)
+
+    llm_scheduler = scheduler.get_llm_scheduler()
+
+    assert llm_scheduler.requests.capacity == 7.5
+    assert llm_scheduler.tokens.capacity == 1500.0
+
+
+def test_rate_limit_storage_uri(monkeypatch):
+    import main
+
+    monkeypatch.setattr(settings, "rate_limit_storage", "auto")
+    monkeypatch.setattr(settings, "redis_url", "")
+    assert main.rate_limit_storage_uri() == "memory://"
+
+    monkeypatch.setattr(settings, "redis_url", "redis://cache:6379/0")
+    assert main.rate_limit_storage_uri() == "redis://cache:6379/0"
+
+    monkeypatch.setattr(settings, "rate_limit_storage", "memcached://cache:11211")
+    assert main.rate_limit_storage_uri() == "memcached://cache:11211"
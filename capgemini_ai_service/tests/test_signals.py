@@ -0,0 +1,33 @@
+from agents.negotiation.analysis import AnalysisService
+from agents.negotiation.signals import message_signals
+
+
+def test_one_scan_returns_every_signal():
+    signals = message_signals("Pour ma famille je cherche un SUV diesel, je paie cash à 124 000 MAD, quel est le prix total ?")
+
+    assert signals.needs == {"family", "suv", "economic", "budget"}
+    assert signals.wants_cash is True
+    assert signals.counter_offer_amount == 124000.0
+    assert signals.asks_price is True
+    assert message_signals("I want a family car, what is the price?").language == "en"
+
+
+def test_counter_offer_amount_formats():
+    assert message_signals("je la prends à 124k").counter_offer_amount == 124000.0
+    assert message_signals("125000 dh").counter_offer_amount == 125000.0
+    assert message_signals("123,500 MAD").counter_offer_amount == 123500.0
+    assert message_signals("bonjour").counter_offer_amount is None
+
+
+def test_darija_and_arabic_keywords():
+    assert message_signals("salam bghit tomobil jdid l wlad").needs == {"new", "family"}
+    assert message_signals("bchhal?").asks_price is True
+    assert message_signals("أريد سيارة جديدة").language == "ar"
+
+
+def test_signals_are_memoized_and_feed_analysis_service():
+    message = "budget 150k, occasion"
+    assert message_signals(message) is message_signals(message)
+
+    needs = AnalysisService(llm=None).extract_needs(message, {"sport": True})
+    assert needs == {"sport": True, "budget": True, "used": True, "stated_budget": 150000}
@@ -56,3 +56,30 @@ async def test_valuation_logging(mock_repo):
     
     assert len(result.agent_steps) > 0
     assert result.agent_steps[0].action == "Recherche prix marché"
+
+@pytest.mark.asyncio
+async def test_concurrent_valuations_keep_their_own_steps(mock_repo):
+    """Interleaved requests on the shared agent must not mix explainability steps"""
+    import asyncio
+    agent = ValuationAgent()
+    agent.repo = mock_repo
+    agent._get_market_base_price = AsyncMock(return_value=100000)
+    
+    async def slow_analysis(vehicle_data, base_price):
+        await asyncio.sleep(0.05)
+        return f"Analyse {vehicle_data['model']}"
+    agent._generate_llm_analysis = slow_analysis
+    
+    requests = [
+        ValuationRequestModel(
+            trade_in_id=str(i),
+            vehicle=VehicleData(make="Renault", model=f"Model{i}", year=2019, mileage=100000, condition="Bon")
+        )
+        for i in range(5)
+    ]
+    
+    results = await asyncio.gather(*(agent.valuate(r) for r in requests))
+    
+    for i, result in enumerate(results):
+        assert len(result.agent_steps) == 4
+        assert result.agent_steps[2].data["analysis"] == f"Analyse Model{i}"
@@ -0,0 +1,154 @@
+import importlib
+import json
+import random
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi.testclient import TestClient
+from agents.valuation_agent import CONDITION_MULTIPLIERS, ValuationAgent
+from core.services.market_pricing import MarketPricingService
+from schemas.models import ValuationRequestModel, VehicleData
+
+
+class CountingPricingService(MarketPricingService):
+    """Deterministic prices; fails for make "Unknown" """
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_base_price(self, make: str, model: str, year: int) -> float:
+        self.calls.append((make, model, year))
+        if make == "Unknown":
+            raise LookupError("no market data")
+        return round(60000 + 9000 * (year - 2010) + 1000 * len(model), -2)
+
+
+def _fleet(count: int):
+    rng = random.Random(7)
+    makes = [("Renault", "Clio"), ("Dacia", "Duster"), ("Peugeot", "208"), ("BMW", "Serie 3")]
+    fleet = []
+    for i in range(count):
+        make, model = rng.choice(makes)
+        fleet.append(ValuationRequestModel(
+            trade_in_id=f"ti-{i}",
+            vehicle=VehicleData(
+                make=make,
+                model=model,
+                year=rng.randint(2012, 2024),
+                mileage=rng.randint(5000, 300000),
+                condition=rng.choice(list(CONDITION_MULTIPLIERS) + ["Inconnu"]),
+                service_history=rng.random() < 0.5,
+                accidents=rng.random() < 0.3,
+            )
+        ))
+    return fleet
+
+
+def _agent():
+    agent = ValuationAgent(pricing_service=CountingPricingService())
+    agent._generate_llm_analysis = AsyncMock(return_value="Demande stable")
+    return agent
+
+
+async def _collect(agent, requests, **kwargs):
+    return [line async for line in agent.valuate_batch(requests, **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_single_valuation():
+    agent = _agent()
+    fleet = _fleet(120)
+
+    lines = await _collect(agent, fleet)
+
+    items = lines[:-1]
+    assert [item.trade_in_id for item in items] == [r.trade_in_id for r in fleet]
+    for request, item in zip(fleet, items):
+        single = await agent.valuate(request)
+        assert item.estimated_value == single.estimated_value
+        assert item.value_range == single.value_range
+        assert item.confidence == single.confidence
+        assert item.breakdown == single.breakdown
+
+
+@pytest.mark.asyncio
+async def test_market_prices_are_looked_up_once_per_vehicle_model(monkeypatch):
+    monkeypatch.setattr(importlib.import_module("agents.valuation_agent"), "BATCH_CHUNK_SIZE", 16)
+    agent = _agent()
+    fleet = _fleet(200)
+
+    lines = await _collect(agent, fleet)
+
+    distinct = {(r.vehicle.make, r.vehicle.model, r.vehicle.year) for r in fleet}
+    assert sorted(agent.pricing_service.calls) == sorted(distinct)
+    summary = lines[-1]
+    assert summary.type == "summary"
+    assert (summary.vehicles, summary.valuated, summary.failed) == (200, 200, 0)
+    assert summary.price_lookups == len(distinct)
+
+
+@pytest.mark.asyncio
+async def test_failed_price_lookup_only_fails_its_vehicles():
+    agent = _agent()
+    fleet = _fleet(3)
+    fleet[1].vehicle.make = "Unknown"
+
+    lines = await _collect(agent, fleet)
+
+    assert [line.type for line in lines] == ["valuation", "error", "valuation", "summary"]
+    assert lines[1].trade_in_id == "ti-1"
+    assert lines[-1].failed == 1
+
+
+@pytest.mark.asyncio
+async def test_analysis_pass_is_deduplicated():
+    agent = _agent()
+    vehicle = dict(make="Dacia", model="Duster", year=2020, condition="Bon")
+    fleet = [
+        ValuationRequestModel(trade_in_id="a", vehicle=VehicleData(mileage=101000, **vehicle)),
+        ValuationRequestModel(trade_in_id="b", vehicle=VehicleData(mileage=98500, **vehicle)),
+        ValuationRequestModel(trade_in_id="c", vehicle=VehicleData(mileage=180000, **vehicle)),
+    ]
+
+    lines = await _collect(agent, fleet, include_analysis=True)
+
+    analyses = [line for line in lines if line.type == "analysis"]
+    assert sorted(sorted(line.trade_in_ids) for line in analyses) == [["a", "b"], ["c"]]
+    assert agent._generate_llm_analysis.await_count == 2
+    assert lines[-1].analyses == 2
+
+
+@pytest.mark.asyncio
+async def test_analysis_pass_is_capped():
+    agent = _agent()
+    vehicle = dict(make="Dacia", model="Duster", condition="Bon", mileage=90000)
+    fleet = [
+        ValuationRequestModel(trade_in_id=f"ti-{year}-{i}", vehicle=VehicleData(year=year, **vehicle))
+        for year in range(2012, 2022)
+        for i in range(2 if year == 2015 else 1)
+    ]
+
+    lines = await _collect(agent, fleet, include_analysis=True, max_analyses=3)
+
+    analyses = [line for line in lines if line.type == "analysis"]
+    assert agent._generate_llm_analysis.await_count == 3
+    assert ["ti-2015-0", "ti-2015-1"] in [sorted(line.trade_in_ids) for line in analyses]
+    assert lines[-1].analyses == 3
+    assert lines[-1].analyses_skipped == 7
+
+
+def test_batch_endpoint_streams_ndjson(monkeypatch):
+    from agents import valuation_agent
+    from main import app, limiter
+
+    monkeypatch.setattr(limiter, "enabled", False)
+    monkeypatch.setattr(valuation_agent, "pricing_service", CountingPricingService())
+    payload = {"vehicles": [r.model_dump() for r in _fleet(5)]}
+
+    response = TestClient(app).post("/ai/valuation/batch", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["type"] for line in lines] == ["valuation"] * 5 + ["summary"]
+    assert all(line["estimated_value"] > 0 for line in lines[:-1])
@@ -1,4 +1,5 @@
 const axios = require('axios');
+const { StringDecoder } = require('string_decoder');
 const logger = require('../utils/logger');
 
 class AIService {
@@ -64,6 +65,64 @@ class AIService {
     }
   }
 
+  /**
+   * Stream a negotiation turn from the AI Negotiation Agent (Server-Sent Events)
+   * Falls back to negotiate() only if the stream failed before any event arrived;
+   * past that point the server has recorded the turn, so the error is thrown instead.
+   * @param {Object} params - Same parameters as negotiate()
+   * @param {Function} onToken - Called with each reply chunk as it arrives
+   * @returns {Object} The final structured response (offer, emotion, win-win score, vehicle_card)
+   */
+  async negotiateStream({ sessionId, customerMessage, history = [], currentOffer = {}, vehicle_context = null }, onToken = () => {}) {
+    let receivedEvent = false;
+    try {
+      logger.info(`Streaming negotiation request for session ${sessionId}`);
+
+      const payload = {
+        session_id: sessionId,
+        customer_message: customerMessage,
+        conversation_history: history,
+        current_offer: currentOffer,
+        vehicle_context: vehicle_context
+      };
+
+      const response = await this.client.post('/ai/negotiate/stream', payload, { responseType: 'stream' });
+
+      // Keeps multibyte characters (Arabic, accents) split across chunks intact
+      const decoder = new StringDecoder('utf8');
+      let buffer = '';
+      let finalResponse = null;
+      for await (const chunk of response.data) {
+        buffer += decoder.write(chunk);
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+          const rawEvent = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+
+          const event = rawEvent.match(/^event: (.*)$/m)?.[1];
+          if (!event) continue;
+          receivedEvent = true;
+          const data = JSON.parse(rawEvent.match(/^data: (.*)$/m)?.[1] || '{}');
+          if (event === 'token') onToken(data.text);
+          else if (event === 'final') finalResponse = data;
+          else if (event === 'error') throw new Error(data.detail);
+        }
+      }
+      buffer += decoder.end();
+
+      if (!finalResponse) throw new Error('Stream ended without a final event');
+      return finalResponse;
+    } catch (error) {
+      if (receivedEvent) {
+        logger.error('AI Negotiation stream failed mid-turn:', error.message);
+        throw error;
+      }
+      logger.error('AI Negotiation stream failed:', error.message);
+      // Nothing was received: the turn never ran, replay it on the non-streaming endpoint
+      return this.negotiate({ sessionId, customerMessage, history, currentOffer, vehicle_context });
+    }
+  }
+
   /**
    * Get trade-in valuation from AI
    * @param {string} tradeInId - ID of the trade-in vehicle
@@ -202,13 +202,18 @@ const initializeSocket = (server) => {
                         message: msg.content
                     }));
                     
-                    console.log(`🤖 [Socket] Calling AIService.negotiate...`);
-                    // Call AI Service with vehicle context
-                    const aiResponse = await AIService.negotiate({
+                    console.log(`🤖 [Socket] Calling AIService.negotiateStream...`);
+                    // Call AI Service with vehicle context; reply chunks are relayed as they are generated
+                    const aiResponse = await AIService.negotiateStream({
                         sessionId: conversationId.toString(),
                         customerMessage: content,
                         history: history,
                         vehicle_context: vehicleContext // Pass vehicle data to Python service
+                    }, (chunk) => {
+                        io.to(`conversation:${conversationId}`).emit('ai_message_chunk', {
+                            conversationId,
+                            chunk
+                        });
                     });
                     
                     console.log(`🤖 [Socket] AI Response received:`, aiResponse ? 'OK' : 'NULL');